@@ -1,7 +1,12 @@
 from django.contrib import admin
-from .models import IntegrationBinding
+from .models import IntegrationBinding, FeedFetchState
 
 @admin.register(IntegrationBinding)
 class IntegrationBindingAdmin(admin.ModelAdmin):
     list_display = ['id', 'source', 'integration_name']
     search_fields = ['source__name', 'integration_name']
+
+@admin.register(FeedFetchState)
+class FeedFetchStateAdmin(admin.ModelAdmin):
+    list_display = ['id', 'url', 'last_checked_at', 'last_changed_at', 'not_modified_count']
+    search_fields = ['url']
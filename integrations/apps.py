@@ -12,14 +12,22 @@ MIN_DELAY_SEC = 30
 MAX_DELAY_SEC = 300  # 5 min
 
 
+def _log_source_result(result):
+    if result.error:
+        logger.warning("Gentle fetcher %s: %s", result.source.name, result.error)
+    elif result.imported_count:
+        logger.info("Gentle fetcher: %s imported %s", result.source.name, result.imported_count)
+
+
 def _gentle_fetcher_loop():
-    """One fetch per source, then random sleep. Runs in background thread."""
+    """One fetch per source, all sources concurrently (polite per host), then random sleep. Runs in background thread."""
     from django.db import connection
     from narratives.models import Source
     from django.db.models import Q
+    from integrations.core.fetch_engine import IngestEngine
     from integrations.core.integration_registry import INTEGRATION_REGISTRY
-    from integrations.run_integration import run_integration_for_source
 
+    engine = IngestEngine()
     direct_slugs = [k for k in INTEGRATION_REGISTRY.keys() if k != "youtube"]
     while True:
         try:
@@ -32,17 +40,9 @@ def _gentle_fetcher_loop():
             if not sources:
                 time.sleep(60)
                 continue
-            for source in sources:
-                try:
-                    count, _ = run_integration_for_source(
-                        source, limit=1, mark_all_not_new=False
-                    )
-                    if count:
-                        logger.info("Gentle fetcher: %s imported %s", source.name, count)
-                except Exception as e:
-                    logger.warning("Gentle fetcher %s: %s", source.name, e)
-                sec = random.randint(MIN_DELAY_SEC, MAX_DELAY_SEC)
-                time.sleep(sec)
+            engine.run_round(sources, limit=1, on_result=_log_source_result)
+            sec = random.randint(MIN_DELAY_SEC, MAX_DELAY_SEC)
+            time.sleep(sec)
         except Exception as e:
             logger.exception("Gentle fetcher loop: %s", e)
             time.sleep(60)
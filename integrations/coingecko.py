@@ -4,7 +4,10 @@ No API key required. Free tier: ~10-30 req/min; use sparingly (e.g. daily sync).
 Docs: https://www.coingecko.com/api/documentations/v3
 """
 import time
-import requests
+
+import httpx
+
+from narratives.utils.http_client import http_get
 
 BASE_URL = "https://api.coingecko.com/api/v3/coins/markets"
 
@@ -24,8 +27,7 @@ def fetch_coins_page(
         "per_page": per_page,
         "page": page,
     }
-    headers = {"User-Agent": "ProphetOntology/1.0 (crypto list sync)"}
-    r = requests.get(BASE_URL, params=params, timeout=30, headers=headers)
+    r = http_get(BASE_URL, profile="bot", params=params, timeout=30)
     r.raise_for_status()
     data = r.json()
     results = []
@@ -56,7 +58,7 @@ def fetch_coins_by_market_cap(
     for page in range(1, max_pages + 1):
         try:
             data = fetch_coins_page(page=page, per_page=per_page, vs_currency=vs_currency)
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             if e.response is not None and e.response.status_code == 429:
                 break  # rate limited, return what we have
             raise RuntimeError(f"CoinGecko API error (page {page}): {e}") from e
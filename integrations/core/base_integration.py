@@ -19,3 +19,10 @@ class IntegrationModule(abc.ABC):
         Returns list of dicts.
         """
         pass
+
+    def extract_article(self, html):
+        """
+        Paragraphs of one downloaded article page, as normalize_to_rawtext extracts them.
+        Used to re-extract from the page cache (manage.py replay_page_cache); None = not supported.
+        """
+        return None
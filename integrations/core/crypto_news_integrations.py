@@ -1,12 +1,14 @@
-import feedparser
-import requests
+import logging
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import time
 from integrations.core.base_integration import IntegrationModule
+from integrations.core.feeds import fetch_feed
 from integrations.translators.crypto_news_translator import CryptoNewsTranslator
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class CryptoArticle:
     title: str
@@ -22,15 +24,13 @@ class CryptoRSSScraper:
         self.rss_url = rss_url
 
     def fetch_latest(self, limit: int = 10) -> List[CryptoArticle]:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
         try:
-            response = requests.get(self.rss_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
+            feed = fetch_feed(self.rss_url, limit=limit, timeout=15)
         except Exception as e:
-            print(f"Error fetching RSS from {self.rss_url}: {e}")
+            logger.warning("Error fetching RSS from %s: %s", self.rss_url, e)
+            return []
+        if feed is None:
+            # Unchanged since the last poll
             return []
 
         articles = []
@@ -88,6 +88,9 @@ class BaseCryptoIntegration(IntegrationModule):
         translator = CryptoNewsTranslator()
         return translator.parse_articles(raw_data, self.site_key)
 
+    def extract_article(self, html):
+        return CryptoNewsTranslator().extract_paragraphs(html, self.site_key)
+
 class TheBlockIntegration(BaseCryptoIntegration):
     name = "TheBlockIntegration"
     site_key = "theblock"
@@ -0,0 +1,81 @@
+# integrations/core/feeds.py
+"""
+Conditional GET for RSS/Atom polling. fetch_feed sends the ETag / Last-Modified of the previous poll
+(FeedFetchState); a 304, or a body with the same SHA-256 as last time, means the feed did not change and
+it returns None without parsing, so the scraper hands nothing on to the translator.
+The validators of a changed feed are only kept as pending on the fetching thread: persist_rawtexts saves them
+once the entries are imported, so a failed import is retried on the next poll instead of getting a 304.
+"""
+
+import hashlib
+import logging
+import threading
+
+import feedparser
+from django.db.models import F
+from django.utils import timezone
+
+from integrations.core.fetch_engine import polite_get
+from integrations.models import FeedFetchState
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def fetch_feed(url: str, headers: dict = None, limit: int = 10, timeout: float = 15):
+    """
+    Parsed feed (feedparser), or None when it is unchanged since a poll that handed on at least `limit`
+    entries. A poll for more entries than last time sends no validators. HTTP errors are raised.
+    """
+    state = FeedFetchState.objects.filter(url=url).first()
+    use_validators = state is not None and limit <= state.entries_processed
+    request_headers = dict(headers or {})
+    if use_validators:
+        if state.etag:
+            request_headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            request_headers["If-Modified-Since"] = state.last_modified
+
+    response = polite_get(url, headers=request_headers, timeout=timeout)
+    now = timezone.now()
+    if use_validators and response.status_code == 304:
+        FeedFetchState.objects.filter(pk=state.pk).update(last_checked_at=now, not_modified_count=F("not_modified_count") + 1)
+        logger.debug("Feed %s not modified (304)", url)
+        return None
+    response.raise_for_status()
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    validators = {
+        "etag": response.headers.get("ETag") or "",
+        "last_modified": response.headers.get("Last-Modified") or "",
+        "content_hash": content_hash,
+        "last_checked_at": now,
+    }
+    if use_validators and content_hash == state.content_hash:
+        # Server without (or ignoring) validators, but the same body as last time
+        FeedFetchState.objects.filter(pk=state.pk).update(not_modified_count=F("not_modified_count") + 1, **validators)
+        logger.debug("Feed %s unchanged (same content hash)", url)
+        return None
+
+    _pending_states()[url] = {**validators, "entries_processed": limit, "last_changed_at": now}
+    return feedparser.parse(response.content)
+
+
+def _pending_states() -> dict:
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        pending = _local.pending = {}
+    return pending
+
+
+def save_pending_feed_states():
+    """Save the validators of the feeds fetched on this thread since the last save / discard (after their import)."""
+    for url, defaults in _pending_states().items():
+        FeedFetchState.objects.update_or_create(url=url, defaults=defaults)
+    discard_pending_feed_states()
+
+
+def discard_pending_feed_states():
+    """Forget unsaved validators (their entries were not imported), so the next poll parses the feed again."""
+    _local.pending = {}
@@ -0,0 +1,34 @@
+# integrations/core/known_urls.py
+"""
+Known-article filter for translators: before any page download, one indexed source_url IN (...) query tells
+which feed / listing entries are already imported, so they are neither downloaded nor slept for.
+With INGEST_REFRESH_KNOWN_AFTER_DAYS > 0, articles last downloaded longer ago are fetched again (updates).
+Articles imported from the feed summary only (page download or extraction failed, has_full_text=False) are
+not known until INGEST_FULL_TEXT_MAX_ATTEMPTS downloads failed to give the full text.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from narratives.models import RawText
+
+
+def known_article_urls(urls) -> set:
+    """Those of `urls` that already have a RawText and need no new download."""
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return set()
+    max_attempts = getattr(settings, "INGEST_FULL_TEXT_MAX_ATTEMPTS", 3)
+    qs = RawText.objects.filter(
+        Q(has_full_text=True) | Q(full_text_attempts__gte=max_attempts), source_url__in=urls
+    )
+    refresh_days = getattr(settings, "INGEST_REFRESH_KNOWN_AFTER_DAYS", 0)
+    if refresh_days > 0:
+        qs = qs.annotate(fetched=Coalesce("last_fetched_at", "created_at")).filter(
+            fetched__gte=timezone.now() - timedelta(days=refresh_days)
+        )
+    return set(qs.values_list("source_url", flat=True))
@@ -0,0 +1,147 @@
+# integrations/core/page_cache.py
+"""
+Content-addressed on-disk cache of downloaded article pages, so content can be re-extracted after a parser
+fix without the network (manage.py replay_page_cache). Bodies are gzip files named by the SHA-256 of the page
+(an unchanged page is stored once); a small JSON entry per URL points at the body of its latest download.
+The bodies are kept under PAGE_CACHE_MAX_MB (0, the default, turns the cache off): the least recently used ones
+(reads touch them) are evicted.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Eviction goes down to this share of the limit, so it does not run again on the next store.
+EVICT_TO = 0.9
+
+_lock = threading.Lock()
+_size = None  # bytes of bodies on disk; counted on first store, recounted by each eviction
+
+
+@dataclass
+class CachedPage:
+    url: str
+    content: bytes
+    encoding: str
+    content_hash: str
+    stored_at: float
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def _root() -> Path:
+    return Path(getattr(settings, "PAGE_CACHE_DIR", Path(settings.BASE_DIR) / "page_cache"))
+
+
+def _max_bytes() -> int:
+    return int(getattr(settings, "PAGE_CACHE_MAX_MB", 0)) * 1024 * 1024
+
+
+def _entry_path(url: str) -> Path:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return _root() / "urls" / key[:2] / f"{key}.json"
+
+
+def _body_path(content_hash: str) -> Path:
+    return _root() / "bodies" / content_hash[:2] / f"{content_hash}.gz"
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _bodies():
+    """(mtime, size, path) of every cached body."""
+    found = []
+    for path in (_root() / "bodies").glob("*/*.gz"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # evicted by another process
+        found.append((stat.st_mtime, stat.st_size, path))
+    return found
+
+
+def _evict_if_needed():
+    global _size
+    if _size is None:
+        _size = sum(size for _, size, _ in _bodies())
+    limit = _max_bytes()
+    if _size <= limit:
+        return
+    bodies = sorted(_bodies())
+    total = sum(size for _, size, _ in bodies)
+    evicted = 0
+    for _, size, path in bodies:
+        if total <= limit * EVICT_TO:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        evicted += 1
+    _size = total
+    logger.info("Page cache: evicted %s pages, %.1f MB left", evicted, total / 1024 / 1024)
+
+
+def store_page(url: str, content: bytes, encoding: str = None) -> Optional[str]:
+    """Cache the body of a download of `url`; returns its content hash (None if the cache is off or failed)."""
+    global _size
+    if _max_bytes() <= 0 or not url or not content:
+        return None
+    content_hash = hashlib.sha256(content).hexdigest()
+    body = _body_path(content_hash)
+    entry = {"url": url, "content_hash": content_hash, "encoding": encoding or "", "stored_at": time.time()}
+    with _lock:
+        try:
+            if body.exists():
+                os.utime(body)
+            else:
+                _write_atomic(body, gzip.compress(content))
+                if _size is not None:
+                    _size += body.stat().st_size
+            _write_atomic(_entry_path(url), json.dumps(entry).encode("utf-8"))
+            _evict_if_needed()
+        except OSError as e:
+            logger.warning("Page cache: could not store %s: %s", url, e)
+            return None
+    return content_hash
+
+
+def load_page(url: str) -> Optional[CachedPage]:
+    """The last cached download of `url`, or None (never cached, or its body was evicted)."""
+    entry_path = _entry_path(url)
+    try:
+        entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        body = _body_path(entry["content_hash"])
+        content = gzip.decompress(body.read_bytes())
+        os.utime(body)  # recently used: evicted last
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, KeyError) as e:
+        logger.warning("Page cache: unreadable entry for %s: %s", url, e)
+        return None
+    return CachedPage(
+        url=entry["url"],
+        content=content,
+        encoding=entry.get("encoding") or "",
+        content_hash=entry["content_hash"],
+        stored_at=entry.get("stored_at") or 0.0,
+    )
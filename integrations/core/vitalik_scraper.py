@@ -1,12 +1,15 @@
-import feedparser
-import requests
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
+import logging
 import time
 from bs4 import BeautifulSoup
 from integrations.core.base_integration import IntegrationModule
-from narratives.utils.random_sleep import random_sleep
+from integrations.core.feeds import fetch_feed
+from integrations.core.fetch_engine import polite_get
+from integrations.core.known_urls import known_article_urls
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class VitalikArticle:
@@ -22,18 +25,16 @@ class VitalikScraper:
         self.rss_url = rss_url
 
     def fetch_latest(self, limit: int = 10) -> List[VitalikArticle]:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
         try:
-            print(f"DEBUG: Fetching RSS from {self.rss_url}")
-            response = requests.get(self.rss_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            feed = feedparser.parse(response.content)
-            print(f"DEBUG: RSS fetched, entries: {len(feed.entries)}")
+            logger.debug("Fetching RSS from %s", self.rss_url)
+            feed = fetch_feed(self.rss_url, limit=limit, timeout=15)
         except Exception as e:
-            print(f"DEBUG: Error fetching RSS from {self.rss_url}: {e}")
+            logger.warning("Error fetching RSS from %s: %s", self.rss_url, e)
+            return []
+        if feed is None:
+            # Unchanged since the last poll
             return []
+        logger.debug("RSS fetched, entries: %s", len(feed.entries))
 
         articles = []
         for entry in feed.entries[:limit]:
@@ -65,55 +66,62 @@ class VitalikScraper:
         return articles
 
 class VitalikTranslator:
+    def extract_paragraphs(self, html: str) -> List[str]:
+        """Article paragraphs of a downloaded page (also used to re-extract from the page cache)."""
+        soup = BeautifulSoup(html, 'html.parser')
+        # Vitalik's content is usually in a div with class 'content' or just inside the body
+        # Based on his current Jekyll setup:
+        content_div = soup.find('div', class_='content') or \
+                     soup.find('article') or \
+                     soup.find('div', class_='post') or \
+                     soup.find('div', class_='markdown-body')
+        
+        if not content_div:
+            logger.debug("No content div found")
+            return []
+
+        # Remove script and style tags
+        for s in content_div(['script', 'style']):
+            s.decompose()
+        
+        p_tags = content_div.find_all(['p', 'li', 'h1', 'h2', 'h3'])
+        paragraphs = [p.get_text().strip() for p in p_tags if p.get_text().strip()]
+        if not paragraphs:
+            logger.debug("No paragraphs found in the content div")
+        return paragraphs
+
     def parse_articles(self, articles: List[VitalikArticle]) -> List[Dict[str, Any]]:
         rawtexts = []
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
+        known = known_article_urls(a.url for a in articles)
+
         for a in articles:
+            if a.url in known:
+                continue
             full_content = a.summary
+            paragraphs = []
             
             # Vitalik's blog is very static and friendly, but let's be polite
             try:
                 # The URL is already fixed in VitalikScraper.fetch_latest
                 url = a.url
-                print(f"DEBUG: Fetching full content from: {url}")
-                random_sleep(1, 3)
-                resp = requests.get(url, headers=headers, timeout=15)
+                logger.debug("Fetching full content from %s", url)
+                resp = polite_get(url, timeout=15, delay=(1, 3), cache=True)
                 if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, 'html.parser')
-                    # Vitalik's content is usually in a div with class 'content' or just inside the body
-                    # Based on his current Jekyll setup:
-                    content_div = soup.find('div', class_='content') or \
-                                 soup.find('article') or \
-                                 soup.find('div', class_='post') or \
-                                 soup.find('div', class_='markdown-body')
-                    
-                    if content_div:
-                        # Remove script and style tags
-                        for s in content_div(['script', 'style']):
-                            s.decompose()
-                        
-                        p_tags = content_div.find_all(['p', 'li', 'h1', 'h2', 'h3'])
-                        paragraphs = [p.get_text().strip() for p in p_tags if p.get_text().strip()]
-                        if paragraphs:
-                            full_content = "\n\n".join(paragraphs)
-                            print(f"DEBUG: Content extracted, length: {len(full_content)}")
-                        else:
-                            print("DEBUG: No paragraphs found in content_div")
-                    else:
-                        print("DEBUG: No content_div found")
+                    paragraphs = self.extract_paragraphs(resp.text)
+                    if paragraphs:
+                        full_content = "\n\n".join(paragraphs)
+                        logger.debug("Content extracted, length: %s", len(full_content))
                 else:
-                    print(f"DEBUG: Failed to fetch {url}, status: {resp.status_code}")
+                    logger.warning("Failed to fetch %s, status: %s", url, resp.status_code)
             except Exception as e:
-                print(f"DEBUG: Failed to fetch full content for {a.url}: {e}")
+                logger.warning("Failed to fetch full content for %s: %s", a.url, e)
 
             rawtexts.append({
                 "title": a.title,
                 "subtitle": "Vitalik Buterin's Blog",
                 "author": "Vitalik Buterin",
                 "content": full_content,
+                "full_text": bool(paragraphs),
                 "published_at": a.published_at,
                 "source_url": a.url,
                 "genre": "article",
@@ -132,3 +140,6 @@ class VitalikIntegration(IntegrationModule):
     def normalize_to_rawtext(self, raw_data: List[VitalikArticle], source=None, source_config=None) -> List[Dict[str, Any]]:
         translator = VitalikTranslator()
         return translator.parse_articles(raw_data)
+
+    def extract_article(self, html):
+        return VitalikTranslator().extract_paragraphs(html)
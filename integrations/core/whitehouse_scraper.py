@@ -1,5 +1,5 @@
-import requests
 from integrations.core.base_integration import IntegrationModule
+from integrations.core.fetch_engine import polite_get
 from integrations.translators.whitehouse_translator import WhiteHouseTranslator
 
 class WhiteHouseScraper(IntegrationModule):
@@ -14,13 +14,8 @@ class WhiteHouseScraper(IntegrationModule):
         else:
             url = f"{base_url}page/{page}/"
 
-        response = requests.get(url)
+        response = polite_get(url, timeout=15)
         response.raise_for_status()
-
-        # TEMP DEBUG
-        with open("fetched_whitehouse.html", "w", encoding="utf-8") as f:
-            f.write(response.text)
-
         return response.text
 
     def normalize_to_rawtext(self, raw_html, source=None, source_config=None):
@@ -28,3 +23,6 @@ class WhiteHouseScraper(IntegrationModule):
         timezone = source_config.get("timezone", "UTC")
         return translator.parse(raw_html, source_timezone=timezone)
 
+    def extract_article(self, html):
+        return WhiteHouseTranslator().extract_paragraphs(html)
+
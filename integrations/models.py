@@ -5,3 +5,22 @@ class IntegrationBinding(models.Model):
     source = models.OneToOneField(Source, on_delete=models.CASCADE)
     integration_name = models.CharField(max_length=100)
     integration_config = models.JSONField(default=dict, blank=True)
+
+
+class FeedFetchState(models.Model):
+    """
+    HTTP validators of the last poll of a feed URL (integrations.core.feeds.fetch_feed), so unchanged feeds
+    are answered with 304 (or recognised by content_hash) and not parsed again.
+    entries_processed = how many entries the last full parse handed on; a poll asking for more ignores the validators.
+    """
+    url = models.URLField(max_length=1000, unique=True)
+    etag = models.CharField(max_length=500, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    entries_processed = models.PositiveIntegerField(default=0)
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    last_changed_at = models.DateTimeField(null=True, blank=True)
+    not_modified_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.url
@@ -1,22 +1,27 @@
 # integrations/run_integration.py
-"""Run integration for a source and persist RawTexts. Used by IntegrationRunView and gentle_fetcher."""
+"""
+Run integration for a source and persist RawTexts. Used by IntegrationRunView and the ingest engine (gentle fetcher).
+fetch_rawtexts_for_source (network only) and persist_rawtexts (database only) can also be called separately.
+"""
 
+from django.db.models import F
+from django.utils import timezone
+
+from integrations.core.feeds import discard_pending_feed_states, save_pending_feed_states
 from integrations.core.integration_registry import INTEGRATION_REGISTRY
 from narratives.models import Source, RawText, Genre, Topic, TopicType
 from narratives.utils.text import generate_fingerprint
 from narratives.utils.categorize import run_find_topics_for_rawtext
 
 
-def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, mark_all_not_new: bool = False):
-    """
-    Fetch content from the integration for `source`, normalize to rawtexts, create/update RawText.
-    Returns (imported_count, imported_rawtext_ids).
-    If mark_all_not_new is True, all RawTexts are marked is_new=False before processing (legacy view behavior).
-    """
+def fetch_rawtexts_for_source(source: Source, limit: int = 1, page: int = 1):
+    """Fetch content from the integration for `source` and normalize it to rawtext dicts (nothing is saved)."""
     integration_name = "youtube" if source.platform == "youtube" else source.slug
     if integration_name not in INTEGRATION_REGISTRY:
         raise ValueError(f"No integration registered for '{integration_name}'")
 
+    # Validators left over from a fetch whose import failed must not be saved with this one
+    discard_pending_feed_states()
     integration = INTEGRATION_REGISTRY[integration_name]
     source_config = {
         "timezone": getattr(source, "timezone", "UTC"),
@@ -25,12 +30,25 @@ def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, ma
     }
 
     raw_data = integration.fetch_content(source=source, source_config=source_config)
-    rawtexts = integration.normalize_to_rawtext(raw_data, source=source, source_config=source_config)
+    return integration.normalize_to_rawtext(raw_data, source=source, source_config=source_config)
+
 
+def persist_rawtexts(source: Source, rawtexts, mark_all_not_new: bool = False, downloaded: bool = True):
+    """
+    Create/update RawText for normalized rawtext dicts of `source`.
+    Returns (imported_count, imported_rawtext_ids).
+    If mark_all_not_new is True, all RawTexts are marked is_new=False before processing (legacy view behavior).
+    downloaded=False (content re-extracted from the page cache) leaves last_fetched_at alone.
+    A rawtext with full_text=False (page download or extraction failed, feed summary only) never replaces a full
+    text; it is stored with has_full_text=False and counted in full_text_attempts, so the translators download
+    its page again on later polls (up to INGEST_FULL_TEXT_MAX_ATTEMPTS).
+    Feed validators of the preceding fetch (on this thread) are saved only when all rawtexts went through.
+    """
     if mark_all_not_new:
         RawText.objects.all().update(is_new=False, is_updated=False)
 
     imported = []
+    now = timezone.now()
     for raw in rawtexts:
         content = (raw.get("content") or "").strip()
         source_url = raw.get("source_url")
@@ -38,15 +56,21 @@ def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, ma
             continue
 
         fingerprint = generate_fingerprint(content)
+        full_text = raw.get("full_text", True)
 
         existing_by_url = None
         if source_url:
             existing_by_url = RawText.objects.filter(source_url=source_url).first()
 
         if existing_by_url:
+            if existing_by_url.has_full_text and not full_text:
+                continue
             if existing_by_url.content_fingerprint != fingerprint:
                 existing_by_url.content = content
                 existing_by_url.content_fingerprint = fingerprint
+                existing_by_url.has_full_text = full_text
+                if downloaded:
+                    existing_by_url.full_text_attempts = 0 if full_text else existing_by_url.full_text_attempts + 1
                 new_title = (raw.get("title") or "").strip()
                 if new_title:
                     existing_by_url.title = new_title
@@ -55,8 +79,15 @@ def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, ma
                     existing_by_url.subtitle = new_subtitle
                 existing_by_url.is_updated = True
                 existing_by_url.is_new = False
+                if downloaded:
+                    existing_by_url.last_fetched_at = now
                 existing_by_url.save()
                 imported.append(existing_by_url.id)
+            elif downloaded:
+                updates = {"last_fetched_at": now}
+                if not full_text:
+                    updates["full_text_attempts"] = F("full_text_attempts") + 1
+                RawText.objects.filter(pk=existing_by_url.pk).update(**updates)
             continue
 
         existing_rawtext = RawText.objects.filter(content_fingerprint=fingerprint).first()
@@ -92,6 +123,9 @@ def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, ma
             source=source,
             genre=genre,
             content_fingerprint=fingerprint,
+            last_fetched_at=now if downloaded else None,
+            has_full_text=full_text,
+            full_text_attempts=0 if full_text or not downloaded else 1,
             is_new=True,
             is_updated=False,
         )
@@ -102,4 +136,15 @@ def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, ma
         except Exception:
             pass  # do not fail import if categorization fails
 
+    save_pending_feed_states()
     return len(imported), imported
+
+
+def run_integration_for_source(source: Source, limit: int = 1, page: int = 1, mark_all_not_new: bool = False):
+    """
+    Fetch content from the integration for `source`, normalize to rawtexts, create/update RawText.
+    Returns (imported_count, imported_rawtext_ids).
+    If mark_all_not_new is True, all RawTexts are marked is_new=False before processing (legacy view behavior).
+    """
+    rawtexts = fetch_rawtexts_for_source(source, limit=limit, page=page)
+    return persist_rawtexts(source, rawtexts, mark_all_not_new=mark_all_not_new)
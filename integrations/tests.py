@@ -1,3 +1,41 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from integrations.core.known_urls import known_article_urls
+from integrations.run_integration import persist_rawtexts
+from narratives.models import RawText, Source
+
+URL = "https://news.test/article"
+
+
+def _raw(content, full_text=True):
+    return {"title": "Article", "content": content, "source_url": URL, "full_text": full_text}
+
+
+@override_settings(INGEST_FULL_TEXT_MAX_ATTEMPTS=3, INGEST_REFRESH_KNOWN_AFTER_DAYS=0)
+class SummaryOnlyImportTests(TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(name="News")
+
+    def test_full_text_article_is_known(self):
+        persist_rawtexts(self.source, [_raw("Full article text.")])
+        self.assertEqual(known_article_urls([URL]), {URL})
+
+    def test_summary_only_article_is_retried_until_the_attempt_limit(self):
+        persist_rawtexts(self.source, [_raw("Summary.", full_text=False)])
+        self.assertEqual(known_article_urls([URL]), set())
+        persist_rawtexts(self.source, [_raw("Summary.", full_text=False)])
+        self.assertEqual(known_article_urls([URL]), set())
+        persist_rawtexts(self.source, [_raw("Other summary.", full_text=False)])
+        self.assertEqual(RawText.objects.get(source_url=URL).full_text_attempts, 3)
+        self.assertEqual(known_article_urls([URL]), {URL})
+
+    def test_full_text_replaces_the_summary(self):
+        persist_rawtexts(self.source, [_raw("Summary.", full_text=False)])
+        persist_rawtexts(self.source, [_raw("Full article text.")])
+        rawtext = RawText.objects.get(source_url=URL)
+        self.assertEqual((rawtext.content, rawtext.has_full_text, rawtext.full_text_attempts), ("Full article text.", True, 0))
+
+    def test_summary_never_replaces_a_full_text(self):
+        persist_rawtexts(self.source, [_raw("Full article text.")])
+        self.assertEqual(persist_rawtexts(self.source, [_raw("Summary.", full_text=False)]), (0, []))
+        self.assertEqual(RawText.objects.get(source_url=URL).content, "Full article text.")
@@ -1,7 +1,7 @@
-import requests
 from bs4 import BeautifulSoup
 from narratives.utils.date_time_helpers import normalize_to_utc
-from narratives.utils.random_sleep import random_sleep
+from integrations.core.fetch_engine import polite_get
+from integrations.core.known_urls import known_article_urls
 from datetime import datetime
 import pytz
 
@@ -15,10 +15,23 @@ EXTERNAL_GENRE_MAPPING = {
 
 class WhiteHouseTranslator:
 
+    def extract_paragraphs(self, content_html):
+        """Paragraphs of a downloaded statement page (also used to re-extract from the page cache)."""
+        content_soup = BeautifulSoup(content_html, "html.parser")
+        return [
+            p.get_text().strip()
+            for p in content_soup.find_all("p")
+            if p.get_text().strip()
+        ]
+
     def parse(self, raw_html, source_timezone="UTC"):
         soup = BeautifulSoup(raw_html, "html.parser")
         title_blocks = soup.find_all("h2", class_="wp-block-post-title")
         rawtexts = []
+        # Already imported statements are not downloaded again
+        known = known_article_urls(
+            link["href"] for link in (t.find("a") for t in title_blocks) if link and link.has_attr("href")
+        )
 
         for title_tag in title_blocks:
             link_tag = title_tag.find("a")
@@ -27,6 +40,8 @@ class WhiteHouseTranslator:
 
             title = link_tag.get_text().strip()
             full_url = link_tag["href"]
+            if full_url in known:
+                continue
 
             # Genre extraction
             internal_genre = "other"
@@ -51,15 +66,8 @@ class WhiteHouseTranslator:
                         print(f"Failed parsing datetime: {e}")
 
             # Fetch full article content with random sleep
-            random_sleep(4, 12)
-            content_html = requests.get(full_url).text
-            content_soup = BeautifulSoup(content_html, "html.parser")
-
-            paragraphs = [
-                p.get_text().strip()
-                for p in content_soup.find_all("p")
-                if p.get_text().strip()
-            ]
+            content_html = polite_get(full_url, timeout=15, delay=(4, 12), cache=True).text
+            paragraphs = self.extract_paragraphs(content_html)
             full_content = "\n\n".join(paragraphs)
 
             rawtexts.append({
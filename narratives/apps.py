@@ -1,5 +1,45 @@
+import logging
+import sys
+import threading
+import time
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
+SWOT_WORKER_IDLE_SEC = 30
+
+
+def _swot_worker_loop(workers):
+    """Drain the SWOT job queue, then wait and check again. Runs in background thread."""
+    from django.db import connection
+    from narratives.utils.swot_queue import process_swot_jobs
+
+    while True:
+        try:
+            connection.close()  # use fresh connection per iteration
+            result = process_swot_jobs(workers=workers)
+            if result["done"] or result["failed"]:
+                logger.info("SWOT worker: %s analyzed, %s failed", result["done"], result["failed"])
+        except Exception as e:
+            logger.exception("SWOT worker loop: %s", e)
+        time.sleep(SWOT_WORKER_IDLE_SEC)
+
+
 class NarrativesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'narratives'
+
+    def ready(self):
+        from django.conf import settings
+        # Only start the SWOT worker when running the web server (not migrate, shell, etc.)
+        run_web = "runserver" in sys.argv or "gunicorn" in sys.argv[0].lower()
+        if run_web and getattr(settings, "SWOT_WORKER_AUTO_START", True):
+            workers = getattr(settings, "SWOT_WORKERS", 2)
+            thread = threading.Thread(target=_swot_worker_loop, args=(workers,), daemon=True)
+            thread.start()
+            logger.info("SWOT worker background thread started (%s workers in this process).", workers)
+        if run_web and getattr(settings, "SPACY_PRELOAD", False):
+            # Load the spaCy pipelines now instead of in the first request that needs them.
+            from narratives.utils.nlp import warm_up
+            threading.Thread(target=warm_up, daemon=True, name="spacy-warm-up").start()
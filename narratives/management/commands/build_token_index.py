@@ -0,0 +1,44 @@
+# narratives/management/commands/build_token_index.py
+"""Build or refresh the RawText token index (RawTextToken postings) used for candidate retrieval."""
+
+from django.core.management.base import BaseCommand
+
+from narratives.models import RawText
+from narratives.utils.text_index import index_rawtext
+
+
+class Command(BaseCommand):
+    help = "Index RawTexts that are not in the token index yet (or re-check all with --all, rebuild all with --force)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Check every RawText and re-index those whose search text changed since indexing.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild postings of every RawText even if unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        force = options.get("force", False)
+        run_all = options.get("all", False) or force
+
+        qs = RawText.objects.all() if run_all else RawText.objects.filter(token_index_fingerprint__isnull=True)
+        qs = qs.select_related("source").order_by("id")
+        total = qs.count()
+        if total == 0:
+            self.stdout.write(self.style.WARNING("No RawTexts to index. Use --all to re-check every RawText."))
+            return
+
+        self.stdout.write(f"Indexing {total} RawTexts…")
+        indexed = 0
+        for i, rawtext in enumerate(qs.iterator(chunk_size=200), start=1):
+            if index_rawtext(rawtext, force=force):
+                indexed += 1
+            if i % 500 == 0:
+                self.stdout.write(f"  {i}/{total} … ({indexed} indexed)")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {indexed} of {total} RawTexts."))
@@ -1,12 +1,64 @@
 # narratives/management/commands/categorize_all_rawtexts.py
-"""Run Find Topics (keyword categorization) once on all RawTexts that are not yet COMPLETED."""
+"""Run Find Topics (keyword categorization) once on all RawTexts that are not yet COMPLETED. Optional process pool (--workers) and checkpoint (--resume)."""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from django.core.management.base import BaseCommand
+from django.db import connections
 from django.db.models import Q
 
 from narratives.models import RawText
 from narratives.models.categories import AppConfiguration
-from narratives.utils.categorize import run_find_topics_for_rawtext
+from narratives.utils.categorize import run_find_topics_for_texts
+
+CHECKPOINT_KEY = "categorize_all_rawtexts_checkpoint"
+
+
+def _init_worker():
+    # Forked workers must not reuse the parent's DB connection; each opens its own on first query.
+    connections.close_all()
+
+
+def _categorize_id_chunk(ids):
+    """Categorize one chunk of RawText ids. Runs in a worker process (or inline with --workers 1)."""
+    started = time.monotonic()
+    qs = RawText.objects.filter(id__in=ids).order_by("id")
+    done, _sug, created = run_find_topics_for_texts(qs, reset=False, chunk_size=len(ids))
+    return {
+        "pid": os.getpid(),
+        "last_id": ids[-1],
+        "size": len(ids),
+        "done": done,
+        "created": created,
+        "seconds": time.monotonic() - started,
+    }
+
+
+def _read_checkpoint(version):
+    """Last RawText id committed by an interrupted run for this categorization version, or None."""
+    config = AppConfiguration.objects.filter(key=CHECKPOINT_KEY).first()
+    if not config or ":" not in config.value:
+        return None
+    saved_version, _, last_id = config.value.rpartition(":")
+    if saved_version != version:
+        return None
+    try:
+        return int(last_id)
+    except ValueError:
+        return None
+
+
+def _write_checkpoint(version, last_id):
+    AppConfiguration.objects.update_or_create(
+        key=CHECKPOINT_KEY,
+        defaults={
+            "value": f"{version}:{last_id}",
+            "description": "Last RawText id committed by categorize_all_rawtexts (for --resume).",
+        },
+    )
 
 
 class Command(BaseCommand):
@@ -23,10 +75,30 @@ class Command(BaseCommand):
             action="store_true",
             help="Only print count of RawTexts that would be processed.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="RawTexts per batch (one bulk write per batch, default 200).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes; each builds the keyword matcher once and uses its own DB connection (default 1).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip RawTexts up to the last id committed by an interrupted run of the same categorization version.",
+        )
 
     def handle(self, *args, **options):
         run_all = options.get("all", False)
         dry_run = options.get("dry_run", False)
+        chunk_size = max(1, options.get("chunk_size") or 200)
+        workers = max(1, options.get("workers") or 1)
+        resume = options.get("resume", False)
 
         current_version = AppConfiguration.get_version("categorization_version")
 
@@ -41,7 +113,16 @@ class Command(BaseCommand):
             ).order_by("id")
             label = "not yet Done (NOT_STARTED or OUTDATED)"
 
-        total = qs.count()
+        if resume:
+            last_id = _read_checkpoint(current_version)
+            if last_id is not None:
+                qs = qs.filter(id__gt=last_id)
+                self.stdout.write(f"Resuming after RawText id={last_id}.")
+            else:
+                self.stdout.write(self.style.WARNING("No checkpoint for this categorization version; starting from the beginning."))
+
+        ids = list(qs.values_list("id", flat=True))
+        total = len(ids)
         if total == 0:
             self.stdout.write(
                 self.style.WARNING(
@@ -55,17 +136,65 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"Would process {total} RawTexts ({label})."))
             return
 
-        self.stdout.write(f"Processing {total} RawTexts ({label})…")
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        self.stdout.write(f"Processing {total} RawTexts ({label}) in {len(chunks)} chunks, {workers} worker(s)…")
+
+        started = time.monotonic()
+        seen = 0
         done = 0
         created_total = 0
-        for rawtext in qs:
+        per_worker = {}  # pid -> [texts, seconds]
+        finished = {}  # chunk index -> last id
+        next_index = 0  # first chunk not yet committed; everything before it is done
+
+        def on_result(index, result):
+            nonlocal seen, done, created_total, next_index
+            seen += result["size"]
+            done += result["done"]
+            created_total += result["created"]
+            stats = per_worker.setdefault(result["pid"], [0, 0.0])
+            stats[0] += result["done"]
+            stats[1] += result["seconds"]
+            finished[index] = result["last_id"]
+            # Checkpoint only the contiguous prefix of finished chunks, so --resume never skips an unfinished one.
+            advanced = False
+            while next_index in finished:
+                next_index += 1
+                advanced = True
+            if advanced:
+                _write_checkpoint(current_version, finished[next_index - 1])
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            self.stdout.write(
+                f"  {seen}/{total} … ({created_total} PendingTopics created so far, {rate:.1f} texts/s)"
+            )
+
+        if workers == 1:
+            for index, chunk in enumerate(chunks):
+                on_result(index, _categorize_id_chunk(chunk))
+        else:
+            # Close before forking so no worker inherits an open connection.
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+            )
             try:
-                _sug, created = run_find_topics_for_rawtext(rawtext, reset=False)
-                created_total += created
-                done += 1
-                if done % 50 == 0 or done == total:
-                    self.stdout.write(f"  {done}/{total} … ({created_total} PendingTopics created so far)")
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"  RawText id={rawtext.id}: {e}"))
+                futures = {executor.submit(_categorize_id_chunk, chunk): index for index, chunk in enumerate(chunks)}
+                for future in as_completed(futures):
+                    on_result(futures[future], future.result())
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+        AppConfiguration.objects.filter(key=CHECKPOINT_KEY).delete()
+
+        if done < total:
+            self.stdout.write(self.style.ERROR(f"  {total - done} RawTexts failed (see log)."))
+        for pid, (texts, seconds) in sorted(per_worker.items()):
+            rate = texts / seconds if seconds > 0 else 0.0
+            self.stdout.write(f"  worker {pid}: {texts} RawTexts in {seconds:.1f}s ({rate:.1f} texts/s)")
 
         self.stdout.write(self.style.SUCCESS(f"Done. Processed {done} RawTexts, created {created_total} PendingTopics."))
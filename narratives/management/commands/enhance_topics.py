@@ -0,0 +1,187 @@
+# narratives/management/commands/enhance_topics.py
+"""Enhance many topics at once (same as the per-topic Enhance button): knowledge, ontology analysis, relations. Thread pool (--workers) and checkpoint (--resume)."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from narratives.models import Topic
+from narratives.models.categories import AppConfiguration
+from narratives.utils.nlp import get_pos_nlp
+from narratives.utils.topic_enhance import enhance_topic
+
+CHECKPOINT_KEY = "enhance_topics_checkpoint"
+
+
+def _enhance_topic_id(topic_id, refresh):
+    """Enhance one topic. Runs in a pool thread; the thread's DB connection is closed afterwards."""
+    started = time.monotonic()
+    try:
+        topic = Topic.objects.filter(id=topic_id).first()
+        if topic is None:
+            return {"status": "missing", "seconds": 0.0}
+        result = enhance_topic(topic, refresh=refresh)
+    except Exception as e:
+        result = {"status": "error", "error": str(e)}
+    finally:
+        connection.close()
+    result["seconds"] = time.monotonic() - started
+    return result
+
+
+def _read_checkpoint():
+    config = AppConfiguration.objects.filter(key=CHECKPOINT_KEY).first()
+    try:
+        return int(config.value) if config else None
+    except ValueError:
+        return None
+
+
+def _write_checkpoint(last_id):
+    AppConfiguration.objects.update_or_create(
+        key=CHECKPOINT_KEY,
+        defaults={
+            "value": str(last_id),
+            "description": "Last Topic id finished by enhance_topics (for --resume).",
+        },
+    )
+
+
+class Command(BaseCommand):
+    help = "Collect knowledge, run the ontology analysis and link schools / related topics for many topics concurrently."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-description",
+            action="store_true",
+            help="Only topics without a useful description (empty or shorter than 50 characters).",
+        )
+        parser.add_argument(
+            "--ids",
+            type=int,
+            nargs="+",
+            help="Only these Topic ids.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Enhance at most this many topics.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Topics processed at once (default 2). Model calls stay limited by OLLAMA_MAX_CONCURRENCY.",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Re-fetch knowledge sources instead of reusing stored dossiers.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip topics up to the last id finished by an interrupted run.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only print how many topics would be enhanced.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options.get("workers") or 2)
+        refresh = options.get("refresh", False)
+
+        qs = Topic.objects.filter(is_placeholder=False).order_by("id")
+        if options.get("missing_description"):
+            qs = qs.annotate(description_length=Length("description")).filter(
+                Q(description__isnull=True) | Q(description_length__lt=50)
+            )
+        if options.get("ids"):
+            qs = qs.filter(id__in=options["ids"])
+        if options.get("resume"):
+            last_id = _read_checkpoint()
+            if last_id is not None:
+                qs = qs.filter(id__gt=last_id)
+                self.stdout.write(f"Resuming after Topic id={last_id}.")
+            else:
+                self.stdout.write(self.style.WARNING("No checkpoint found; starting from the beginning."))
+
+        ids = list(qs.values_list("id", flat=True))
+        if options.get("limit"):
+            ids = ids[:options["limit"]]
+        total = len(ids)
+        if total == 0:
+            self.stdout.write(self.style.WARNING("No topics to enhance."))
+            return
+        if options.get("dry_run"):
+            self.stdout.write(self.style.SUCCESS(f"Would enhance {total} topics."))
+            return
+
+        self.stdout.write(
+            f"Enhancing {total} topics with {workers} worker(s) "
+            f"(at most {settings.OLLAMA_MAX_CONCURRENCY} model calls at once)…"
+        )
+        # Load spaCy once before the threads use it for name validation.
+        try:
+            get_pos_nlp()
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(f"spaCy not available, names are not POS-checked: {e}"))
+
+        started = time.monotonic()
+        statuses = {}
+        totals = {"created": 0, "schools": 0, "related": 0, "discovered": 0, "rejected": 0}
+        finished = set()
+        next_index = 0  # first topic not yet finished; everything before it is done
+
+        def on_result(index, result):
+            nonlocal next_index
+            status = result["status"]
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "enhanced":
+                totals["created"] += len(result["created_new_topics"])
+                totals["schools"] += len(result["linked_schools"])
+                totals["related"] += len(result["linked_related"])
+                totals["discovered"] += result["discovered_from_wikipedia"]
+                totals["rejected"] += result["rejected_suggestions_count"]
+            elif status == "error":
+                self.stdout.write(self.style.ERROR(f"  Topic {ids[index]}: {result['error']}"))
+            finished.add(index)
+            # Checkpoint only the contiguous prefix of finished topics, so --resume never skips an unfinished one.
+            advanced = False
+            while next_index in finished:
+                next_index += 1
+                advanced = True
+            if advanced:
+                _write_checkpoint(ids[next_index - 1])
+            done = len(finished)
+            if done % 10 == 0 or done == total:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"  {done}/{total} … ({done / elapsed if elapsed > 0 else 0.0:.2f} topics/s)")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enhance") as executor:
+            futures = {executor.submit(_enhance_topic_id, topic_id, refresh): index for index, topic_id in enumerate(ids)}
+            try:
+                for future in as_completed(futures):
+                    on_result(futures[future], future.result())
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        AppConfiguration.objects.filter(key=CHECKPOINT_KEY).delete()
+
+        self.stdout.write(
+            "  " + ", ".join(f"{n} {status.replace('_', ' ')}" for status, n in sorted(statuses.items()))
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Created {totals['created']} topics, linked {totals['schools']} schools and "
+            f"{totals['related']} related ({totals['discovered']} discovered from Wikipedia), "
+            f"rejected {totals['rejected']} names."
+        ))
@@ -1,5 +1,5 @@
 # narratives/management/commands/gentle_fetcher.py
-"""Background fetcher: one video per YouTube channel, one article per direct/RSS source, with random 30s–5min delay between each."""
+"""Background fetcher: one video per YouTube channel, one article per direct/RSS source per round (sources concurrently, polite per host), with random 30s–5min delay between rounds."""
 
 import random
 import time
@@ -8,7 +8,8 @@ from django.db.models import Q
 
 from narratives.models import Source
 from integrations.core.integration_registry import INTEGRATION_REGISTRY
-from integrations.run_integration import run_integration_for_source
+from integrations.core.fetch_engine import IngestEngine
+from narratives.utils.http_client import http_stats
 
 
 MIN_DELAY_SEC = 30
@@ -32,7 +33,7 @@ def random_sleep():
 
 
 class Command(BaseCommand):
-    help = "Run gentle background fetcher: 1 video/channel, 1 article/source, random 30s–5min between each."
+    help = "Run gentle background fetcher: 1 video/channel, 1 article/source per round, random 30s–5min between rounds."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -44,13 +45,13 @@ class Command(BaseCommand):
             "--min-delay",
             type=int,
             default=MIN_DELAY_SEC,
-            help=f"Min delay between fetches in seconds (default {MIN_DELAY_SEC})",
+            help=f"Min delay between rounds in seconds (default {MIN_DELAY_SEC})",
         )
         parser.add_argument(
             "--max-delay",
             type=int,
             default=MAX_DELAY_SEC,
-            help=f"Max delay between fetches in seconds (default {MAX_DELAY_SEC})",
+            help=f"Max delay between rounds in seconds (default {MAX_DELAY_SEC})",
         )
 
     def handle(self, *args, **options):
@@ -66,26 +67,39 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("No fetchable sources found."))
             return
 
-        self.stdout.write(self.style.SUCCESS(f"Gentle fetcher started. {len(sources)} sources. Delay {min_delay}s–{max_delay}s between fetches."))
+        self.stdout.write(self.style.SUCCESS(f"Gentle fetcher started. {len(sources)} sources. Delay {min_delay}s–{max_delay}s between rounds."))
 
+        def on_result(result):
+            source = result.source
+            if result.error:
+                self.stdout.write(self.style.ERROR(f"  {source.name}: {result.error}"))
+            elif result.imported_count:
+                self.stdout.write(self.style.SUCCESS(f"  {source.name} (slug={source.slug}): imported {result.imported_count} ({result.seconds:.1f}s)"))
+            else:
+                self.stdout.write(f"  {source.name}: no new items ({result.seconds:.1f}s)")
+
+        engine = IngestEngine()
         round_num = 0
         while True:
             round_num += 1
             self.stdout.write(f"Round {round_num}: fetching one item per source…")
-            for source in sources:
-                try:
-                    count, ids = run_integration_for_source(source, limit=1, mark_all_not_new=False)
-                    if count:
-                        self.stdout.write(self.style.SUCCESS(f"  {source.name} (slug={source.slug}): imported {count}"))
-                    else:
-                        self.stdout.write(f"  {source.name}: no new items")
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"  {source.name}: {e}"))
-                sec = delay_sec()
-                self.stdout.write(f"  sleeping {sec}s…")
-                time.sleep(sec)
+            started = time.monotonic()
+            engine.run_round(sources, limit=1, on_result=on_result)
+            self.stdout.write(f"Round {round_num} done in {time.monotonic() - started:.0f}s.")
+            stats = http_stats()
+            if stats:
+                requests_made = sum(s["requests"] for s in stats.values())
+                connections = sum(s["connections"] for s in stats.values())
+                self.stdout.write(
+                    f"  HTTP so far: {requests_made} requests over {connections} connections to {len(stats)} hosts; "
+                    + ", ".join(f"{host} {s['avg_ms']:.0f}ms" for host, s in stats.items())
+                )
 
             if run_once:
                 self.stdout.write(self.style.SUCCESS("One round done (--once). Exiting."))
                 return
+            sec = delay_sec()
+            self.stdout.write(f"Sleeping {sec}s…")
+            time.sleep(sec)
+            sources = get_fetchable_sources() or sources
             self.stdout.write("Starting next round…")
@@ -0,0 +1,24 @@
+# narratives/management/commands/llm_cache.py
+"""Inspect or clean the local model answer cache (LLMResponseCache)."""
+
+from django.core.management.base import BaseCommand
+
+from narratives.models import LLMResponseCache
+from narratives.utils.llm_cache import cache_stats, evict
+
+
+class Command(BaseCommand):
+    help = "Show LLM answer cache stats; --evict drops expired / over-limit entries, --clear drops everything."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evict", action="store_true", help="Delete expired and least recently used over-limit entries.")
+        parser.add_argument("--clear", action="store_true", help="Delete all cached answers.")
+
+    def handle(self, *args, **options):
+        if options.get("clear"):
+            deleted, _ = LLMResponseCache.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} cached answers."))
+        elif options.get("evict"):
+            self.stdout.write(self.style.SUCCESS(f"Evicted {evict()} cached answers."))
+        stats = cache_stats()
+        self.stdout.write(f"Entries: {stats['entries']}, hits served (all time): {stats['total_hits']}")
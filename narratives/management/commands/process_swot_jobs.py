@@ -0,0 +1,61 @@
+# narratives/management/commands/process_swot_jobs.py
+"""Run pending SWOT survey jobs (threat-topic mentions) against the local model."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from narratives.utils.swot_queue import process_swot_jobs, retry_failed_jobs, swot_queue_status
+
+
+class Command(BaseCommand):
+    help = "Fill swot_analysis for PendingTopics with swot_status=pending, with bounded concurrency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Concurrent model calls (default 2). Keep at or below the model server's parallelism.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Stop after this many jobs.",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Put failed jobs back in the queue first.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running: when the queue is empty, wait --sleep seconds and check again.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=int,
+            default=30,
+            help="Seconds between queue checks with --loop (default 30).",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options.get("workers") or 2)
+        max_jobs = options.get("max_jobs")
+
+        if options.get("retry_failed"):
+            self.stdout.write(f"Re-queued {retry_failed_jobs()} failed SWOT jobs.")
+
+        def progress(done, failed):
+            self.stdout.write(f"  {done} done, {failed} failed …")
+
+        while True:
+            status = swot_queue_status()
+            self.stdout.write(f"Queue: {status['pending']} pending, {status['running']} running, {workers} worker(s).")
+            result = process_swot_jobs(workers=workers, max_jobs=max_jobs, progress_callback=progress)
+            self.stdout.write(self.style.SUCCESS(f"Done. {result['done']} analyzed, {result['failed']} failed."))
+            if not options.get("loop"):
+                return
+            time.sleep(max(1, options.get("sleep") or 30))
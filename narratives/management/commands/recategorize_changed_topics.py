@@ -0,0 +1,48 @@
+# narratives/management/commands/recategorize_changed_topics.py
+"""Apply pending topic rule changes: re-categorize only the changed topics on the texts they can affect."""
+
+from django.core.management.base import BaseCommand
+
+from narratives.utils.categorize import run_incremental_recategorization
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run keyword matching only for topics whose rules changed since the last run (TopicRuleChange log), "
+        "only on RawTexts that contain their keywords or already have them, then mark those texts up to date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only print how many changes, topics and candidate RawTexts would be processed.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="RawTexts per batch (one bulk write per batch, default 200).",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run", False)
+        chunk_size = max(1, options.get("chunk_size") or 200)
+
+        def progress(processed, created):
+            self.stdout.write(f"  {processed} RawTexts … ({created} PendingTopics created so far)")
+
+        result = run_incremental_recategorization(chunk_size=chunk_size, progress_callback=progress, dry_run=dry_run)
+        if not result["changes"]:
+            self.stdout.write(self.style.WARNING("No pending topic rule changes."))
+            return
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(
+                f"Would re-match {result['topics']} topics ({result['changes']} changes) "
+                f"on {result['candidates']} candidate RawTexts."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Re-matched {result['topics']} topics on {result['processed']} RawTexts, "
+            f"created {result['created']} PendingTopics, marked {result['promoted']} RawTexts up to date."
+        ))
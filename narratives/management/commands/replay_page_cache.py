@@ -0,0 +1,107 @@
+# narratives/management/commands/replay_page_cache.py
+"""Re-extract article content from the page cache (no network), e.g. after fixing a translator's selectors, and update changed RawTexts."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.core.base_integration import IntegrationModule
+from integrations.core.integration_registry import INTEGRATION_REGISTRY
+from integrations.core.page_cache import load_page
+from integrations.run_integration import persist_rawtexts
+from narratives.models import RawText, Source
+from narratives.utils.text import generate_fingerprint
+
+
+def _integration_for(source):
+    """The source's integration if it can extract articles from a cached page, else None."""
+    integration = INTEGRATION_REGISTRY.get("youtube" if source.platform == "youtube" else source.slug)
+    if not isinstance(integration, IntegrationModule):
+        return None
+    if type(integration).extract_article is IntegrationModule.extract_article:
+        return None
+    return integration
+
+
+class Command(BaseCommand):
+    help = "Re-parse cached article pages with the current translators (offline) and update RawTexts whose content changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            nargs="+",
+            help="Only these Source slugs (default: every source whose integration supports replay).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Re-extract at most this many RawTexts per source.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the RawTexts whose content would change.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run", False)
+        sources = Source.objects.order_by("id")
+        if options.get("source"):
+            sources = sources.filter(slug__in=options["source"])
+            if not sources.exists():
+                raise CommandError(f"No sources with slug {', '.join(options['source'])}.")
+
+        started = time.monotonic()
+        totals = {"checked": 0, "updated": 0, "unchanged": 0, "not_cached": 0, "empty": 0, "failed": 0}
+        for source in sources:
+            integration = _integration_for(source)
+            if integration is None:
+                if options.get("source"):
+                    self.stdout.write(self.style.WARNING(f"  {source.name}: integration does not support replay, skipped."))
+                continue
+
+            qs = RawText.objects.filter(source=source, source_url__isnull=False).exclude(source_url="").order_by("id")
+            if options.get("limit"):
+                qs = qs[:options["limit"]]
+            counts = dict.fromkeys(totals, 0)
+            for rawtext in qs.iterator():
+                counts["checked"] += 1
+                page = load_page(rawtext.source_url)
+                if page is None:
+                    counts["not_cached"] += 1
+                    continue
+                paragraphs = integration.extract_article(page.text)
+                if not paragraphs:
+                    # Same as a live import: without extracted paragraphs the stored content is kept
+                    counts["empty"] += 1
+                    continue
+                content = "\n\n".join(paragraphs)
+                if generate_fingerprint(content) == rawtext.content_fingerprint:
+                    counts["unchanged"] += 1
+                    continue
+                if dry_run:
+                    counts["updated"] += 1
+                    continue
+                try:
+                    updated, _ = persist_rawtexts(
+                        source, [{"content": content, "source_url": rawtext.source_url}], downloaded=False
+                    )
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"  RawText {rawtext.id}: {e}"))
+                    counts["failed"] += 1
+                    continue
+                counts["updated" if updated else "unchanged"] += 1
+
+            if counts["checked"]:
+                self.stdout.write(
+                    f"  {source.name}: " + ", ".join(f"{n} {key.replace('_', ' ')}" for key, n in counts.items())
+                )
+            for key, n in counts.items():
+                totals[key] += n
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {time.monotonic() - started:.1f}s. {verb} {totals['updated']} of {totals['checked']} RawTexts "
+            f"({totals['not_cached']} not cached, {totals['empty']} without extracted content, {totals['failed']} failed)."
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0123_declinedtopic_source_topic_nullable'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicRuleChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic_id', models.IntegerField(db_index=True, help_text='Topic id (not a FK: the topic may have been deleted)')),
+                ('reason', models.CharField(choices=[('created', 'Topic created'), ('rules', 'Keyword rules changed'), ('deleted', 'Topic deleted'), ('context_set', 'Referenced context set changed')], default='rules', max_length=20)),
+                ('from_version', models.CharField(max_length=20)),
+                ('to_version', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('applied_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='rules_fingerprint',
+            field=models.CharField(blank=True, default='', help_text='Hash of the keyword matching rules (name, alternative name, keywords, weak keywords); empty for placeholders', max_length=64),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0124_topic_rules_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawtext',
+            name='token_index_fingerprint',
+            field=models.CharField(blank=True, help_text='Hash of the search text its RawTextToken rows were built from; null = not indexed yet.', max_length=64, null=True),
+        ),
+        migrations.CreateModel(
+            name='RawTextToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, help_text='Lower-case ASCII word token (longer tokens are stored as overlapping windows)', max_length=255)),
+                ('positions', models.JSONField(blank=True, default=list, help_text='Character offsets of the token in the search text')),
+                ('rawtext', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='narratives.rawtext')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='rawtexttoken',
+            constraint=models.UniqueConstraint(fields=('rawtext', 'token'), name='narratives_rawtexttoken_rawtext_token_uniq'),
+        ),
+    ]
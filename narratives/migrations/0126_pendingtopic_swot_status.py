@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0125_rawtext_token_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingtopic',
+            name='swot_status',
+            field=models.CharField(blank=True, choices=[('', 'Not needed'), ('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='', help_text='SWOT job state for threat-topic mentions (filled by the SWOT worker); empty = no analysis needed', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='pendingtopic',
+            name='swot_updated_at',
+            field=models.DateTimeField(blank=True, help_text='Last swot_status change', null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0126_pendingtopic_swot_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMResponseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('model', models.CharField(help_text='Model name the answer came from, e.g. gemma2:9b', max_length=255)),
+                ('system_hash', models.CharField(blank=True, max_length=64)),
+                ('prompt_hash', models.CharField(max_length=64)),
+                ('response', models.JSONField(help_text='Parsed JSON answer of the model')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='Last store or hit (for LRU eviction)')),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
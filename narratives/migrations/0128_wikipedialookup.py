@@ -0,0 +1,30 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0127_llmresponsecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WikipediaLookup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(default='en', max_length=10)),
+                ('name', models.CharField(help_text='Name as looked up (whitespace collapsed)', max_length=500)),
+                ('exists', models.BooleanField(default=False)),
+                ('title', models.CharField(blank=True, help_text='Canonical page title (after redirects)', max_length=500)),
+                ('url', models.URLField(blank=True, max_length=1000)),
+                ('summary', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='wikipedialookup',
+            constraint=models.UniqueConstraint(fields=('lang', 'name'), name='unique_wikipedia_lookup_lang_name'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:45
+
+import re
+
+from django.db import migrations, models
+
+
+def _normalise(name):
+    # Same as narratives.utils.declined_topics.normalise_declined_name at the time of this migration.
+    return re.sub(r"\s+", " ", (name or "").casefold()).strip()[:500]
+
+
+def dedupe_declined_topics(apps, schema_editor):
+    """Fill normalized_name / last_declined_at and merge rows with the same name and reason (keeping the latest details)."""
+    DeclinedTopic = apps.get_model("narratives", "DeclinedTopic")
+    groups = {}
+    for row in DeclinedTopic.objects.order_by("created_at", "id").iterator():
+        groups.setdefault((_normalise(row.name), row.reason), []).append(row)
+    for (normalized, _), rows in groups.items():
+        keep, latest = rows[0], rows[-1]
+        keep.normalized_name = normalized
+        keep.count = len(rows)
+        keep.last_declined_at = latest.created_at
+        keep.name = latest.name
+        keep.source_topic_id = latest.source_topic_id
+        keep.target_field = latest.target_field
+        keep.reason_detail = latest.reason_detail
+        keep.save()
+        if len(rows) > 1:
+            DeclinedTopic.objects.filter(id__in=[row.id for row in rows[1:]]).delete()
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0128_wikipedialookup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='declinedtopic',
+            name='count',
+            field=models.PositiveIntegerField(default=1, help_text='How often this name was declined (or skipped as declined).'),
+        ),
+        migrations.AddField(
+            model_name='declinedtopic',
+            name='last_declined_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='declinedtopic',
+            name='normalized_name',
+            field=models.CharField(blank=True, default='', help_text='Case-folded name with collapsed whitespace (see narratives.utils.declined_topics); one row per name and reason.', max_length=500),
+        ),
+        migrations.RunPython(dedupe_declined_topics, noop),
+    ]
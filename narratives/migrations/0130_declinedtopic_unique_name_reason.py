@@ -0,0 +1,19 @@
+# Generated by Django 4.2.28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0129 so the constraint is added after the dedupe transaction committed
+    # (PostgreSQL refuses ALTER TABLE while that transaction still has deferred FK checks pending).
+
+    dependencies = [
+        ('narratives', '0129_declinedtopic_dedupe'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='declinedtopic',
+            constraint=models.UniqueConstraint(fields=('normalized_name', 'reason'), name='unique_declined_topic_name_reason'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0130_declinedtopic_unique_name_reason'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicKnowledge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lookup_key', models.CharField(help_text='Topic name and Wikipedia URL the knowledge was collected for', max_length=1600)),
+                ('sources', models.JSONField(default=list, help_text='[{source, title, content, url, related_links?}, ...]')),
+                ('dossier', models.TextField(blank=True)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+                ('topic', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='knowledge', to='narratives.topic')),
+            ],
+        ),
+    ]
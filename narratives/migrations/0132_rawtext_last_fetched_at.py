@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0131_topicknowledge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawtext',
+            name='last_fetched_at',
+            field=models.DateTimeField(blank=True, help_text='When an integration last downloaded this article (null = not since import / created_at).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='rawtext',
+            name='source_url',
+            field=models.URLField(blank=True, db_index=True, help_text='Original source URL for reference', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0132_rawtext_last_fetched_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawtext',
+            name='has_full_text',
+            field=models.BooleanField(default=True, help_text='False when the article page could not be downloaded and only the feed summary was imported.'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-18 16:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0133_rawtext_has_full_text'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='rawtexttoken',
+            name='positions',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narratives', '0134_remove_rawtexttoken_positions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawtext',
+            name='full_text_attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Downloads in a row that gave no full text; after INGEST_FULL_TEXT_MAX_ATTEMPTS the page is not tried again.'),
+        ),
+    ]
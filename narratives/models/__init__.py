@@ -1,6 +1,8 @@
-from .categories import Topic, AppConfiguration, TopicType, ContextSet
+from .categories import Topic, AppConfiguration, TopicType, ContextSet, TopicRuleChange
 from .analytical import AnalyticalCategory, AnalyticalFramework, TopicAnalyticalCategory
 from .users import UserAccount
 from .markets import Market, MarketPosition
 from .epochs import Epoch
-from .sources import Genre, Source, RawText, RawTextProcessing, PendingTopic, TopicMentionDay
+from .sources import Genre, Source, RawText, RawTextProcessing, PendingTopic, TopicMentionDay, RawTextToken
+from .llm import LLMResponseCache
+from .knowledge import WikipediaLookup, TopicKnowledge
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from django.db import models
 from django.utils.text import slugify
 from django.utils.crypto import get_random_string
@@ -101,10 +104,60 @@ class Topic(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     metadata = models.JSONField(default=dict, blank=True, help_text="Additional data for specific types (e.g., bio for persons)")
     wikipedia_url = models.URLField(blank=True, null=True, help_text="Direct link to the Wikipedia article (to avoid disambiguation pages)")
+    rules_fingerprint = models.CharField(max_length=64, blank=True, default="", help_text="Hash of the keyword matching rules (name, alternative name, keywords, weak keywords); empty for placeholders")
 
     def __str__(self):
         return self.name
 
+    def compute_rules_fingerprint(self):
+        """Hash of everything the keyword matcher reads from this topic. Placeholders are not searched, so they hash to ''."""
+        if self.is_placeholder:
+            return ""
+        payload = json.dumps(
+            [self.name, self.alternative_name, self.keywords, self.weak_keywords],
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TopicRuleChange(models.Model):
+    """
+    Log of topics whose keyword matching changed; each entry bumped categorization_version from
+    from_version to to_version. Incremental re-categorization re-runs only these topics and marks them applied.
+    """
+    REASON_CHOICES = [
+        ('created', 'Topic created'),
+        ('rules', 'Keyword rules changed'),
+        ('deleted', 'Topic deleted'),
+        ('context_set', 'Referenced context set changed'),
+    ]
+
+    topic_id = models.IntegerField(db_index=True, help_text="Topic id (not a FK: the topic may have been deleted)")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default='rules')
+    from_version = models.CharField(max_length=20)
+    to_version = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"Topic {self.topic_id} {self.reason} ({self.from_version} -> {self.to_version})"
+
+    @classmethod
+    def record(cls, topic_ids, reason):
+        """Bump categorization_version once and log the change for every topic in topic_ids."""
+        topic_ids = sorted(set(topic_ids))
+        if not topic_ids:
+            return
+        from_version = AppConfiguration.get_version("categorization_version")
+        to_version = AppConfiguration.increment_version("categorization_version")
+        cls.objects.bulk_create([
+            cls(topic_id=topic_id, reason=reason, from_version=from_version, to_version=to_version)
+            for topic_id in topic_ids
+        ])
+
 
 class Person(models.Model):
     full_name = models.CharField(max_length=255, unique=True)
@@ -143,7 +196,18 @@ class DeclinedTopic(models.Model):
     )
     reason = models.CharField(max_length=50, choices=REASON_CHOICES, default='other')
     reason_detail = models.TextField(blank=True, null=True, help_text="Explanation for the decline.")
+    normalized_name = models.CharField(
+        max_length=500, blank=True, default="",
+        help_text="Case-folded name with collapsed whitespace (see narratives.utils.declined_topics); one row per name and reason."
+    )
+    count = models.PositiveIntegerField(default=1, help_text="How often this name was declined (or skipped as declined).")
     created_at = models.DateTimeField(auto_now_add=True)
+    last_declined_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["normalized_name", "reason"], name="unique_declined_topic_name_reason"),
+        ]
 
     def __str__(self):
         if self.source_topic_id:
@@ -168,8 +232,81 @@ def create_slug(sender, instance, *args, **kwargs):
         instance.slug = unique_slug
 
 
-@receiver([post_save, post_delete], sender=Topic)
-def increment_categorization_version(sender, instance, **kwargs):
-    # Only increment if not a new Topic with no keywords (to avoid double increment on creation if keywords added later)
-    # Actually, any change to Topic (name, keywords, etc.) should invalidate.
-    AppConfiguration.increment_version("categorization_version")
+@receiver(pre_save, sender=Topic)
+def track_topic_rules_fingerprint(sender, instance, raw=False, **kwargs):
+    # Compare against the stored row, not the stored fingerprint, so rows saved before the field existed work too.
+    if raw:
+        return
+    old_fingerprint = ""
+    if instance.pk:
+        old = sender.objects.filter(pk=instance.pk).only(
+            "name", "alternative_name", "keywords", "weak_keywords", "is_placeholder"
+        ).first()
+        if old is not None:
+            old_fingerprint = old.compute_rules_fingerprint()
+    new_fingerprint = instance.compute_rules_fingerprint()
+    instance._rules_fingerprint_change = (old_fingerprint, new_fingerprint)
+    instance.rules_fingerprint = new_fingerprint
+
+
+@receiver(post_save, sender=Topic)
+def increment_categorization_version(sender, instance, created, raw=False, **kwargs):
+    # Only rule changes invalidate categorization (e.g. a re-save of identical weak_keywords or a topic_type change does not).
+    if raw:
+        return
+    old_fingerprint, new_fingerprint = getattr(instance, "_rules_fingerprint_change", ("", ""))
+    instance._rules_fingerprint_change = (new_fingerprint, new_fingerprint)
+    if old_fingerprint == new_fingerprint:
+        return
+    # save(update_fields=[...]) does not write the fingerprint set in pre_save.
+    sender.objects.filter(pk=instance.pk).update(rules_fingerprint=new_fingerprint)
+    TopicRuleChange.record([instance.pk], "created" if created else "rules")
+
+
+@receiver(post_delete, sender=Topic)
+def increment_categorization_version_on_delete(sender, instance, **kwargs):
+    if instance.compute_rules_fingerprint():
+        TopicRuleChange.record([instance.pk], "deleted")
+
+
+def _topic_ids_referencing_context_sets(slugs):
+    """Searchable topics whose weak keywords use [slug] in required_context for any of slugs."""
+    refs = {f"[{slug}]" for slug in slugs if slug}
+    topic_ids = []
+    for topic_id, weak_keywords in Topic.objects.filter(is_placeholder=False).values_list("id", "weak_keywords"):
+        for wkw in weak_keywords or []:
+            if isinstance(wkw, dict) and any((c or "").strip() in refs for c in wkw.get("required_context") or []):
+                topic_ids.append(topic_id)
+                break
+    return topic_ids
+
+
+@receiver(pre_save, sender=ContextSet)
+def track_context_set_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    changed_slugs = {instance.slug}
+    if instance.pk:
+        old = sender.objects.filter(pk=instance.pk).values("slug", "words").first()
+        if old is not None:
+            if old["slug"] == instance.slug and old["words"] == instance.words:
+                changed_slugs = set()
+            else:
+                changed_slugs.add(old["slug"])
+    instance._changed_slugs = changed_slugs
+
+
+@receiver(post_save, sender=ContextSet)
+def increment_categorization_version_on_context_set(sender, instance, raw=False, **kwargs):
+    # Context set words are expanded into weak keyword rules: only topics that reference the set are affected.
+    if raw:
+        return
+    changed_slugs = getattr(instance, "_changed_slugs", {instance.slug})
+    instance._changed_slugs = set()
+    if changed_slugs:
+        TopicRuleChange.record(_topic_ids_referencing_context_sets(changed_slugs), "context_set")
+
+
+@receiver(post_delete, sender=ContextSet)
+def increment_categorization_version_on_context_set_delete(sender, instance, **kwargs):
+    TopicRuleChange.record(_topic_ids_referencing_context_sets([instance.slug]), "context_set")
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class WikipediaLookup(models.Model):
+    """
+    Cached result of a Wikipedia page lookup by name (narratives.utils.wikipedia_lookup).
+    exists=False is a negative result (no page); both expire, negative ones sooner (WIKIPEDIA_LOOKUP_*_TTL_DAYS).
+    """
+    lang = models.CharField(max_length=10, default="en")
+    name = models.CharField(max_length=500, help_text="Name as looked up (whitespace collapsed)")
+    exists = models.BooleanField(default=False)
+    title = models.CharField(max_length=500, blank=True, help_text="Canonical page title (after redirects)")
+    url = models.URLField(max_length=1000, blank=True)
+    summary = models.TextField(blank=True)
+    fetched_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["lang", "name"], name="unique_wikipedia_lookup_lang_name"),
+        ]
+
+    def __str__(self):
+        return f"{self.lang}:{self.name} -> {self.title if self.exists else '(missing)'}"
+
+
+class TopicKnowledge(models.Model):
+    """
+    Knowledge collected for a topic from external sources (narratives.utils.knowledge_sources.aggregator):
+    the per-source entries (with Wikipedia related links) and the dossier given to the model.
+    Reused until TOPIC_KNOWLEDGE_TTL_DAYS old or until the topic name / Wikipedia URL changes (lookup_key).
+    """
+    topic = models.OneToOneField("narratives.Topic", on_delete=models.CASCADE, related_name="knowledge")
+    lookup_key = models.CharField(max_length=1600, help_text="Topic name and Wikipedia URL the knowledge was collected for")
+    sources = models.JSONField(default=list, help_text="[{source, title, content, url, related_links?}, ...]")
+    dossier = models.TextField(blank=True)
+    fetched_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Knowledge for {self.topic_id} ({len(self.sources)} sources, {self.fetched_at:%Y-%m-%d})"
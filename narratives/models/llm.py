@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class LLMResponseCache(models.Model):
+    """
+    Content-addressed cache of local model answers (narratives.utils.llm_cache).
+    key = sha256 of (model, system prompt hash, prompt hash); entries expire after LLM_CACHE_TTL_DAYS.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=255, help_text="Model name the answer came from, e.g. gemma2:9b")
+    system_hash = models.CharField(max_length=64, blank=True)
+    prompt_hash = models.CharField(max_length=64)
+    response = models.JSONField(help_text="Parsed JSON answer of the model")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True, help_text="Last store or hit (for LRU eviction)")
+    hit_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.model} {self.key[:12]} ({self.hit_count} hits)"
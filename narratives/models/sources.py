@@ -1,11 +1,15 @@
+import logging
+
 from django.db import models
 from django.utils.text import slugify
 from django.utils import timezone
 from django.utils.crypto import get_random_string
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save
 from narratives.utils.text import generate_fingerprint
 from django.dispatch import receiver
 
+logger = logging.getLogger(__name__)
+
 
 class Genre(models.Model):
     name = models.CharField(max_length=100, unique=True, help_text="E.g., tweet, speech, poem, proclamation")
@@ -52,12 +56,24 @@ class RawText(models.Model):
     title = models.CharField(max_length=1000, blank=True, null=True)
     subtitle = models.CharField(max_length=2000, blank=True, null=True)
     content = models.TextField()
-    source_url = models.URLField(blank=True, null=True, help_text="Original source URL for reference")
+    source_url = models.URLField(blank=True, null=True, db_index=True, help_text="Original source URL for reference")
     author = models.ForeignKey('narratives.Topic', on_delete=models.SET_NULL, blank=True, null=True, related_name='authored_rawtexts')
     published_at = models.DateTimeField(blank=True, null=True)
     is_new = models.BooleanField(default=True, help_text="Whether this article was just imported")
     is_updated = models.BooleanField(default=False, help_text="Whether this article was updated with new info")
     created_at = models.DateTimeField(default=timezone.now)
+    last_fetched_at = models.DateTimeField(
+        blank=True, null=True,
+        help_text="When an integration last downloaded this article (null = not since import / created_at).",
+    )
+    has_full_text = models.BooleanField(
+        default=True,
+        help_text="False when the article page could not be downloaded and only the feed summary was imported.",
+    )
+    full_text_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Downloads in a row that gave no full text; after INGEST_FULL_TEXT_MAX_ATTEMPTS the page is not tried again.",
+    )
     slug = models.SlugField(unique=True, blank=True, max_length=300)
     content_fingerprint = models.CharField(max_length=128, unique=True, blank=True, null=True, help_text="Normalized hash of the content for duplicate detection")
     
@@ -71,6 +87,10 @@ class RawText(models.Model):
         blank=True, null=True,
         help_text="Set when this rawtext was in the last 'Re-categorize these articles' batch; cleared on next such run.",
     )
+    token_index_fingerprint = models.CharField(
+        max_length=64, blank=True, null=True,
+        help_text="Hash of the search text its RawTextToken rows were built from; null = not indexed yet.",
+    )
 
     @property
     def categorization_status(self):
@@ -125,6 +145,13 @@ class PendingTopic(models.Model):
         ('approved', 'Approved'),
         ('declined', 'Declined'),
     ]
+    SWOT_STATUS_CHOICES = [
+        ('', 'Not needed'),
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
 
     rawtext = models.ForeignKey(RawText, on_delete=models.CASCADE, related_name="pending_topics")
     topic = models.ForeignKey('narratives.Topic', on_delete=models.CASCADE, related_name="pending_rawtexts")
@@ -151,6 +178,15 @@ class PendingTopic(models.Model):
         blank=True, 
         help_text="Survey-like analysis: {pestel_category, impact_strength (1-4), stance (-2 to +2), summary}"
     )
+    swot_status = models.CharField(
+        max_length=20,
+        choices=SWOT_STATUS_CHOICES,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="SWOT job state for threat-topic mentions (filled by the SWOT worker); empty = no analysis needed",
+    )
+    swot_updated_at = models.DateTimeField(blank=True, null=True, help_text="Last swot_status change")
     
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -185,6 +221,24 @@ class TopicMentionDay(models.Model):
         return f"{self.topic_id} @ {self.date}: {self.count}"
 
 
+class RawTextToken(models.Model):
+    """
+    Inverted index posting: one row per (RawText, token) of its search text
+    (title + subtitle + content, see narratives.utils.categorize.build_search_text).
+    Built by narratives.utils.text_index; used to find candidate texts for keyword rules.
+    """
+    rawtext = models.ForeignKey(RawText, on_delete=models.CASCADE, related_name="tokens")
+    token = models.CharField(max_length=255, db_index=True, help_text="Lower-case ASCII word token (longer tokens are stored as overlapping windows)")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["rawtext", "token"], name="narratives_rawtexttoken_rawtext_token_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.token} @ {self.rawtext_id}"
+
+
 def make_unique_rawtext_slug(title=None, content="", exclude_rawtext_id=None):
     """Generate a unique slug for RawText from title (or content fallback)."""
     base = (title or "").strip() or (content[:50] if content else "")
@@ -220,3 +274,21 @@ def create_slug(sender, instance, *args, **kwargs):
             while sender.objects.filter(slug=unique_slug).exists():
                 unique_slug = f"{base_slug}-{get_random_string(5)}"[:300]
             instance.slug = unique_slug
+
+
+# Fields the RawTextToken postings are built from (see narratives.utils.categorize.build_search_text)
+_SEARCH_TEXT_FIELDS = {"title", "subtitle", "content"}
+
+
+@receiver(post_save, sender=RawText)
+def update_token_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Every save (import, API, admin) keeps the postings in step with the text; index_rawtext skips unchanged texts.
+    if raw or (update_fields is not None and not _SEARCH_TEXT_FIELDS.intersection(update_fields)):
+        return
+    from narratives.utils.text_index import index_rawtext
+
+    try:
+        index_rawtext(instance)
+    except Exception as e:
+        # Do not fail the save; build_token_index picks the text up later
+        logger.warning("Token index of RawText %s not updated: %s", instance.pk, e)
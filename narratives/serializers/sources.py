@@ -118,12 +118,11 @@ class TopicSerializer(serializers.ModelSerializer):
             return value
         name = value.strip()
         if is_forbidden_topic_name(name):
-            from ..models.categories import DeclinedTopic
-            DeclinedTopic.objects.create(
-                name=name,
-                source_topic=None,
+            from ..utils.declined_topics import record_declined
+            record_declined(
+                name,
+                "other",
                 target_field="api_create",
-                reason="other",
                 reason_detail="Forbidden topic name pattern (e.g. source byline like 'Cointelegraph by …'). Topic not created.",
             )
             raise serializers.ValidationError(
@@ -173,8 +172,8 @@ class PendingTopicSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PendingTopic
-        fields = ["id", "topic", "topic_name", "matched_keyword", "is_weak", "found_context_words", "context", "status", "found_in", "weight", "swot_analysis", "created_at"]
-        read_only_fields = ["id", "created_at"]
+        fields = ["id", "topic", "topic_name", "matched_keyword", "is_weak", "found_context_words", "context", "status", "found_in", "weight", "swot_analysis", "swot_status", "created_at"]
+        read_only_fields = ["id", "swot_status", "created_at"]
 
 class SourceSerializer(serializers.ModelSerializer):
     topic_distribution = serializers.SerializerMethodField()
@@ -325,9 +324,9 @@ class DeclinedTopicSerializer(serializers.ModelSerializer):
         model = DeclinedTopic
         fields = [
             "id", "name", "source_topic", "source_topic_name", 
-            "target_field", "reason", "reason_detail", "created_at"
+            "target_field", "reason", "reason_detail", "count", "created_at", "last_declined_at"
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "count", "created_at", "last_declined_at"]
 
 class EpochSerializer(serializers.ModelSerializer):
     topic_id = serializers.IntegerField(source='topic.id', read_only=True)
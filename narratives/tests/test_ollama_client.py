@@ -0,0 +1,226 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from narratives.utils import local_ai
+from narratives.utils.ollama_client import OllamaClient, OllamaError, OllamaTimeout
+
+
+def _answer(payload: dict) -> httpx.Response:
+    return httpx.Response(200, json={"response": json.dumps(payload), "done": True})
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        try:
+            self.server.behaviour(self, body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout tests)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeOllamaServer:
+    """Local stand-in for Ollama on a free port; behaviour(handler, body) writes the answer."""
+
+    def __init__(self, behaviour):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.behaviour = behaviour
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _send_json(handler, payload: dict, delay: float = 0):
+    time.sleep(delay)
+    data = json.dumps(payload).encode()
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def _send_stream(handler, chunks, first_delay: float = 0):
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/x-ndjson")
+    handler.end_headers()
+    time.sleep(first_delay)
+    for chunk in chunks:
+        handler.wfile.write((json.dumps(chunk) + "\n").encode())
+        handler.wfile.flush()
+
+
+class OllamaClientRetryTests(SimpleTestCase):
+    def _client(self, handler, **kwargs):
+        kwargs.setdefault("retries", 2)
+        kwargs.setdefault("backoff", 0.01)
+        return OllamaClient("http://ollama.test", "test-model", transport=httpx.MockTransport(handler), **kwargs)
+
+    def test_retries_5xx_with_growing_backoff(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503) if len(calls) < 3 else _answer({"ok": True})
+
+        client = self._client(handler, backoff=1.0)
+        with mock.patch("narratives.utils.ollama_client.time.sleep") as sleep:
+            self.assertEqual(json.loads(client.generate("prompt")), {"ok": True})
+        self.assertEqual(len(calls), 3)
+        first, second = (c.args[0] for c in sleep.call_args_list)
+        self.assertTrue(0.5 <= first <= 1.0)
+        self.assertTrue(1.0 <= second <= 2.0)
+
+    def test_retries_connect_errors(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                raise httpx.ConnectError("connection refused", request=request)
+            return _answer({"ok": True})
+
+        self.assertEqual(json.loads(self._client(handler).generate("prompt")), {"ok": True})
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_retries(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        with self.assertRaises(OllamaError):
+            self._client(handler).generate("prompt")
+        self.assertEqual(len(calls), 3)
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        with self.assertRaises(OllamaError):
+            self._client(handler).generate("prompt")
+        self.assertEqual(len(calls), 1)
+
+    def test_sends_model_format_and_system(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            return _answer({})
+
+        self._client(handler).generate("prompt", system="be brief")
+        self.assertEqual(
+            bodies[0], {"model": "test-model", "prompt": "prompt", "stream": False, "format": "json", "system": "be brief"}
+        )
+
+
+class OllamaClientTimingTests(SimpleTestCase):
+    def test_deadline_bounds_a_slow_answer(self):
+        with FakeOllamaServer(lambda handler, body: _send_json(handler, {"response": "{}"}, delay=2)) as server:
+            client = OllamaClient(server.base_url, "test-model", timeout=30, retries=0)
+            started = time.monotonic()
+            with self.assertRaises(OllamaTimeout):
+                client.generate("prompt", deadline=0.3)
+            self.assertLess(time.monotonic() - started, 1.5)
+            client.close()
+
+    def test_deadline_covers_backoff(self):
+        client = OllamaClient(
+            "http://ollama.test", "test-model", retries=5, backoff=10.0,
+            transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+        )
+        started = time.monotonic()
+        with self.assertRaises(OllamaTimeout):
+            client.generate("prompt", deadline=1.0)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_stream_joins_chunks(self):
+        chunks = [{"response": '{"a": '}, {"response": "1}"}, {"response": "", "done": True}]
+        with FakeOllamaServer(lambda handler, body: _send_stream(handler, chunks)) as server:
+            client = OllamaClient(server.base_url, "test-model", retries=0)
+            self.assertEqual(json.loads(client.generate("prompt", stream=True)), {"a": 1})
+            client.close()
+
+    def test_stream_first_token_timeout(self):
+        chunks = [{"response": "{}", "done": True}]
+        with FakeOllamaServer(lambda handler, body: _send_stream(handler, chunks, first_delay=2)) as server:
+            client = OllamaClient(server.base_url, "test-model", timeout=30, retries=0)
+            started = time.monotonic()
+            with self.assertRaises(OllamaTimeout):
+                client.generate("prompt", stream=True, first_token_timeout=0.3)
+            self.assertLess(time.monotonic() - started, 1.5)
+            client.close()
+
+    def test_semaphore_caps_requests_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, max
+
+        def behaviour(handler, body):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.2)
+            with lock:
+                in_flight[0] -= 1
+            _send_json(handler, {"response": "{}"})
+
+        with FakeOllamaServer(behaviour) as server:
+            client = OllamaClient(server.base_url, "test-model", max_concurrency=2, retries=0)
+            threads = [threading.Thread(target=client.generate, args=("prompt",)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            client.close()
+        self.assertEqual(in_flight[1], 2)
+
+    def test_waiting_for_a_slot_counts_against_the_deadline(self):
+        with FakeOllamaServer(lambda handler, body: _send_json(handler, {"response": "{}"}, delay=1)) as server:
+            client = OllamaClient(server.base_url, "test-model", max_concurrency=1, retries=0)
+            busy = threading.Thread(target=client.generate, args=("prompt",))
+            busy.start()
+            time.sleep(0.1)
+            with self.assertRaisesMessage(OllamaTimeout, "No free model slot"):
+                client.generate("prompt", deadline=0.2)
+            busy.join()
+            client.close()
+
+
+@override_settings(OLLAMA_STREAM=False)
+class PromptLocalAITests(SimpleTestCase):
+    def _prompt(self, handler):
+        client = OllamaClient(
+            "http://ollama.test", "test-model", retries=0, transport=httpx.MockTransport(handler)
+        )
+        with mock.patch.object(local_ai, "get_ollama_client", return_value=client):
+            return local_ai.prompt_local_ai("prompt", use_cache=False)
+
+    def test_none_on_invalid_json(self):
+        answer = httpx.Response(200, json={"response": "not json at all", "done": True})
+        self.assertIsNone(self._prompt(lambda request: answer))
+
+    def test_none_when_server_is_down(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        self.assertIsNone(self._prompt(handler))
@@ -0,0 +1,147 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from narratives.models import PendingTopic, RawText, Source, Topic
+from narratives.utils import local_ai, swot_queue
+
+MENTIONS = [("Inflation", "Prices keep rising."), ("War", "The war is a risk."), ("Censorship", "Speech is curbed.")]
+
+
+def _result(mention_id, **fields):
+    return {"id": mention_id, "pestel_category": "Economic", "impact_strength": 2, "stance": 1, "summary": "s", **fields}
+
+
+class SwotBatchParsingTests(SimpleTestCase):
+    def _analyze(self, response, fallback=None):
+        with mock.patch.object(local_ai, "prompt_local_ai", return_value=response), \
+                mock.patch.object(local_ai, "analyze_swot_trigger", return_value=fallback) as single:
+            return local_ai.analyze_swot_triggers_batch(MENTIONS, "Author"), single
+
+    def test_valid_results_are_aligned_by_id(self):
+        results, single = self._analyze({"results": [_result(3), _result(1, stance=-1), _result(2)]})
+        self.assertEqual([r["stance"] for r in results], [-1, 1, 1])
+        self.assertNotIn("id", results[0])
+        single.assert_not_called()
+
+    def test_partial_and_invalid_items_fall_back_to_single_calls(self):
+        fallback = {"stance": 0, "impact_strength": 1}
+        response = {"results": [
+            _result(1),
+            {"id": 2, "stance": 1},  # no impact_strength
+            "not an item",
+            {"id": "x", "stance": 1, "impact_strength": 1},
+        ]}
+        results, single = self._analyze(response, fallback=fallback)
+        self.assertEqual(results[0]["pestel_category"], "Economic")
+        self.assertEqual(results[1:], [fallback, fallback])
+        self.assertEqual(
+            [c.args[:2] for c in single.call_args_list], [MENTIONS[1], MENTIONS[2]]
+        )
+
+    def test_ids_out_of_range_are_ignored(self):
+        response = {"results": [_result(0), _result(4), _result(-1), _result(2)]}
+        results, single = self._analyze(response, fallback=None)
+        self.assertEqual(results, [None, {k: v for k, v in _result(2).items() if k != "id"}, None])
+        self.assertEqual(single.call_count, 2)
+
+    def test_unparsed_answer_falls_back_to_single_calls(self):
+        results, single = self._analyze({"summary": "no results key"}, fallback={"stance": 0, "impact_strength": 1})
+        self.assertEqual(single.call_count, len(MENTIONS))
+        self.assertEqual(len(results), len(MENTIONS))
+
+    def test_no_answer_is_not_retried_one_by_one(self):
+        results, single = self._analyze(None)
+        self.assertEqual(results, [None, None, None])
+        single.assert_not_called()
+
+
+def _make_jobs(rawtext_order):
+    """PendingTopics with swot_status pending, created in rawtext_order (indexes into two new RawTexts)."""
+    source = Source.objects.create(name="Test source")
+    rawtexts = [RawText.objects.create(source=source, title=f"Text {i}", content=f"Content {i}") for i in range(2)]
+    topic = Topic.objects.create(name="Inflation")
+    return rawtexts, [
+        PendingTopic.objects.create(
+            rawtext=rawtexts[i], topic=topic, context=f"Context {n}", status="approved", swot_status="pending"
+        )
+        for n, i in enumerate(rawtext_order)
+    ]
+
+
+class SwotQueueTests(TestCase):
+    def test_claim_orders_jobs_by_rawtext(self):
+        rawtexts, jobs = _make_jobs([1, 0, 1, 0])
+        claimed = swot_queue.claim_swot_jobs(10)
+        self.assertEqual([job.id for job in claimed], [jobs[1].id, jobs[3].id, jobs[0].id, jobs[2].id])
+        self.assertEqual(
+            set(PendingTopic.objects.values_list("swot_status", flat=True)), {"running"}
+        )
+
+    def test_claim_respects_limit(self):
+        _, jobs = _make_jobs([1, 0, 1, 0])
+        claimed = swot_queue.claim_swot_jobs(3)
+        self.assertEqual(len(claimed), 3)
+        self.assertEqual(PendingTopic.objects.get(id=jobs[2].id).swot_status, "pending")
+
+    def test_requeue_only_stale_running_jobs(self):
+        _, jobs = _make_jobs([0, 0, 1])
+        now = timezone.now()
+        PendingTopic.objects.filter(id=jobs[0].id).update(
+            swot_status="running", swot_updated_at=now - swot_queue.STALE_RUNNING_AFTER - timedelta(minutes=1)
+        )
+        PendingTopic.objects.filter(id=jobs[1].id).update(swot_status="running", swot_updated_at=now)
+        self.assertEqual(swot_queue.requeue_stale_jobs(), 1)
+        statuses = dict(PendingTopic.objects.values_list("id", "swot_status"))
+        self.assertEqual(statuses, {jobs[0].id: "pending", jobs[1].id: "running", jobs[2].id: "pending"})
+
+
+class SwotWorkerTests(TransactionTestCase):
+    def test_one_batched_call_per_rawtext(self):
+        rawtexts, jobs = _make_jobs([1, 0, 1, 0])
+        calls = []
+
+        def analyze(mentions, author_name):
+            calls.append([context for _, context in mentions])
+            return [{"stance": 1, "impact_strength": 2} for _ in mentions]
+
+        with mock.patch.object(swot_queue, "analyze_swot_triggers_batch", side_effect=analyze):
+            result = swot_queue.process_swot_jobs(workers=1)
+        self.assertEqual(result, {"done": 4, "failed": 0})
+        self.assertCountEqual(calls, [["Context 1", "Context 3"], ["Context 0", "Context 2"]])
+
+    def test_failed_batch_marks_jobs_failed(self):
+        _make_jobs([0, 0])
+        with mock.patch.object(swot_queue, "analyze_swot_triggers_batch", side_effect=lambda m, a: [None] * len(m)):
+            result = swot_queue.process_swot_jobs(workers=1)
+        self.assertEqual(result, {"done": 0, "failed": 2})
+        self.assertEqual(set(PendingTopic.objects.values_list("swot_status", flat=True)), {"failed"})
+
+    @skipUnlessDBFeature("has_select_for_update_skip_locked")
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        _, jobs = _make_jobs([0, 1])
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(PendingTopic.objects.select_for_update().filter(id=jobs[0].id))
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            self.assertTrue(locked.wait(5))
+            claimed = swot_queue.claim_swot_jobs(10)
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual([job.id for job in claimed], [jobs[1].id])
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import httpx
+from django.test import TestCase
+from django.utils import timezone
+
+from narratives.models import WikipediaLookup
+from narratives.utils.wikipedia_lookup import (
+    TITLES_PER_REQUEST,
+    MediaWikiBackend,
+    lookup_wikipedia_page,
+    lookup_wikipedia_pages,
+)
+
+PAGES = {"Bitcoin", "Ethereum", "Inflation"} | {f"Page {i}" for i in range(45)}
+REDIRECTS = {"BTC": "Bitcoin", "Ether": "Ethereum"}
+
+
+class FakeMediaWiki:
+    """Stand-in for the MediaWiki query API: capitalises the first letter, follows REDIRECTS, knows PAGES."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        titles = request.url.params["titles"].split("|")
+        self.requests.append(titles)
+        normalized, redirects, pages = [], [], []
+        for title in titles:
+            target = title[0].upper() + title[1:]
+            if target != title:
+                normalized.append({"from": title, "to": target})
+            if target in REDIRECTS:
+                redirects.append({"from": target, "to": REDIRECTS[target]})
+                target = REDIRECTS[target]
+            if target in PAGES:
+                pages.append({
+                    "title": target,
+                    "fullurl": f"https://en.wikipedia.org/wiki/{target.replace(' ', '_')}",
+                    "extract": f"{target} is a thing.",
+                })
+            else:
+                pages.append({"title": target, "missing": True})
+        return httpx.Response(200, json={"query": {"normalized": normalized, "redirects": redirects, "pages": pages}})
+
+
+class WikipediaLookupTests(TestCase):
+    def setUp(self):
+        self.api = FakeMediaWiki()
+        self.backend = MediaWikiBackend(api_url="https://{lang}.wiki.test/w/api.php", transport=httpx.MockTransport(self.api))
+        self.addCleanup(self.backend.close)
+
+    def test_batches_at_most_twenty_titles_per_request(self):
+        names = [f"Page {i}" for i in range(45)]
+        result = lookup_wikipedia_pages(names, backend=self.backend)
+        self.assertEqual([len(titles) for titles in self.api.requests], [TITLES_PER_REQUEST, TITLES_PER_REQUEST, 5])
+        self.assertEqual(set(result), set(names))
+        self.assertEqual(result["Page 44"]["title"], "Page 44")
+
+    def test_normalized_and_redirected_titles_map_back_to_the_name_asked(self):
+        result = lookup_wikipedia_pages(["bitcoin", "BTC", "ether"], backend=self.backend)
+        self.assertEqual({name: page["title"] for name, page in result.items()},
+                         {"bitcoin": "Bitcoin", "BTC": "Bitcoin", "ether": "Ethereum"})
+        self.assertEqual(result["BTC"]["url"], "https://en.wikipedia.org/wiki/Bitcoin")
+        self.assertEqual(len(self.api.requests), 1)
+
+    def test_missing_pages_are_cached_as_negative_results(self):
+        result = lookup_wikipedia_pages(["Bitcoin", "No Such Page"], backend=self.backend)
+        self.assertIsNone(result["No Such Page"])
+        entry = WikipediaLookup.objects.get(lang="en", name="No Such Page")
+        self.assertFalse(entry.exists)
+        self.assertTrue(WikipediaLookup.objects.get(lang="en", name="Bitcoin").exists)
+
+    def test_cached_names_skip_the_network(self):
+        lookup_wikipedia_pages(["Bitcoin", "No Such Page"], backend=self.backend)
+        result = lookup_wikipedia_pages(["Bitcoin", "  No   Such Page ", "Inflation"], backend=self.backend)
+        self.assertEqual(self.api.requests[1:], [["Inflation"]])
+        self.assertEqual(result["Bitcoin"]["title"], "Bitcoin")
+        self.assertIsNone(result["  No   Such Page "])
+
+    def test_expired_negative_results_are_looked_up_again(self):
+        WikipediaLookup.objects.create(
+            lang="en", name="Inflation", exists=False, fetched_at=timezone.now() - timedelta(days=365)
+        )
+        self.assertEqual(lookup_wikipedia_page("Inflation", backend=self.backend)["title"], "Inflation")
+        self.assertEqual(self.api.requests, [["Inflation"]])
+        self.assertTrue(WikipediaLookup.objects.get(lang="en", name="Inflation").exists)
+
+    def test_invalid_titles_are_not_sent(self):
+        self.assertEqual(lookup_wikipedia_pages(["a|b"], backend=self.backend), {"a|b": None})
+        self.assertEqual(self.api.requests, [])
@@ -18,9 +18,11 @@ from .views import (
     RawTextRemoveTopicView,
     RawTextCategorizeAllView,
     RawTextCategorizeByTopicView,
+    RawTextCategorizeChangedTopicsView,
     RawTextAISuggestTopicsView,
     RawTextsByTopicsView,
     PendingTopicActionView,
+    SwotJobStatusView,
 
     # Markets
     MarketCreateView,
@@ -37,6 +39,7 @@ from .views import (
     TopicCreateView,
     TopicDetailView,
     TopicEnhanceWikipediaView,
+    TopicSimulateRulesView,
     DeclinedTopicListView,
     TopicBulkDeleteView,
     TopicDistributionView,
@@ -72,10 +75,12 @@ urlpatterns = [
     path('rawtexts/<int:id>/remove-topic/', RawTextRemoveTopicView.as_view(), name='rawtext-remove-topic'),
     path('rawtexts/categorize-all/', RawTextCategorizeAllView.as_view(), name='rawtext-categorize-all'),
     path('rawtexts/categorize-by-topic/', RawTextCategorizeByTopicView.as_view(), name='rawtext-categorize-by-topic'),
+    path('rawtexts/categorize-changed/', RawTextCategorizeChangedTopicsView.as_view(), name='rawtext-categorize-changed'),
     path('rawtexts/<int:id>/ai-suggest/', RawTextAISuggestTopicsView.as_view(), name='rawtext-ai-suggest'),
     path('rawtexts/by-topics/', RawTextsByTopicsView.as_view(), name='rawtexts-by-topics'),
     path('rawtexts/', RawTextListView.as_view(), name='rawtext-list'),
     path('pending-topics/<int:id>/action/', PendingTopicActionView.as_view(), name='pending-topic-action'),
+    path('pending-topics/swot-status/', SwotJobStatusView.as_view(), name='pending-topic-swot-status'),
 
     # TOPICS
     path('topics/', TopicListView.as_view(), name='topic-list'),
@@ -91,6 +96,7 @@ urlpatterns = [
     path('topics/<int:id>/aggregated/', TopicAggregatedDetailView.as_view(), name='topic-aggregated-detail'),
     path('topics/<int:id>/mentions-by-day/', TopicMentionsByDayView.as_view(), name='topic-mentions-by-day'),
     path('topics/<int:id>/enhance-wikipedia/', TopicEnhanceWikipediaView.as_view(), name='topic-enhance-wikipedia'),
+    path('topics/<int:id>/simulate-rules/', TopicSimulateRulesView.as_view(), name='topic-simulate-rules'),
     path('topics/<int:id>/distribution/', TopicDistributionView.as_view(), name='topic-distribution'),
     path('declined-topics/', DeclinedTopicListView.as_view(), name='declined-topic-list'),
 
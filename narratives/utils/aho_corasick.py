@@ -0,0 +1,143 @@
+# narratives/utils/aho_corasick.py
+"""
+Aho–Corasick multi-pattern matcher for the keyword passes that FlashText does not cover
+(case-sensitive whole-word and substring keywords). One scan over the text finds every
+occurrence of every pattern; the helpers below then reproduce exactly what a separate
+re.finditer per keyword returned (\\b word boundaries, IGNORECASE, non-overlapping hits).
+"""
+
+from collections import deque
+
+try:
+    from _sre import unicode_tolower as _sre_tolower
+except ImportError:  # not CPython
+    def _sre_tolower(code):
+        lower = chr(code).lower()
+        return ord(lower) if len(lower) == 1 else code
+
+try:
+    from re._casefix import _EXTRA_CASES  # Python 3.11+
+except ImportError:
+    try:
+        from sre_compile import _ignorecase_fixes as _EXTRA_CASES  # Python <= 3.10
+    except ImportError:
+        _EXTRA_CASES = {}
+
+
+class AhoCorasick:
+    """Automaton over a list of patterns. iter_matches yields (start, end, pattern_index) for every occurrence."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.lengths = [len(p) for p in self.patterns]
+        goto = [{}]
+        out = [()]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    out.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state] = out[state] + (index,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def iter_matches(self, text: str):
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self.lengths
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0) if state else root.get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for index in out[state]:
+                    yield end - lengths[index], end, index
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same definition as \w for str patterns in re.
+    return ch.isalnum() or ch == "_"
+
+
+def _has_word_boundary(text: str, pos: int) -> bool:
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _non_overlapping(hits):
+    """hits: (start, end) sorted by start. Keep what re.finditer would: leftmost first, then resume at its end."""
+    spans = []
+    last_end = -1
+    for start, end in hits:
+        if start >= last_end:
+            spans.append((start, end))
+            last_end = end
+    return spans
+
+
+def _group_hits(automaton: AhoCorasick, text: str, accept=None) -> dict:
+    by_pattern = {}
+    for start, end, index in automaton.iter_matches(text):
+        if accept is None or accept(start, end):
+            by_pattern.setdefault(index, []).append((start, end))
+    return {
+        automaton.patterns[index]: _non_overlapping(sorted(hits))
+        for index, hits in by_pattern.items()
+    }
+
+
+def find_whole_words(automaton: AhoCorasick, text: str) -> dict:
+    """pattern -> [(start, end), ...], same spans as re.finditer(r'\\b' + re.escape(pattern) + r'\\b', text)."""
+    return _group_hits(
+        automaton, text,
+        accept=lambda start, end: _has_word_boundary(text, start) and _has_word_boundary(text, end),
+    )
+
+
+class _FoldTable(dict):
+    """str.translate table mapping each character to its re.IGNORECASE equivalence class representative."""
+
+    def __missing__(self, code):
+        lower = _sre_tolower(code)
+        folded = min((lower,) + tuple(_EXTRA_CASES.get(lower, ())))
+        self[code] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold_case(text: str) -> str:
+    """Character-by-character case fold (length preserving), equal for strings re.IGNORECASE treats as equal."""
+    return text.translate(_FOLD_TABLE)
+
+
+def find_substrings_ignorecase(automaton: AhoCorasick, text: str) -> dict:
+    """
+    automaton must be built over fold_case(pattern) strings.
+    Returns folded pattern -> [(start, end), ...], same spans as re.finditer(re.escape(pattern), text, re.IGNORECASE).
+    """
+    return _group_hits(automaton, fold_case(text))
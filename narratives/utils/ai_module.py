@@ -1,78 +1,177 @@
 import os
 import json
+import logging
 import re
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
 import openai
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+logger = logging.getLogger(__name__)
+
 # -------------------------
 # POS FILTER (spaCy) - Level 2, called only when pos_filter is set
 # -------------------------
 
-_nlp = None
-
 def _get_nlp():
-    """Lazy-load spaCy model. Only loaded when pos_filter is used."""
-    global _nlp
-    if _nlp is None:
-        import spacy
-        _nlp = spacy.load("en_core_web_sm")
-    return _nlp
-
-def _check_pos_filter(context: str, match_start_in_context: int, pos_filter: list) -> bool:
+    """Full spaCy pipeline (see narratives.utils.nlp for the slim POS-only / NER-only ones)."""
+    from narratives.utils.nlp import get_nlp
+    return get_nlp()
+
+_POS_CACHE_SIZE = 10000
+_pos_cache = OrderedDict()  # context string -> (starts, ends, pos tags); LRU
+_pos_cache_lock = threading.Lock()
+
+
+def _pos_layers(contexts) -> dict:
     """
-    Check if the token at match_start_in_context has one of the allowed POS tags.
-    pos_filter: e.g. ["NOUN", "PROPN"] - spaCy universal POS tags.
-    Returns True if the matched token's POS is in pos_filter, False otherwise.
+    POS layer per context string: (token starts, token ends, POS tags) as compact arrays.
+    Uncached strings are parsed in one nlp.pipe batch; results are kept in a process-wide LRU,
+    so a sentence is tagged once however many hits (and re-runs over the same article) it has.
+    Strings that fail to parse are missing from the result.
     """
-    if not pos_filter or not context:
+    layers = {}
+    missing = []
+    with _pos_cache_lock:
+        for context in dict.fromkeys(contexts):
+            layer = _pos_cache.get(context)
+            if layer is None:
+                missing.append(context)
+            else:
+                _pos_cache.move_to_end(context)
+                layers[context] = layer
+    if not missing:
+        return layers
+    try:
+        from narratives.utils.nlp import get_pos_nlp
+        parsed = {}
+        for context, doc in zip(missing, get_pos_nlp().pipe(missing)):
+            parsed[context] = (
+                array("l", (token.idx for token in doc)),
+                array("l", (token.idx + len(token.text) for token in doc)),
+                tuple(token.pos_ for token in doc),
+            )
+    except Exception as e:
+        logger.warning("POS tagging failed: %s", e)
+        return layers
+    layers.update(parsed)
+    with _pos_cache_lock:
+        _pos_cache.update(parsed)
+        while len(_pos_cache) > _POS_CACHE_SIZE:
+            _pos_cache.popitem(last=False)
+    return layers
+
+
+def _pos_filter_matches(layer, offset: int, pos_filter: list) -> bool:
+    """True if the token covering offset in a _pos_layers layer has one of the pos_filter tags."""
+    if not pos_filter:
         return True
     pos_filter_set = {p.upper().strip() for p in pos_filter if p}
     if not pos_filter_set:
         return True
-    try:
-        nlp = _get_nlp()
-        doc = nlp(context)
-        for token in doc:
-            # token.idx is start char offset of token in the doc
-            if token.idx <= match_start_in_context < token.idx + len(token.text):
-                return token.pos_ in pos_filter_set
+    if layer is None:
         return False
-    except Exception:
+    starts, ends, tags = layer
+    i = bisect_right(starts, offset) - 1
+    if i < 0 or offset >= ends[i]:
         return False
+    return tags[i] in pos_filter_set
+
 
 # -------------------------
 # ENTITY EXTRACTION (spaCy) - Level 1, called for hybrid suggestions
 # -------------------------
 
-def extract_entities_with_spacy(text: str, labels=["PERSON", "ORG"]):
+# Texts are tagged in chunks of about this many characters, cut at line / paragraph boundaries
+# (transcripts are one caption per line), so a multi-hour transcript never becomes one huge Doc.
+NER_CHUNK_CHARS = 10000
+# TopicType ids for NER labels are re-read after this many seconds.
+_LABEL_MAP_TTL = 300
+_label_map_cache = (0.0, None)  # (expires at, {label: {"id", "name"} or None})
+
+# Common crypto terms that spaCy misidentifies as PERSON/ORG
+# We don't blacklist them from the system, just prevent spaCy from
+# incorrectly tagging them as a "Person" or "Organization".
+# These will be handled by the LLM as general concepts or Collective Actors.
+SPACY_NER_NOISE = frozenset({
+    "whale", "whales", "bull", "bear", "bulls", "bears",
+    "moon", "pump", "dump", "gas", "fiat", "stablecoin",
+    "holders", "hodlers", "traders", "investors"
+})
+
+
+def _ner_label_map() -> dict:
+    """Resolve Person / Organization from DB (no hardcoded IDs); cached for _LABEL_MAP_TTL seconds."""
+    global _label_map_cache
+    expires_at, label_map = _label_map_cache
+    if label_map is not None and time.monotonic() < expires_at:
+        return label_map
+    from narratives.models import TopicType
+    label_to_type_name = {"PERSON": "Person", "ORG": "Organization"}
+    types = {tt.name: tt for tt in TopicType.objects.filter(name__in=label_to_type_name.values())}
+    label_map = {}
+    for spacy_label, type_name in label_to_type_name.items():
+        tt = types.get(type_name)
+        # type not in DB: skip suggesting type for this label
+        label_map[spacy_label] = {"id": tt.id, "name": tt.name} if tt else None
+    _label_map_cache = (time.monotonic() + _LABEL_MAP_TTL, label_map)
+    return label_map
+
+
+def _ner_chunks(text: str, max_chars: int = NER_CHUNK_CHARS):
+    """Yield consecutive pieces of text of at most about max_chars, cut after a newline (else a sentence end or space)."""
+    start = 0
+    n = len(text)
+    while start < n:
+        end = start + max_chars
+        if end >= n:
+            yield text[start:]
+            return
+        cut = text.rfind("\n", start, end) + 1
+        if cut <= start:
+            cut = max(text.rfind(". ", start, end), text.rfind("? ", start, end), text.rfind("! ", start, end)) + 2
+        if cut <= start + 1:
+            cut = text.rfind(" ", start, end) + 1
+        if cut <= start:
+            cut = end
+        yield text[start:cut]
+        start = cut
+
+
+def extract_entities_with_spacy(text: str, labels=["PERSON", "ORG"], n_process: int = None):
     """
     Extracts named entities from text using spaCy.
     Maps labels to actual TopicType from DB (Person, Organization) so suggested_type_id is always valid.
+    Long texts are streamed through nlp.pipe in chunks (see NER_CHUNK_CHARS) and entities merged as they come,
+    so memory stays bounded. n_process > 1 (default SPACY_NER_PROCESSES) tags chunks in parallel processes
+    when the text has more than one chunk per process.
     """
     if not text:
         return []
     
     try:
-        from narratives.models import TopicType
-        # Resolve Person / Organization from DB (no hardcoded IDs)
-        label_to_type_name = {"PERSON": "Person", "ORG": "Organization"}
-        label_map = {}
-        for spacy_label, type_name in label_to_type_name.items():
-            tt = TopicType.objects.filter(name=type_name).first()
-            if tt:
-                label_map[spacy_label] = {"id": tt.id, "name": tt.name}
-            else:
-                label_map[spacy_label] = None  # type not in DB, skip suggesting type for this label
-
-        nlp = _get_nlp()
-        doc = nlp(text)
+        from django.conf import settings
+        from narratives.utils.nlp import get_ner_nlp
+
+        label_map = _ner_label_map()
+        nlp = get_ner_nlp()
+        if n_process is None:
+            n_process = getattr(settings, "SPACY_NER_PROCESSES", 1)
+        if n_process > 1 and len(text) <= NER_CHUNK_CHARS * n_process:
+            n_process = 1
         
         entities = []
         seen = set()
         
-        for ent in doc.ents:
-            if ent.label_ in labels:
+        for doc in nlp.pipe(_ner_chunks(text), batch_size=4, n_process=max(1, n_process)):
+            for ent in doc.ents:
+                if ent.label_ not in labels:
+                    continue
                 clean_text = ent.text.strip()
                 
                 # Filter out obvious false positives for PERSON and ORG
@@ -81,15 +180,7 @@ def extract_entities_with_spacy(text: str, labels=["PERSON", "ORG"]):
                     continue
                 
                 # 2. Common crypto terms that spaCy misidentifies as PERSON/ORG
-                # We don't blacklist them from the system, just prevent spaCy from 
-                # incorrectly tagging them as a "Person" or "Organization".
-                # These will be handled by the LLM as general concepts or Collective Actors.
-                spacy_ner_noise = {
-                    "whale", "whales", "bull", "bear", "bulls", "bears",
-                    "moon", "pump", "dump", "gas", "fiat", "stablecoin",
-                    "holders", "hodlers", "traders", "investors"
-                }
-                if clean_text.lower() in spacy_ner_noise:
+                if clean_text.lower() in SPACY_NER_NOISE:
                     continue
 
                 # Basic cleanup and deduplication
@@ -113,10 +204,11 @@ def extract_entities_with_spacy(text: str, labels=["PERSON", "ORG"]):
 # -------------------------
 
 from flashtext import KeywordProcessor
-from django.core.cache import cache
-import hashlib
+import pickle
+import tempfile
 
 from narratives.utils.text import get_keyword_spec_from_entry
+from narratives.utils.aho_corasick import AhoCorasick, find_substrings_ignorecase, find_whole_words, fold_case
 
 # Single-word topic names that must NOT be used as keyword (cause too many false positives).
 # Only applies when the topic name is exactly one word. Topic still matches via other keywords.
@@ -126,36 +218,31 @@ NAME_AS_KEYWORD_SKIP = frozenset({
 })
 
 # -------------------------
-# KEYWORD ENGINE CACHING
+# KEYWORD ENGINE (compiled matcher)
 # -------------------------
 
-def _topic_config_signature(t: dict) -> str:
-    """Signature for cache: include keyword text and whole_word_only/case_sensitive."""
-    parts = []
-    for entry in t.get('keywords', []) + t.get('weak_keywords', []):
-        kw, wo, cs = get_keyword_spec_from_entry(entry)
-        if kw:
-            parts.append(f"{kw}:{wo}:{cs}")
-    return "|".join(parts)
-
-
-def _get_keyword_processor(topics_data: list):
+class KeywordMatcher:
     """
-    Returns FlashText processor (whole-word case-insensitive), keyword_map, weak_rules,
-    plus case_sensitive_list and substring_list for separate passes.
+    Compiled keyword rules for a set of topics: FlashText processor (whole-word case-insensitive),
+    keyword_map, weak_rules, plus case_sensitive_list and substring_list for separate passes.
+    Both separate passes run as one Aho–Corasick scan each (case_sensitive_automaton over the
+    exact keywords, substring_automaton over their case-folded forms) instead of one regex per keyword.
+    version is the categorization_version the matcher was built for (None for ad-hoc matchers).
     """
-    config_state = []
-    for t in topics_data:
-        config_state.append(f"{t['id']}:{len(t.get('keywords', []))}:{len(t.get('weak_keywords', []))}:{_topic_config_signature(t)}")
-    config_hash = hashlib.md5(",".join(config_state).encode()).hexdigest()
-    cache_key = f"keyword_processor_{config_hash}"
-    cached = cache.get(cache_key)
-    if cached:
-        return (
-            cached['processor'], cached['keyword_map'], cached['weak_rules'],
-            cached['case_sensitive_list'], cached['substring_list']
-        )
 
+    def __init__(self, processor, keyword_map, weak_rules, case_sensitive_list, substring_list, version=None):
+        self.processor = processor
+        self.keyword_map = keyword_map
+        self.weak_rules = weak_rules
+        self.case_sensitive_list = case_sensitive_list
+        self.substring_list = substring_list
+        self.case_sensitive_automaton = AhoCorasick(dict.fromkeys(kw for _, kw, _, _ in case_sensitive_list))
+        self.substring_automaton = AhoCorasick(dict.fromkeys(fold_case(kw) for _, kw, _, _ in substring_list))
+        self.version = version
+
+
+def build_keyword_matcher(topics_data: list, version=None) -> KeywordMatcher:
+    """Compile topics_data (list of {id, name, alternative_name, keywords, weak_keywords}) into a KeywordMatcher."""
     keyword_processor = KeywordProcessor(case_sensitive=False)
     keyword_map = {}
     weak_rules = {}
@@ -231,15 +318,96 @@ def _get_keyword_processor(topics_data: list):
             else:
                 substring_list.append((topic_id, kw_text, True, pos_filter))
 
-    result = {
-        'processor': keyword_processor,
-        'keyword_map': keyword_map,
-        'weak_rules': weak_rules,
-        'case_sensitive_list': case_sensitive_list,
-        'substring_list': substring_list,
-    }
-    cache.set(cache_key, result, 3600)
-    return keyword_processor, keyword_map, weak_rules, case_sensitive_list, substring_list
+    return KeywordMatcher(
+        keyword_processor, keyword_map, weak_rules, case_sensitive_list, substring_list, version=version
+    )
+
+
+# One compiled matcher per process, keyed by categorization_version. Readers take the reference
+# without locking; a rebuild replaces it in one assignment once the new matcher is complete.
+_matcher = None
+_matcher_lock = threading.Lock()
+# Bump when KeywordMatcher gains/changes attributes so pickles written by older code are not loaded.
+_MATCHER_FILE_FORMAT = 2
+# Matcher files kept on disk (newest first): workers still on a previous version keep their cache.
+_MATCHER_FILES_KEPT = 3
+
+
+def _matcher_file_path(version):
+    from django.conf import settings
+    cache_dir = getattr(settings, "KEYWORD_MATCHER_CACHE_DIR", "")
+    if not cache_dir:
+        return None
+    safe_version = re.sub(r"[^A-Za-z0-9_.-]", "_", str(version))
+    return os.path.join(cache_dir, f"keyword_matcher_v{safe_version}_f{_MATCHER_FILE_FORMAT}.pickle")
+
+
+def _load_matcher_file(version):
+    path = _matcher_file_path(version)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            matcher = pickle.load(f)
+        if isinstance(matcher, KeywordMatcher) and matcher.version == version:
+            return matcher
+    except Exception as e:
+        logger.warning("Could not load keyword matcher from %s: %s", path, e)
+    return None
+
+
+def _save_matcher_file(matcher):
+    """Write the matcher next to other workers (temp file + rename); only the newest _MATCHER_FILES_KEPT files stay."""
+    path = _matcher_file_path(matcher.version)
+    if not path:
+        return
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".keyword_matcher_", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        _prune_matcher_files(cache_dir)
+    except Exception as e:
+        logger.warning("Could not write keyword matcher to %s: %s", path, e)
+
+
+def _prune_matcher_files(cache_dir):
+    files = []
+    for fname in os.listdir(cache_dir):
+        if fname.startswith("keyword_matcher_v"):
+            fpath = os.path.join(cache_dir, fname)
+            try:
+                files.append((os.path.getmtime(fpath), fpath))
+            except OSError:
+                pass  # removed by another worker meanwhile
+    for _, fpath in sorted(files, reverse=True)[_MATCHER_FILES_KEPT:]:
+        try:
+            os.remove(fpath)
+        except OSError:
+            pass
+
+
+def get_compiled_matcher(version, load_topics_data):
+    """
+    Return the KeywordMatcher for this categorization version. Built once per process (or loaded from
+    KEYWORD_MATCHER_CACHE_DIR if another worker already built it); load_topics_data() is only called on rebuild.
+    """
+    global _matcher
+    matcher = _matcher
+    if matcher is not None and matcher.version == version:
+        return matcher
+    with _matcher_lock:
+        matcher = _matcher
+        if matcher is not None and matcher.version == version:
+            return matcher
+        matcher = _load_matcher_file(version)
+        if matcher is None:
+            matcher = build_keyword_matcher(load_topics_data(), version=version)
+            _save_matcher_file(matcher)
+        _matcher = matcher
+    return matcher
 
 def _apply_weak_rules(is_weak, topic_id_str, original_kw, start, end, context, context_start, context_for_pos, weak_rules):
     """Returns (passed, found_context_words).
@@ -287,26 +455,43 @@ def _zone_for_position(position: int, zones: list) -> tuple:
     return ("content", 1)
 
 
-def suggest_topics_for_text(text: str, topics_data: list, zones: list = None):
+def suggest_topics_for_text(text: str, topics_data: list = None, zones: list = None, matcher: KeywordMatcher = None):
     """
     Suggests topics for a given text: FlashText (whole-word case-insensitive),
     then case-sensitive whole-word pass, then substring pass.
     zones: optional list of (start, end, zone_name, weight) to set found_in and weight per suggestion.
+    matcher: precompiled KeywordMatcher (see get_compiled_matcher); if omitted, one is built from topics_data.
     """
-    keyword_processor, keyword_map, weak_rules, case_sensitive_list, substring_list = _get_keyword_processor(topics_data)
+    if matcher is None:
+        matcher = build_keyword_matcher(topics_data or [])
+    keyword_processor = matcher.processor
+    keyword_map = matcher.keyword_map
+    weak_rules = matcher.weak_rules
+    case_sensitive_list = matcher.case_sensitive_list
+    substring_list = matcher.substring_list
     zones = zones or []
 
-    sentences = []
+    # Sentence index: sentences never overlap and come in order, so the only one that can contain
+    # a match is the last one starting at or before it (bisect). Context strings are built once per sentence.
+    sentence_starts = []
+    sentence_ends = []
     for m in re.finditer(r'[^.!?]+[.!?]?', text):
-        sentences.append({'text': m.group(), 'start': m.start(), 'end': m.end()})
+        sentence_starts.append(m.start())
+        sentence_ends.append(m.end())
+    sentence_contexts = {}
 
     seen_span = set()  # (topic_id, start, end) to dedupe
     suggestions = []
 
-    def get_context(text, sentences, start, end):
-        for s in sentences:
-            if s['start'] <= start and s['end'] >= end:
-                return s['text'].strip(), s['text'], s['start']
+    def get_context(text, start, end):
+        i = bisect_right(sentence_starts, start) - 1
+        if i >= 0 and sentence_ends[i] >= end:
+            cached = sentence_contexts.get(i)
+            if cached is None:
+                raw = text[sentence_starts[i]:sentence_ends[i]]
+                cached = (raw.strip(), raw, sentence_starts[i])
+                sentence_contexts[i] = cached
+            return cached
         c_start = max(0, start - 100)
         c_end = min(len(text), end + 150)
         ctx_raw = text[c_start:c_end]
@@ -317,14 +502,16 @@ def suggest_topics_for_text(text: str, topics_data: list, zones: list = None):
             ctx = ctx + "..."
         return ctx, ctx_raw, c_start
 
+    pos_layers = {}
+
     def add_suggestion(topic_id, start, end, keyword_for_rules, matched_keyword_display, is_weak, pos_filter):
         key = (str(topic_id), start, end)
         if key in seen_span:
             return
-        context, context_for_pos, context_start = get_context(text, sentences, start, end)
+        context, context_for_pos, context_start = get_context(text, start, end)
         if pos_filter and context_for_pos:
             match_start_in_context = start - context_start
-            if not _check_pos_filter(context_for_pos, match_start_in_context, pos_filter):
+            if not _pos_filter_matches(pos_layers.get(context_for_pos), match_start_in_context, pos_filter):
                 return
         passed, found_context_words = _apply_weak_rules(
             is_weak, str(topic_id), keyword_for_rules, start, end, context, context_start, context_for_pos, weak_rules
@@ -343,6 +530,10 @@ def suggest_topics_for_text(text: str, topics_data: list, zones: list = None):
             "weight": weight,
         })
 
+    # Hits are collected first (same order as the passes below), so every context that needs a POS
+    # check is tagged in one nlp.pipe batch before the rules run.
+    candidates = []
+
     # 1) FlashText pass (whole-word, case-insensitive)
     keywords_found = keyword_processor.extract_keywords(text, span_info=True)
     for matched_kw_lower, start, end in keywords_found:
@@ -352,17 +543,27 @@ def suggest_topics_for_text(text: str, topics_data: list, zones: list = None):
                 topic_info[0], topic_info[1], topic_info[2],
                 topic_info[3] if len(topic_info) > 3 else None
             )
-            add_suggestion(int(topic_id_str), start, end, original_kw, original_kw, is_weak, pos_filter)
+            candidates.append((int(topic_id_str), start, end, original_kw, original_kw, is_weak, pos_filter))
 
-    # 2) Case-sensitive whole-word pass (!"WHO")
-    for topic_id_str, kw_exact, is_weak, pos_filter in case_sensitive_list:
-        for m in re.finditer(r'\b' + re.escape(kw_exact) + r'\b', text):
-            add_suggestion(int(topic_id_str), m.start(), m.end(), kw_exact, kw_exact, is_weak, pos_filter)
+    # 2) Case-sensitive whole-word pass (!"WHO"): one scan for all keywords, then per-keyword spans in list order
+    if case_sensitive_list:
+        spans_by_kw = find_whole_words(matcher.case_sensitive_automaton, text)
+        for topic_id_str, kw_exact, is_weak, pos_filter in case_sensitive_list:
+            for start, end in spans_by_kw.get(kw_exact, ()):
+                candidates.append((int(topic_id_str), start, end, kw_exact, kw_exact, is_weak, pos_filter))
 
     # 3) Substring pass (whole_word_only=False); rule lookup by stored keyword, display matched text
-    for topic_id_str, kw, is_weak, pos_filter in substring_list:
-        for m in re.finditer(re.escape(kw), text, re.IGNORECASE):
-            matched_text = text[m.start():m.end()]
-            add_suggestion(int(topic_id_str), m.start(), m.end(), kw, matched_text, is_weak, pos_filter)
+    if substring_list:
+        spans_by_kw = find_substrings_ignorecase(matcher.substring_automaton, text)
+        for topic_id_str, kw, is_weak, pos_filter in substring_list:
+            for start, end in spans_by_kw.get(fold_case(kw), ()):
+                matched_text = text[start:end]
+                candidates.append((int(topic_id_str), start, end, kw, matched_text, is_weak, pos_filter))
+
+    pos_contexts = [get_context(text, c[1], c[2])[1] for c in candidates if c[6]]
+    if pos_contexts:
+        pos_layers.update(_pos_layers(ctx for ctx in pos_contexts if ctx))
+    for candidate in candidates:
+        add_suggestion(*candidate)
 
     return suggestions
@@ -1,14 +1,24 @@
 # narratives/utils/categorize.py
-"""Run Find Topics (keyword-based categorization) for a RawText. Used by RawTextFindTopicsView and after import."""
+"""
+Run Find Topics (keyword-based categorization) for one RawText or a batch. Used by RawTextFindTopicsView, the categorize views/command and after import.
+run_incremental_recategorization re-runs only topics whose rules changed (TopicRuleChange log);
+simulate_topic_rules previews proposed rules for one topic without writing anything.
+"""
 
+import logging
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
-from narratives.models import Topic, PendingTopic, RawText
-from narratives.models.categories import AppConfiguration
+from narratives.models import Topic, PendingTopic, RawText, ContextSet
+from narratives.models.categories import AppConfiguration, TopicRuleChange
 from narratives.models.analytical import TopicAnalyticalCategory
-from narratives.utils.ai_module import suggest_topics_for_text
+from narratives.utils.ai_module import build_keyword_matcher, get_compiled_matcher, suggest_topics_for_text
 from narratives.utils.context_expand import expand_weak_keywords_for_topics_data
-from narratives.utils.local_ai import analyze_swot_trigger
+
+logger = logging.getLogger(__name__)
 
 
 def _looks_like_price_ticker(paragraph: str) -> bool:
@@ -25,28 +35,36 @@ def _looks_like_price_ticker(paragraph: str) -> bool:
     return False
 
 
-def run_find_topics_for_rawtext(rawtext: RawText, reset: bool = False):
-    """
-    Same logic as "Find topics" button: match keywords/weak keywords, create PendingTopics (auto-approved).
-    Returns (suggestions_count, created_count).
-    """
-    if reset:
-        PendingTopic.objects.filter(rawtext=rawtext).delete()
-
-    current_version = AppConfiguration.get_version("categorization_version")
-
+def load_topics_data(topic_ids=None) -> list:
+    """Keyword rules of all searchable (non-placeholder) topics, with [SLUG] context sets expanded. topic_ids limits to those topics."""
+    context_sets_by_slug = {cs.slug: (cs.words or []) for cs in ContextSet.objects.all()}
     topics = Topic.objects.filter(is_placeholder=False)
+    if topic_ids is not None:
+        topics = topics.filter(id__in=topic_ids)
     topics_data = []
     for t in topics:
-        weak_expanded = expand_weak_keywords_for_topics_data(t.weak_keywords or [])
         topics_data.append({
             "id": t.id,
             "name": t.name,
             "alternative_name": t.alternative_name,
             "keywords": t.keywords,
-            "weak_keywords": weak_expanded,
+            "weak_keywords": expand_weak_keywords_for_topics_data(t.weak_keywords or [], context_sets_by_slug),
         })
+    return topics_data
+
 
+def get_keyword_matcher(version: str = None):
+    """Compiled keyword matcher for the current categorization_version (rebuilt only when the version changes)."""
+    if version is None:
+        version = AppConfiguration.get_version("categorization_version")
+    return get_compiled_matcher(version, load_topics_data)
+
+
+def build_search_text(rawtext: RawText):
+    """
+    Text that keyword search runs on: title, subtitle and content joined by blank lines, plus zones
+    [(start, end, zone_name, weight), ...]. For direct sources the lead paragraph is its own zone (weight 5).
+    """
     title = (rawtext.title or "").strip()
     subtitle = (rawtext.subtitle or "").strip()
     content = (rawtext.content or "").strip()
@@ -88,60 +106,252 @@ def run_find_topics_for_rawtext(rawtext: RawText, reset: bool = False):
     if not text_to_search:
         text_to_search = rawtext.content or ""
         zones = []
+    return text_to_search, zones
 
-    suggestions = suggest_topics_for_text(text_to_search, topics_data, zones=zones)
-    created_count = 0
 
-    for sug in suggestions:
-        topic_id = sug.get("topic_id")
-        context = sug.get("context")
-        matched_keyword = sug.get("matched_keyword")
-        is_weak = sug.get("is_weak", False)
+def get_threat_topic_ids() -> set:
+    """Ids of topics classified as SWOT threat (their mentions get a SWOT survey)."""
+    return set(
+        TopicAnalyticalCategory.objects.filter(
+            analytical_category__framework__slug="swot",
+            analytical_category__slug="threat",
+        ).values_list("topic_id", flat=True)
+    )
 
-        if not topic_id or not context:
-            continue
+
+def _chunked(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _categorize_chunk(rawtexts, reset, matcher, topic_names, threat_topic_ids, current_version, topic_ids=None):
+    """
+    Match one chunk of RawTexts and write its PendingTopics / versions in one transaction. Returns (done, suggestions, created).
+    topic_ids: the matcher only covers these topics; reset then deletes only their PendingTopics.
+    """
+    ids = [rt.id for rt in rawtexts]
+    existing = PendingTopic.objects.filter(rawtext_id__in=ids)
+    if topic_ids is not None:
+        existing = existing.filter(topic_id__in=topic_ids)
+    if reset:
+        seen = set()
+    else:
+        seen = set(existing.values_list("rawtext_id", "topic_id", "context"))
+
+    now = timezone.now()
+    done = []
+    to_create = []
+    suggestions_count = 0
+    for rawtext in rawtexts:
         try:
-            topic = Topic.objects.get(id=topic_id)
-        except Topic.DoesNotExist:
+            text_to_search, zones = build_search_text(rawtext)
+            suggestions = suggest_topics_for_text(text_to_search, zones=zones, matcher=matcher)
+        except Exception:
+            logger.exception("Categorization failed for RawText id=%s", rawtext.id)
             continue
+        suggestions_count += len(suggestions)
 
-        if PendingTopic.objects.filter(rawtext=rawtext, topic=topic, context=context).exists():
-            continue
+        for sug in suggestions:
+            topic_id = sug.get("topic_id")
+            context = sug.get("context")
+            if not topic_id or not context or topic_id not in topic_names:
+                continue
+            key = (rawtext.id, topic_id, context)
+            if key in seen:
+                continue
+            seen.add(key)
+            to_create.append(PendingTopic(
+                rawtext=rawtext,
+                topic_id=topic_id,
+                context=context,
+                status="approved",
+                matched_keyword=sug.get("matched_keyword"),
+                is_weak=sug.get("is_weak", False),
+                found_context_words=sug.get("found_context_words", []),
+                found_in=sug.get("found_in"),
+                weight=sug.get("weight", 1),
+                # Threat mentions are analyzed later by the SWOT worker (narratives.utils.swot_queue).
+                swot_status="pending" if topic_id in threat_topic_ids else "",
+                swot_updated_at=now if topic_id in threat_topic_ids else None,
+            ))
+        rawtext.categorization_version = current_version
+        rawtext.last_categorized_at = now
+        done.append(rawtext)
 
-        swot_analysis = {}
-        if TopicAnalyticalCategory.objects.filter(
-            topic=topic,
-            analytical_category__framework__slug="swot",
-            analytical_category__slug="threat",
-        ).exists():
-            try:
-                author_name = getattr(rawtext.source, "name", None) or "the author"
-                swot_result = analyze_swot_trigger(topic.name, context, author_name)
-                if isinstance(swot_result, dict):
-                    swot_analysis = {
-                        k: swot_result[k]
-                        for k in ("pestel_category", "impact_strength", "stance", "summary")
-                        if k in swot_result
-                    }
-            except Exception as swot_err:
-                pass  # skip SWOT on error
-
-        PendingTopic.objects.create(
-            rawtext=rawtext,
-            topic=topic,
-            context=context,
-            status="approved",
-            matched_keyword=matched_keyword,
-            is_weak=is_weak,
-            found_context_words=sug.get("found_context_words", []),
-            found_in=sug.get("found_in"),
-            weight=sug.get("weight", 1),
-            swot_analysis=swot_analysis,
+    with transaction.atomic():
+        if reset and done:
+            existing.filter(rawtext_id__in=[rt.id for rt in done]).delete()
+        PendingTopic.objects.bulk_create(to_create, batch_size=500)
+        if done:
+            RawText.objects.bulk_update(done, ["categorization_version", "last_categorized_at"])
+    return len(done), suggestions_count, len(to_create)
+
+
+def run_find_topics_for_texts(rawtexts, reset: bool = False, chunk_size: int = 200, progress_callback=None):
+    """
+    Batch "Find topics" over a RawText queryset or iterable. The keyword matcher, topic names and the
+    threat-topic set are loaded once; PendingTopics are deduped in memory and written with bulk_create,
+    versions with one bulk_update per chunk. Texts that fail matching are logged and skipped.
+    progress_callback(processed, created), if given, is called after every chunk.
+    Returns (processed_count, suggestions_count, created_count).
+    """
+    current_version = AppConfiguration.get_version("categorization_version")
+    matcher = get_keyword_matcher(current_version)
+    topic_names = dict(Topic.objects.values_list("id", "name"))
+    threat_topic_ids = get_threat_topic_ids()
+
+    if isinstance(rawtexts, QuerySet):
+        rawtexts = rawtexts.select_related("source").iterator(chunk_size=chunk_size)
+
+    processed = suggestions_total = created_total = 0
+    for chunk in _chunked(rawtexts, chunk_size):
+        done, suggestions_count, created = _categorize_chunk(
+            chunk, reset, matcher, topic_names, threat_topic_ids, current_version
         )
-        created_count += 1
+        processed += done
+        suggestions_total += suggestions_count
+        created_total += created
+        if progress_callback:
+            progress_callback(processed, created_total)
+    return processed, suggestions_total, created_total
+
+
+def run_find_topics_for_rawtext(rawtext: RawText, reset: bool = False):
+    """
+    Same logic as "Find topics" button: match keywords/weak keywords, create PendingTopics (auto-approved).
+    Returns (suggestions_count, created_count).
+    """
+    _, suggestions_count, created_count = run_find_topics_for_texts([rawtext], reset=reset)
+    return suggestions_count, created_count
+
+
+def candidate_rawtexts(matcher, topic_ids):
+    """
+    RawTexts that the restricted matcher could match (token index; all texts if a keyword has no indexable
+    token) plus those that already have PendingTopics for topic_ids.
+    Superset of the texts whose result can change.
+    """
+    from narratives.utils.text_index import candidate_rawtext_ids
+
+    has_topics = Q(id__in=PendingTopic.objects.filter(topic_id__in=topic_ids).values("rawtext_id"))
+    ids = candidate_rawtext_ids(matcher)
+    if ids is None:
+        # An unindexed ILIKE search for every keyword would cost more than matching the texts themselves
+        return RawText.objects.all()
+    return RawText.objects.filter(has_topics | Q(id__in=ids))
+
+
+def run_incremental_recategorization(chunk_size: int = 200, progress_callback=None, dry_run: bool = False) -> dict:
+    """
+    Apply pending TopicRuleChanges: re-match only the changed topics, only on candidate texts, and
+    replace only those topics' PendingTopics. Texts categorized at any version covered by the changes
+    are then promoted to the last change's version (all other topics' matches are unchanged there).
+    Texts older than the first change stay OUTDATED for a full run.
+    Returns {"changes", "topics", "candidates", "processed", "created", "promoted"}.
+    """
+    changes = list(TopicRuleChange.objects.filter(applied_at__isnull=True).order_by("id"))
+    result = {"changes": len(changes), "topics": 0, "candidates": 0, "processed": 0, "created": 0, "promoted": 0}
+    if not changes:
+        return result
+
+    topic_ids = sorted({c.topic_id for c in changes})
+    target_version = changes[-1].to_version
+    covered_versions = {c.from_version for c in changes} | {c.to_version for c in changes}
+    matcher = build_keyword_matcher(load_topics_data(topic_ids=topic_ids))
+    candidates = (
+        candidate_rawtexts(matcher, topic_ids)
+        .filter(categorization_version__in=covered_versions - {target_version})
+        .order_by("id")
+    )
+    result["topics"] = len(topic_ids)
+    result["candidates"] = candidates.count()
+    if dry_run:
+        return result
+
+    topic_names = dict(Topic.objects.filter(id__in=topic_ids).values_list("id", "name"))
+    threat_topic_ids = get_threat_topic_ids()
+    failed_ids = []  # matching failed: keep their old version so they stay OUTDATED
+    for chunk in _chunked(candidates.select_related("source").iterator(chunk_size=chunk_size), chunk_size):
+        done, _, created = _categorize_chunk(
+            chunk, True, matcher, topic_names, threat_topic_ids, target_version, topic_ids=topic_ids
+        )
+        failed_ids.extend(rt.id for rt in chunk if rt.categorization_version != target_version)
+        result["processed"] += done
+        result["created"] += created
+        if progress_callback:
+            progress_callback(result["processed"], result["created"])
+
+    with transaction.atomic():
+        result["promoted"] = RawText.objects.filter(
+            categorization_version__in=covered_versions - {target_version}
+        ).exclude(id__in=failed_ids).update(categorization_version=target_version)
+        TopicRuleChange.objects.filter(id__in=[c.id for c in changes]).update(applied_at=timezone.now())
+    return result
+
+
+def simulate_topic_rules(topic: Topic, keywords=None, weak_keywords=None, sample_size: int = 20) -> dict:
+    """
+    What-if for a Topic edit: match proposed keywords / weak_keywords (current ones if None) with a
+    throwaway matcher on the candidate texts and diff against the topic's approved PendingTopics.
+    Nothing is written and categorization_version is not touched.
+    """
+    context_sets_by_slug = {cs.slug: (cs.words or []) for cs in ContextSet.objects.all()}
+    proposed_weak = topic.weak_keywords if weak_keywords is None else weak_keywords
+    matcher = build_keyword_matcher([{
+        "id": topic.id,
+        "name": topic.name,
+        "alternative_name": topic.alternative_name,
+        "keywords": topic.keywords if keywords is None else keywords,
+        "weak_keywords": expand_weak_keywords_for_topics_data(proposed_weak or [], context_sets_by_slug),
+    }])
+
+    current = {}
+    for rawtext_id, context, matched_keyword in PendingTopic.objects.filter(
+        topic_id=topic.id, status="approved"
+    ).values_list("rawtext_id", "context", "matched_keyword"):
+        current.setdefault((rawtext_id, context), matched_keyword)
+
+    proposed = {}
+    candidates = candidate_rawtexts(matcher, [topic.id]).select_related("source").order_by("id")
+    titles = {}
+    candidates_count = 0
+    for rawtext in candidates.iterator(chunk_size=200):
+        candidates_count += 1
+        titles[rawtext.id] = rawtext.title or ""
+        text_to_search, zones = build_search_text(rawtext)
+        for sug in suggest_topics_for_text(text_to_search, zones=zones, matcher=matcher):
+            if sug.get("context"):
+                proposed.setdefault((rawtext.id, sug["context"]), sug.get("matched_keyword"))
 
-    rawtext.categorization_version = current_version
-    rawtext.last_categorized_at = timezone.now()
-    rawtext.save(update_fields=["categorization_version", "last_categorized_at"])
+    def samples(keys, source):
+        return [
+            {
+                "rawtext_id": rawtext_id,
+                "title": titles.get(rawtext_id, ""),
+                "matched_keyword": source[(rawtext_id, context)],
+                "context": context,
+            }
+            for rawtext_id, context in sorted(keys)[:sample_size]
+        ]
 
-    return len(suggestions), created_count
+    added = proposed.keys() - current.keys()
+    removed = current.keys() - proposed.keys()
+    current_texts = {rawtext_id for rawtext_id, _ in current}
+    proposed_texts = {rawtext_id for rawtext_id, _ in proposed}
+    return {
+        "topic_id": topic.id,
+        "candidates": candidates_count,
+        "current_count": len(current),
+        "proposed_count": len(proposed),
+        "added_count": len(added),
+        "removed_count": len(removed),
+        "unchanged_count": len(current.keys() & proposed.keys()),
+        "texts_added_count": len(proposed_texts - current_texts),
+        "texts_removed_count": len(current_texts - proposed_texts),
+        "added": samples(added, proposed),
+        "removed": samples(removed, current),
+    }
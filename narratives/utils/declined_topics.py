@@ -0,0 +1,83 @@
+# narratives/utils/declined_topics.py
+"""
+DeclinedTopic as a negative cache for topic suggestion (AI suggest, topic enhancement, API create).
+record_declined upserts one row per (normalized name, reason) and counts repeats; declined_names tells
+the pipelines which candidate names were declined before, so they are skipped before spaCy or Wikipedia.
+"wikipedia_missing" declines are only trusted for WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS (the page may appear later).
+"""
+
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from narratives.models.categories import DeclinedTopic
+
+
+def normalise_declined_name(name: str) -> str:
+    return re.sub(r"\s+", " ", (name or "").casefold()).strip()[:500]
+
+
+def record_declined(name: str, reason: str, source_topic=None, target_field: str = "", reason_detail: str = None):
+    """Store a decline: a new row, or count + 1 and the latest details on the existing row for this name and reason."""
+    normalized = normalise_declined_name(name)
+    values = {
+        "name": name,
+        "source_topic": source_topic,
+        "target_field": target_field,
+        "reason_detail": reason_detail,
+        "last_declined_at": timezone.now(),
+    }
+    existing = DeclinedTopic.objects.filter(normalized_name=normalized, reason=reason)
+    if existing.update(count=F("count") + 1, **values):
+        return
+    try:
+        with transaction.atomic():
+            DeclinedTopic.objects.create(normalized_name=normalized, reason=reason, **values)
+    except IntegrityError:
+        # Created concurrently by another request
+        existing.update(count=F("count") + 1, **values)
+
+
+def _active_declines(reasons=None):
+    negative_ttl = timedelta(days=getattr(settings, "WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS", 7))
+    qs = DeclinedTopic.objects.filter(
+        ~Q(reason="wikipedia_missing") | Q(last_declined_at__gte=timezone.now() - negative_ttl)
+    )
+    if reasons is not None:
+        qs = qs.filter(reason__in=list(reasons))
+    return qs
+
+
+def declined_names(names, reasons=None) -> dict:
+    """
+    name -> reason of an earlier decline, for those names that were declined (one indexed query).
+    reasons limits the lookup to declines for those reasons (the checks the caller would otherwise run).
+    """
+    by_normalized = {}
+    for name in names:
+        normalized = normalise_declined_name(name)
+        if normalized:
+            by_normalized.setdefault(normalized, []).append(name)
+    if not by_normalized:
+        return {}
+    reasons = dict(
+        _active_declines(reasons)
+        .filter(normalized_name__in=list(by_normalized))
+        .order_by("last_declined_at")
+        .values_list("normalized_name", "reason")
+    )  # dict() keeps the last value per name: the most recent reason wins
+    return {name: reason for normalized, reason in reasons.items() for name in by_normalized[normalized]}
+
+
+def count_repeat_declines(names, reasons=None):
+    """
+    Count names skipped because they were declined before (one UPDATE for all of them; reasons as in declined_names).
+    last_declined_at is left alone, so skips do not extend the wikipedia_missing window.
+    """
+    normalized = {normalise_declined_name(name) for name in names} - {""}
+    if normalized:
+        _active_declines(reasons).filter(normalized_name__in=normalized).update(count=F("count") + 1)
@@ -0,0 +1,209 @@
+# narratives/utils/http_client.py
+"""
+Shared HTTP client for outbound fetches (feeds and article pages, knowledge sources, Wikipedia lookups,
+YouTube channel pages, CoinGecko). One pooled httpx.Client per process keeps connections to each host alive
+between requests (HTTP/2 when the optional h2 package is installed), with the same timeouts and retries
+everywhere and named header profiles instead of per-module User-Agent dicts. The ingest engine builds its
+AsyncClient with make_async_client (same settings). http_stats() gives per-host requests, new connections,
+errors and latency (time to response headers).
+"""
+
+import importlib.util
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_BROWSER_UA = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+HEADER_PROFILES = {
+    # Article pages and feeds
+    "browser": {"User-Agent": _BROWSER_UA},
+    # Sites that block bare requests (crypto news translators); Accept-Encoding is left to httpx
+    "browser_document": {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+        ),
+        "Accept": (
+            "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,"
+            "application/signed-exchange;v=b3;q=0.7"
+        ),
+        "Accept-Language": "en-US,en;q=0.9",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+    },
+    # APIs that ask clients to identify themselves (Wikipedia, CoinGecko)
+    "bot": {"User-Agent": "ProphetOntologyBot/1.0 (https://github.com/paulus/prophet; contact@example.com)"},
+}
+
+# Answers worth another try (http_get); 429 is left to the caller, which knows the API's rate limit.
+RETRY_STATUS = {502, 503, 504}
+
+_client = None
+_client_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def profile_headers(profile: str = "browser", headers: dict = None) -> dict:
+    """Headers of a profile, overridden / extended by `headers`."""
+    return {**HEADER_PROFILES[profile], **(headers or {})}
+
+
+def _http2() -> bool:
+    return getattr(settings, "HTTP_CLIENT_HTTP2", True) and importlib.util.find_spec("h2") is not None
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(getattr(settings, "HTTP_CLIENT_TIMEOUT", 15.0), connect=5.0)
+
+
+def _limits(max_connections: int = None) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections or getattr(settings, "HTTP_CLIENT_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=getattr(settings, "HTTP_CLIENT_MAX_KEEPALIVE", 10),
+        keepalive_expiry=getattr(settings, "HTTP_CLIENT_KEEPALIVE_SECONDS", 30.0),
+    )
+
+
+def _retries() -> int:
+    return getattr(settings, "HTTP_CLIENT_RETRIES", 2)
+
+
+def _host_stats(host: str) -> dict:
+    stats = _stats.get(host)
+    if stats is None:
+        stats = _stats.setdefault(
+            host, {"requests": 0, "connections": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+    return stats
+
+
+def _record_connection(host: str):
+    with _stats_lock:
+        _host_stats(host)["connections"] += 1
+
+
+def record_error(url):
+    with _stats_lock:
+        _host_stats(urlsplit(str(url)).hostname or "")["errors"] += 1
+
+
+def _on_request(request: httpx.Request):
+    host = request.url.host
+    request.extensions["started"] = time.monotonic()
+
+    def trace(event, info):
+        if event == "connection.connect_tcp.complete":
+            _record_connection(host)
+
+    request.extensions["trace"] = trace
+
+
+def _on_response(response: httpx.Response):
+    started = response.request.extensions.get("started")
+    elapsed_ms = (time.monotonic() - started) * 1000 if started else 0.0
+    with _stats_lock:
+        stats = _host_stats(response.request.url.host)
+        stats["requests"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+
+async def _on_request_async(request: httpx.Request):
+    host = request.url.host
+    request.extensions["started"] = time.monotonic()
+
+    async def trace(event, info):
+        if event == "connection.connect_tcp.complete":
+            _record_connection(host)
+
+    request.extensions["trace"] = trace
+
+
+async def _on_response_async(response: httpx.Response):
+    _on_response(response)
+
+
+def get_http_client() -> httpx.Client:
+    """The process-wide pooled client (thread-safe). Pass headers=profile_headers(...) per request."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # No transport retries: http_get is the one retry layer (connect errors would be tried twice over)
+                _client = httpx.Client(
+                    timeout=_timeout(),
+                    transport=httpx.HTTPTransport(http2=_http2(), limits=_limits(), retries=0),
+                    follow_redirects=True,
+                    event_hooks={"request": [_on_request], "response": [_on_response]},
+                )
+    return _client
+
+
+def make_async_client(max_connections: int = None, transport: httpx.AsyncBaseTransport = None) -> httpx.AsyncClient:
+    """
+    An AsyncClient with the shared settings and stats (for one event loop; close it when done).
+    Its transport retries failed connects (HTTP_CLIENT_RETRIES): the engine has no retry loop of its own.
+    """
+    return httpx.AsyncClient(
+        timeout=_timeout(),
+        transport=transport or httpx.AsyncHTTPTransport(
+            http2=_http2(), limits=_limits(max_connections), retries=_retries()
+        ),
+        follow_redirects=True,
+        event_hooks={"request": [_on_request_async], "response": [_on_response_async]},
+    )
+
+
+def http_get(url: str, profile: str = "browser", headers: dict = None, params=None, timeout: float = None) -> httpx.Response:
+    """
+    GET through the shared client with a header profile. Connection failures, timeouts and 502/503/504
+    are retried (HTTP_CLIENT_RETRIES, backing off 0.5s, 1s, ...); the last answer or error is returned / raised.
+    """
+    kwargs = {"headers": profile_headers(profile, headers), "params": params}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    attempts = _retries() + 1
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            response = get_http_client().get(url, **kwargs)
+        except httpx.TransportError:
+            record_error(url)
+            if last:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or last:
+                return response
+        time.sleep(0.5 * 2 ** attempt)
+
+
+def http_stats() -> dict:
+    """host -> {requests, connections, errors, avg_ms, max_ms} since process start."""
+    with _stats_lock:
+        return {
+            host: {
+                "requests": s["requests"],
+                "connections": s["connections"],
+                "errors": s["errors"],
+                "avg_ms": round(s["total_ms"] / s["requests"], 1) if s["requests"] else 0.0,
+                "max_ms": round(s["max_ms"], 1),
+            }
+            for host, s in sorted(_stats.items())
+        }
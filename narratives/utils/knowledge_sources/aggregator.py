@@ -1,23 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from narratives.models import TopicKnowledge
 from .wikipedia import fetch_wikipedia
 from .binance_academy import fetch_binance_academy
 
+
 def collect_topic_knowledge(topic_name: str, wikipedia_url: str = None):
     """
     Collects knowledge about a topic from multiple sources.
+    Sources are fetched concurrently (shared pooled client); results keep the priority order below.
     """
-    results = []
-    
-    # 1. Try Binance Academy (High Priority for Crypto)
-    binance_data = fetch_binance_academy(topic_name)
-    if binance_data:
-        results.append(binance_data)
-        
-    # 2. Try Wikipedia (Broad Context)
-    wiki_data = fetch_wikipedia(topic_name, wikipedia_url=wikipedia_url)
-    if wiki_data:
-        results.append(wiki_data)
-        
-    return results
+    fetchers = [
+        # 1. Binance Academy (High Priority for Crypto)
+        lambda: fetch_binance_academy(topic_name),
+        # 2. Wikipedia (Broad Context)
+        lambda: fetch_wikipedia(topic_name, wikipedia_url=wikipedia_url),
+    ]
+    with ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="knowledge") as executor:
+        futures = [executor.submit(fetch) for fetch in fetchers]
+        return [data for data in (future.result() for future in futures) if data]
+
+
+def _lookup_key(topic) -> str:
+    return f"{topic.name}|{topic.wikipedia_url or ''}"
+
+
+def get_topic_knowledge(topic, refresh: bool = False):
+    """
+    (knowledge_list, dossier) for a Topic, reusing the stored TopicKnowledge while it is younger than
+    TOPIC_KNOWLEDGE_TTL_DAYS and was collected for the same name / Wikipedia URL. refresh=True always re-fetches.
+    Empty results are not stored, so the next call tries the sources again.
+    """
+    ttl = timedelta(days=getattr(settings, "TOPIC_KNOWLEDGE_TTL_DAYS", 14))
+    if not refresh:
+        cached = TopicKnowledge.objects.filter(
+            topic=topic, lookup_key=_lookup_key(topic), fetched_at__gte=timezone.now() - ttl
+        ).first()
+        if cached and cached.sources:
+            return cached.sources, cached.dossier
+
+    knowledge_list = collect_topic_knowledge(topic.name, wikipedia_url=topic.wikipedia_url)
+    dossier = format_knowledge_dossier(knowledge_list)
+    if knowledge_list:
+        TopicKnowledge.objects.update_or_create(
+            topic=topic,
+            defaults={
+                "lookup_key": _lookup_key(topic),
+                "sources": knowledge_list,
+                "dossier": dossier,
+                "fetched_at": timezone.now(),
+            },
+        )
+    return knowledge_list, dossier
+
 
 def format_knowledge_dossier(knowledge_list):
     """
@@ -25,11 +64,11 @@ def format_knowledge_dossier(knowledge_list):
     """
     if not knowledge_list:
         return "No information found in external sources."
-        
+
     dossier = ""
     for item in knowledge_list:
         dossier += f"--- SOURCE: {item['source']} ---\n"
         dossier += f"TITLE: {item['title']}\n"
         dossier += f"CONTENT: {item['content']}\n\n"
-        
+
     return dossier
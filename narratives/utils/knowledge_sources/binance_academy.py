@@ -1,7 +1,8 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 
+from narratives.utils.http_client import http_get
+
 def fetch_binance_academy(topic_name: str):
     """
     Attempts to fetch a definition from Binance Academy Glossary.
@@ -10,12 +11,8 @@ def fetch_binance_academy(topic_name: str):
     slug = topic_name.lower().replace(" ", "-")
     url = f"https://academy.binance.com/en/glossary/{slug}"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         if response.status_code != 200:
             return None
             
@@ -1,61 +1,115 @@
-import wikipediaapi
 import re
+from urllib.parse import quote
+
+import httpx
+
+from narratives.utils.http_client import http_get
+
+_HEADING_RE = re.compile(r"^(={2,})\s*(.*?)\s*\1\s*$", re.MULTILINE)
+
+
+def _page_url(title: str, lang: str) -> str:
+    # Same encoding as MediaWiki's canonical page URLs (spaces as underscores, these characters unescaped).
+    return f"https://{lang}.wikipedia.org/wiki/" + quote(title.replace(" ", "_"), safe=";@$!*(),/~:")
+
+
+def _query_page(title: str, lang: str):
+    """
+    Extract (plain text with == headings ==), URL and article links of one page in one API request
+    (plus continuation requests for pages with more than 500 links). None if the page does not exist.
+    """
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "redirects": "1",
+        "titles": title,
+        "prop": "extracts|info|links",
+        "explaintext": "1",
+        "exsectionformat": "wiki",
+        "inprop": "url",
+        "plnamespace": "0",
+        "pllimit": "max",
+    }
+    page = {}
+    links = []
+    extra = {}
+    while True:
+        response = http_get(
+            f"https://{lang}.wikipedia.org/w/api.php", profile="bot", params={**params, **extra}, timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        pages = (data.get("query") or {}).get("pages") or []
+        if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+            return None
+        links += [link["title"] for link in pages[0].pop("links", [])]
+        page.update(pages[0])
+        if "continue" not in data:
+            break
+        extra = data["continue"]
+    page["links"] = links
+    return page
+
+
+def _split_sections(extract: str):
+    """(summary, [(title, own text), ...]) of a plain-text extract; a section's text stops at the next heading."""
+    headings = list(_HEADING_RE.finditer(extract))
+    summary = extract[:headings[0].start()].strip() if headings else extract.strip()
+    sections = []
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(extract)
+        sections.append((heading.group(2), extract[heading.end():end].strip()))
+    return summary, sections
+
 
 def fetch_wikipedia(topic_name: str, lang: str = 'en', wikipedia_url: str = None):
     """
     Fetches the summary and related links of a Wikipedia page for a given topic name or direct URL.
     """
-    user_agent = "ProphetOntologyBot/1.0 (https://github.com/paulus/prophet; contact@example.com)"
-    
-    wiki = wikipediaapi.Wikipedia(
-        user_agent=user_agent,
-        language=lang,
-        extract_format=wikipediaapi.ExtractFormat.WIKI
-    )
-    
-    page = None
-    if wikipedia_url:
-        # Extract title from URL (e.g., https://en.wikipedia.org/wiki/Bitcoin -> Bitcoin)
-        match = re.search(r'/wiki/([^/?#]+)', wikipedia_url)
-        if match:
-            page_title = match.group(1).replace('_', ' ')
-            page = wiki.page(page_title)
-    
-    if not page or not page.exists():
-        page = wiki.page(topic_name)
-    
-    if not page.exists():
+    try:
+        page = None
+        if wikipedia_url:
+            # Extract title from URL (e.g., https://en.wikipedia.org/wiki/Bitcoin -> Bitcoin)
+            match = re.search(r'/wiki/([^/?#]+)', wikipedia_url)
+            if match:
+                page_title = match.group(1).replace('_', ' ')
+                page = _query_page(page_title, lang)
+
+        if not page:
+            page = _query_page(topic_name, lang)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching from Wikipedia: {e}")
+        return None
+
+    if not page:
         return None
-    
-    # Extract links from summary and overview
-    # wikipedia-api doesn't provide section-specific links directly, 
-    # but we can get all links and filter them by what's in the summary/overview text.
-    
-    summary_text = page.summary
-    
+
+    summary_text, sections = _split_sections(page.get("extract") or "")
+
     # Get the first section (often Overview or Introduction after summary)
     overview_text = ""
-    if page.sections:
-        first_section = page.sections[0]
+    if sections:
+        first_title, first_text = sections[0]
         # Common names for the first section that is usually an overview
-        if first_section.title.lower() in ['overview', 'history', 'background', 'description']:
-            overview_text = first_section.text
-    
+        if first_title.lower() in ['overview', 'history', 'background', 'description']:
+            overview_text = first_text
+
     combined_discovery_text = (summary_text + " " + overview_text).lower()
-    
+
     # Filter links that appear in the summary or overview
     related_links = []
-    for title, link_page in page.links.items():
+    for title in page["links"]:
         if title.lower() in combined_discovery_text:
             related_links.append({
                 "title": title,
-                "url": link_page.fullurl
+                "url": _page_url(title, lang)
             })
-    
+
     return {
         "source": "Wikipedia",
-        "title": page.title,
+        "title": page.get("title") or topic_name,
         "content": summary_text[:2000],
-        "url": page.fullurl,
+        "url": page.get("fullurl") or _page_url(page.get("title") or topic_name, lang),
         "related_links": related_links
     }
@@ -0,0 +1,109 @@
+# narratives/utils/llm_cache.py
+"""
+Persistent cache for local model prompts (LLMResponseCache), used by local_ai.prompt_local_ai.
+Identical (model, system prompt, prompt) triples return the stored answer instead of another model call.
+Entries expire after LLM_CACHE_TTL_DAYS; above LLM_CACHE_MAX_ENTRIES the least recently used are evicted.
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from narratives.models import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Evict at most every this many stores per process (COUNT(*) is not free on a large table).
+_EVICT_EVERY = 100
+
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+_stats_lock = threading.Lock()
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256((value or "").encode("utf-8")).hexdigest()
+
+
+def cache_key(model: str, system_prompt: str, prompt: str) -> str:
+    return _sha256("\n".join([model, _sha256(system_prompt), _sha256(prompt)]))
+
+
+def _enabled() -> bool:
+    return getattr(settings, "LLM_CACHE_ENABLED", True)
+
+
+def _ttl() -> timedelta:
+    return timedelta(days=getattr(settings, "LLM_CACHE_TTL_DAYS", 30))
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+        return _stats[name]
+
+
+def get_cached_response(model: str, system_prompt: str, prompt: str):
+    """Stored answer for this prompt, or None (miss, expired or cache disabled)."""
+    if not _enabled():
+        return None
+    key = cache_key(model, system_prompt, prompt)
+    try:
+        entry = LLMResponseCache.objects.filter(key=key, created_at__gte=timezone.now() - _ttl()).first()
+        if entry is None:
+            _count("misses")
+            return None
+        LLMResponseCache.objects.filter(id=entry.id).update(hit_count=F("hit_count") + 1, last_used_at=timezone.now())
+    except Exception as e:
+        logger.warning("LLM cache lookup failed: %s", e)
+        return None
+    _count("hits")
+    return entry.response
+
+
+def store_response(model: str, system_prompt: str, prompt: str, response):
+    """Store a parsed answer (None is never cached, so failed calls are retried)."""
+    if response is None or not _enabled():
+        return
+    try:
+        LLMResponseCache.objects.update_or_create(
+            key=cache_key(model, system_prompt, prompt),
+            defaults={
+                "model": model,
+                "system_hash": _sha256(system_prompt) if system_prompt else "",
+                "prompt_hash": _sha256(prompt),
+                "response": response,
+                "created_at": timezone.now(),
+                "last_used_at": timezone.now(),
+            },
+        )
+        if _count("stores") % _EVICT_EVERY == 1:
+            evict()
+    except Exception as e:
+        logger.warning("LLM cache store failed: %s", e)
+
+
+def evict() -> int:
+    """Delete expired entries and, above LLM_CACHE_MAX_ENTRIES, the least recently used ones. Returns deleted count."""
+    deleted, _ = LLMResponseCache.objects.filter(created_at__lt=timezone.now() - _ttl()).delete()
+    max_entries = getattr(settings, "LLM_CACHE_MAX_ENTRIES", 50000)
+    excess = LLMResponseCache.objects.count() - max_entries
+    if excess > 0:
+        ids = list(LLMResponseCache.objects.order_by("last_used_at").values_list("id", flat=True)[:excess])
+        deleted += LLMResponseCache.objects.filter(id__in=ids).delete()[0]
+    return deleted
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of this process plus entry count and total hits stored in the DB."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["entries"] = LLMResponseCache.objects.count()
+    stats["total_hits"] = LLMResponseCache.objects.aggregate(n=Sum("hit_count"))["n"] or 0
+    return stats
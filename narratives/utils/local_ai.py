@@ -1,38 +1,34 @@
-import requests
 import json
-import os
+import logging
 
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gemma2:9b")
+from django.conf import settings
 
-def prompt_local_ai(prompt: str, system_prompt: str = None):
+from narratives.utils.llm_cache import get_cached_response, store_response
+from narratives.utils.ollama_client import OllamaError, get_ollama_client
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_local_ai(prompt: str, system_prompt: str = None, use_cache: bool = True):
     """
-    Sends a prompt to a local Ollama instance.
+    Sends a prompt to a local Ollama instance (shared pooled client, bounded concurrency, retries; see ollama_client).
+    Answers are cached per (model, system prompt, prompt) in LLMResponseCache; use_cache=False forces a model call.
+    Returns the parsed JSON answer, or None if the call failed or the answer was not JSON.
     """
-    url = f"{OLLAMA_BASE_URL}/api/generate"
-    
-    payload = {
-        "model": OLLAMA_MODEL,
-        "prompt": prompt,
-        "stream": False,
-        "format": "json"
-    }
-    
-    if system_prompt:
-        payload["system"] = system_prompt
-        
+    client = get_ollama_client()
+    if use_cache:
+        cached = get_cached_response(client.model, system_prompt, prompt)
+        if cached is not None:
+            return cached
+
     try:
-        # Increase timeout for 9b model
-        response = requests.post(url, json=payload, timeout=120)
-        response.raise_for_status()
-        result = response.json()
-        
-        # Ollama returns the generated text in the 'response' field
-        content = result.get("response", "")
-        return json.loads(content)
-    except Exception as e:
-        print(f"Error communicating with Ollama: {e}")
+        content = client.generate(prompt, system=system_prompt, format="json", stream=settings.OLLAMA_STREAM)
+        parsed = json.loads(content)
+    except (OllamaError, ValueError) as e:
+        logger.warning("Error communicating with Ollama: %s", e)
         return None
+    store_response(client.model, system_prompt, prompt, parsed)
+    return parsed
 
 def analyze_topic_with_ai(topic_name: str, knowledge_dossier: str):
     """
@@ -138,16 +134,7 @@ def suggest_topic_merge_with_ai(topics_list: list):
     
     return prompt_local_ai(prompt, system_prompt)
 
-def analyze_swot_trigger(topic_name: str, context: str, author_name: str = "the author"):
-    """
-    Analyzes a specific mention of a SWOT/Threat topic in a text to fill a survey-like questionnaire.
-    """
-    system_prompt = f"""
-    You are a socio-political analyst conducting a survey of {author_name}'s opinions based on their text.
-    Your task is to analyze how the author discusses a specific topic: "{topic_name}".
-    
-    You must fill out a "Risk/Threat Survey" with the following fields:
-    1. PESTEL Category: Choose exactly ONE from: Political, Economic, Social, Technological, Environmental, Legal.
+SWOT_SURVEY_RUBRIC = """1. PESTEL Category: Choose exactly ONE from: Political, Economic, Social, Technological, Environmental, Legal.
     2. Impact Strength: How serious is this threat/issue according to the author? 
        - 1: Low (minor concern)
        - 2: Medium (significant)
@@ -159,7 +146,18 @@ def analyze_swot_trigger(topic_name: str, context: str, author_name: str = "the
        -  0: Neutral (just mentions it without clear opinion)
        - +1: Agree (acknowledges it's a real issue)
        - +2: Strongly Agree (fully convinced it's a major danger)
-    4. Summary: A very short (1 sentence) explanation of the author's specific point about this topic.
+    4. Summary: A very short (1 sentence) explanation of the author's specific point about this topic."""
+
+def analyze_swot_trigger(topic_name: str, context: str, author_name: str = "the author"):
+    """
+    Analyzes a specific mention of a SWOT/Threat topic in a text to fill a survey-like questionnaire.
+    """
+    system_prompt = f"""
+    You are a socio-political analyst conducting a survey of {author_name}'s opinions based on their text.
+    Your task is to analyze how the author discusses a specific topic: "{topic_name}".
+    
+    You must fill out a "Risk/Threat Survey" with the following fields:
+    {SWOT_SURVEY_RUBRIC}
 
     Output MUST be a valid JSON object:
     {{
@@ -173,3 +171,62 @@ def analyze_swot_trigger(topic_name: str, context: str, author_name: str = "the
     prompt = f"Analyze how {author_name} discusses '{topic_name}' in the following context:\n\nCONTEXT:\n{context}"
     
     return prompt_local_ai(prompt, system_prompt)
+
+
+def analyze_swot_triggers_batch(mentions: list, author_name: str = "the author") -> list:
+    """
+    Same survey as analyze_swot_trigger for several mentions of one text in a single model call.
+    mentions: [(topic_name, context), ...]. Returns a list aligned with mentions (survey dict or None).
+    Mentions missing from (or invalid in) the batch answer fall back to one analyze_swot_trigger call each;
+    if the model gave no answer at all (timeout, server down) every mention is None and nothing is retried here.
+    """
+    if not mentions:
+        return []
+    if len(mentions) == 1:
+        return [analyze_swot_trigger(mentions[0][0], mentions[0][1], author_name)]
+
+    system_prompt = f"""
+    You are a socio-political analyst conducting a survey of {author_name}'s opinions based on their text.
+    You get several numbered MENTIONS; each names a topic and the context where the author discusses it.
+    For EACH mention, analyze how the author discusses that topic in that context only.
+
+    For each mention fill out a "Risk/Threat Survey" with the following fields:
+    {SWOT_SURVEY_RUBRIC}
+
+    Output MUST be a valid JSON object with one result per mention, using the mention id:
+    {{
+        "results": [
+            {{"id": 1, "pestel_category": "Category", "impact_strength": 1-4, "stance": -2 to 2, "summary": "Short explanation"}}
+        ]
+    }}
+    """
+
+    mention_blocks = "\n\n".join(
+        f"MENTION {i}\nTOPIC: {topic_name}\nCONTEXT:\n{context}"
+        for i, (topic_name, context) in enumerate(mentions, start=1)
+    )
+    prompt = f"Analyze how {author_name} discusses each of the following {len(mentions)} mentions:\n\n{mention_blocks}"
+
+    by_id = {}
+    response = prompt_local_ai(prompt, system_prompt)
+    if response is None:
+        # Single calls would only hit the failing server again; the queue retries these jobs later
+        return [None] * len(mentions)
+    items = response.get("results") if isinstance(response, dict) else None
+    if isinstance(items, list):
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                mention_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= mention_id <= len(mentions) and "stance" in item and "impact_strength" in item:
+                by_id[mention_id] = {k: v for k, v in item.items() if k != "id"}
+    else:
+        logger.warning("Batch SWOT answer did not parse; falling back to %s single calls", len(mentions))
+
+    return [
+        by_id.get(i) or analyze_swot_trigger(topic_name, context, author_name)
+        for i, (topic_name, context) in enumerate(mentions, start=1)
+    ]
@@ -0,0 +1,95 @@
+# narratives/utils/nlp.py
+"""
+spaCy pipelines, loaded once per process (thread-safe) and optionally preloaded at web worker boot (SPACY_PRELOAD).
+Besides the full pipeline there are two slim ones: POS-only (tagger + attribute_ruler; no parser / NER /
+lemmatizer) for keyword pos_filter and candidate-name checks, and NER-only for entity extraction.
+first_token_pos tags many candidate names in one nlp.pipe batch.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Components each slim pipeline does not load (token.pos_ comes from tagger + attribute_ruler).
+_POS_EXCLUDE = ("parser", "ner", "lemmatizer", "senter")
+_NER_EXCLUDE = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+_pipelines = {}
+_lock = threading.Lock()
+
+
+def _model_name() -> str:
+    return getattr(settings, "SPACY_MODEL", "en_core_web_sm")
+
+
+def _load(kind: str):
+    import spacy
+
+    model = _model_name()
+    if kind == "full":
+        return spacy.load(model)
+    exclude = _POS_EXCLUDE if kind == "pos" else _NER_EXCLUDE
+    try:
+        nlp = spacy.load(model, exclude=list(exclude))
+    except Exception as e:
+        # Some models cannot drop components their others depend on; use the full pipeline with them disabled.
+        logger.warning("Could not load slim %s pipeline of %s (%s); disabling components instead", kind, model, e)
+        nlp = spacy.load(model)
+        for name in exclude:
+            if name in nlp.pipe_names:
+                nlp.disable_pipe(name)
+    # With the tagger / parser gone, a shared tok2vec only costs time.
+    if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
+def _get(kind: str):
+    nlp = _pipelines.get(kind)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(kind)
+            if nlp is None:
+                nlp = _load(kind)
+                _pipelines[kind] = nlp
+                logger.info("spaCy %s pipeline loaded: %s", kind, ", ".join(nlp.pipe_names))
+    return nlp
+
+
+def get_nlp():
+    """Full pipeline (all components of SPACY_MODEL)."""
+    return _get("full")
+
+
+def get_pos_nlp():
+    """Pipeline that only sets token.pos_ / token.tag_."""
+    return _get("pos")
+
+
+def get_ner_nlp():
+    """Pipeline that only sets doc.ents."""
+    return _get("ner")
+
+
+def warm_up(kinds=("pos", "ner")):
+    """Load the given pipelines now (so no request pays for it). Errors are logged, not raised."""
+    for kind in kinds:
+        try:
+            _get(kind)
+        except Exception as e:
+            logger.warning("spaCy %s pipeline could not be loaded: %s", kind, e)
+
+
+def first_token_pos(names) -> dict:
+    """name -> (pos_, tag_) of its first token, for all names in one nlp.pipe batch. Empty names are left out."""
+    unique = [name for name in dict.fromkeys(names) if name]
+    if not unique:
+        return {}
+    result = {}
+    for name, doc in zip(unique, get_pos_nlp().pipe(unique)):
+        if len(doc) > 0:
+            result[name] = (doc[0].pos_, doc[0].tag_)
+    return result
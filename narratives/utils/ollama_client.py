@@ -0,0 +1,169 @@
+# narratives/utils/ollama_client.py
+"""
+Shared client for the local Ollama server, used by narratives.utils.local_ai.
+One pooled httpx.Client per process, a semaphore sized to the server's parallelism (OLLAMA_MAX_CONCURRENCY),
+a per-call deadline that covers queueing + retries, retry with backoff on connection errors, and optional
+streaming with a time-to-first-token timeout. base_url / transport can be injected (e.g. a fake server in tests).
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Connection-level failures worth retrying; read timeouts are not retried (the model is busy, not gone).
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.PoolTimeout)
+_RETRYABLE_STATUS = {502, 503, 504}
+
+
+class OllamaError(Exception):
+    """The model server could not produce an answer (connection, HTTP or protocol error)."""
+
+
+class OllamaTimeout(OllamaError):
+    """The call ran past its deadline or first-token timeout, or waited too long for a free slot."""
+
+
+class OllamaClient:
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        max_concurrency: int = 2,
+        timeout: float = 120.0,
+        connect_timeout: float = 5.0,
+        first_token_timeout: float = None,
+        retries: int = 2,
+        backoff: float = 1.0,
+        transport: httpx.BaseTransport = None,
+    ):
+        self.model = model
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.first_token_timeout = first_token_timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        max_concurrency = max(1, max_concurrency)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._client = httpx.Client(
+            base_url=base_url,
+            transport=transport,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+
+    def close(self):
+        self._client.close()
+
+    def generate(self, prompt: str, system: str = None, format: str = "json", deadline: float = None,
+                 stream: bool = False, first_token_timeout: float = None) -> str:
+        """
+        Run /api/generate and return the generated text. deadline (seconds, default the client timeout)
+        bounds the whole call: waiting for a slot, every attempt and the backoff between them.
+        stream=True reads the answer as it is produced; first_token_timeout then bounds the wait for the
+        first chunk (and the gap between chunks). Raises OllamaTimeout / OllamaError.
+        """
+        deadline_at = time.monotonic() + (deadline if deadline is not None else self.timeout)
+        payload = {"model": self.model, "prompt": prompt, "stream": stream}
+        if format:
+            payload["format"] = format
+        if system:
+            payload["system"] = system
+        first_token_timeout = first_token_timeout if first_token_timeout is not None else self.first_token_timeout
+
+        if not self._semaphore.acquire(timeout=max(0.0, deadline_at - time.monotonic())):
+            raise OllamaTimeout("No free model slot before the deadline")
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    raise OllamaTimeout("Deadline exceeded")
+                try:
+                    if stream:
+                        return self._generate_stream(payload, remaining, first_token_timeout, deadline_at)
+                    return self._generate_once(payload, remaining)
+                except httpx.TimeoutException as e:
+                    if not isinstance(e, _RETRYABLE_ERRORS):
+                        raise OllamaTimeout(f"Model server timed out: {e}") from e
+                    error = e
+                except _RETRYABLE_ERRORS as e:
+                    error = e
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code not in _RETRYABLE_STATUS:
+                        raise OllamaError(f"Model server returned HTTP {e.response.status_code}") from e
+                    error = e
+                except httpx.HTTPError as e:
+                    raise OllamaError(f"Model server request failed: {e}") from e
+
+                if attempt >= self.retries:
+                    raise OllamaError(f"Model server unavailable after {attempt + 1} attempts: {error}") from error
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+                if time.monotonic() + delay >= deadline_at:
+                    raise OllamaTimeout(f"Deadline exceeded while retrying: {error}") from error
+                logger.info("Ollama request failed (%s), retrying in %.1fs", error, delay)
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            self._semaphore.release()
+
+    def _timeout(self, remaining: float, read: float = None) -> httpx.Timeout:
+        return httpx.Timeout(
+            remaining,
+            connect=min(self.connect_timeout, remaining),
+            read=min(read, remaining) if read else remaining,
+        )
+
+    def _generate_once(self, payload: dict, remaining: float) -> str:
+        response = self._client.post("/api/generate", json=payload, timeout=self._timeout(remaining))
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    def _generate_stream(self, payload: dict, remaining: float, first_token_timeout: float, deadline_at: float) -> str:
+        parts = []
+        with self._client.stream(
+            "POST", "/api/generate", json=payload, timeout=self._timeout(remaining, read=first_token_timeout)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    chunk = json.loads(line)
+                except ValueError as e:
+                    raise OllamaError(f"Invalid stream chunk from model server: {line[:200]}") from e
+                if chunk.get("error"):
+                    raise OllamaError(f"Model server error: {chunk['error']}")
+                parts.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    break
+                if time.monotonic() > deadline_at:
+                    raise OllamaTimeout("Deadline exceeded while streaming")
+        return "".join(parts)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient:
+    """Process-wide client configured from settings (OLLAMA_*)."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                from django.conf import settings
+                _default_client = OllamaClient(
+                    base_url=settings.OLLAMA_BASE_URL,
+                    model=settings.OLLAMA_MODEL,
+                    max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+                    timeout=settings.OLLAMA_TIMEOUT,
+                    first_token_timeout=settings.OLLAMA_FIRST_TOKEN_TIMEOUT,
+                    retries=settings.OLLAMA_RETRIES,
+                )
+    return _default_client
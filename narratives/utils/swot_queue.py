@@ -0,0 +1,148 @@
+# narratives/utils/swot_queue.py
+"""
+SWOT survey jobs for threat-topic mentions. Categorization only marks PendingTopics swot_status="pending";
+workers here claim them (select_for_update skip_locked, so several processes can share the queue),
+call the local model with bounded concurrency and store swot_analysis. Jobs of one article are sent
+as one batched model call (analyze_swot_triggers_batch). Used by the process_swot_jobs
+command and the background thread started in NarrativesConfig.ready().
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from narratives.models import PendingTopic
+from narratives.utils.local_ai import analyze_swot_triggers_batch
+
+logger = logging.getLogger(__name__)
+
+SWOT_FIELDS = ("pestel_category", "impact_strength", "stance", "summary")
+# A job still "running" after this long belongs to a worker that died; it is put back in the queue.
+STALE_RUNNING_AFTER = timedelta(minutes=15)
+# Mentions per batched model call; longer prompts make small local models lose track of the ids.
+MAX_MENTIONS_PER_CALL = 8
+
+
+def _survey(result):
+    if not isinstance(result, dict):
+        return None
+    return {k: result[k] for k in SWOT_FIELDS if k in result}
+
+
+def requeue_stale_jobs() -> int:
+    return PendingTopic.objects.filter(
+        swot_status="running",
+        swot_updated_at__lt=timezone.now() - STALE_RUNNING_AFTER,
+    ).update(swot_status="pending", swot_updated_at=timezone.now())
+
+
+def claim_swot_jobs(limit: int) -> list:
+    """
+    Mark up to limit pending jobs as running and return them (with topic and rawtext source loaded),
+    ordered by rawtext so that one article's mentions end up in the same batch.
+    """
+    with transaction.atomic():
+        ids = list(
+            PendingTopic.objects.select_for_update(skip_locked=True)
+            .filter(swot_status="pending")
+            .order_by("rawtext_id", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        PendingTopic.objects.filter(id__in=ids).update(swot_status="running", swot_updated_at=timezone.now())
+    return list(
+        PendingTopic.objects.filter(id__in=ids).select_related("topic", "rawtext__source").order_by("rawtext_id", "id")
+    )
+
+
+def _analyze_mentions(mentions: list, author_name: str) -> list:
+    try:
+        results = analyze_swot_triggers_batch(mentions, author_name)
+    except Exception as e:
+        logger.warning("SWOT batch analysis failed: %s", e)
+        return [None] * len(mentions)
+    return [_survey(result) for result in results]
+
+
+def _run_swot_group(jobs: list) -> list:
+    """Analyze all claimed jobs of one article (identical mentions once) and store results. Returns ok flag per job."""
+    try:
+        author_name = getattr(jobs[0].rawtext.source, "name", None) or "the author"
+        mentions = list(dict.fromkeys((job.topic.name, job.context) for job in jobs))
+        analyses = {}
+        for i in range(0, len(mentions), MAX_MENTIONS_PER_CALL):
+            chunk = mentions[i:i + MAX_MENTIONS_PER_CALL]
+            analyses.update(zip(chunk, _analyze_mentions(chunk, author_name)))
+
+        flags = []
+        for job in jobs:
+            analysis = analyses.get((job.topic.name, job.context))
+            if analysis is None:
+                PendingTopic.objects.filter(id=job.id).update(swot_status="failed", swot_updated_at=timezone.now())
+            else:
+                PendingTopic.objects.filter(id=job.id).update(
+                    swot_analysis=analysis, swot_status="done", swot_updated_at=timezone.now()
+                )
+            flags.append(analysis is not None)
+        return flags
+    finally:
+        connection.close()  # pool threads must not keep connections open
+
+
+def process_swot_jobs(workers: int = 2, batch_size: int = None, max_jobs: int = None, progress_callback=None) -> dict:
+    """
+    Drain the SWOT queue with `workers` concurrent model calls. Stops when no pending job is left
+    (or after max_jobs). progress_callback(done, failed), if given, is called after every batch.
+    Returns {"done": n, "failed": n}.
+    """
+    workers = max(1, workers)
+    batch_size = batch_size or workers * 4
+    result = {"done": 0, "failed": 0}
+    requeue_stale_jobs()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="swot") as executor:
+        while max_jobs is None or result["done"] + result["failed"] < max_jobs:
+            limit = batch_size
+            if max_jobs is not None:
+                limit = min(limit, max_jobs - result["done"] - result["failed"])
+            jobs = claim_swot_jobs(limit)
+            if not jobs:
+                break
+            groups = [list(group) for _, group in groupby(jobs, key=lambda job: job.rawtext_id)]
+            for flags in executor.map(_run_swot_group, groups):
+                for ok in flags:
+                    result["done" if ok else "failed"] += 1
+            if progress_callback:
+                progress_callback(result["done"], result["failed"])
+    return result
+
+
+def retry_failed_jobs() -> int:
+    return PendingTopic.objects.filter(swot_status="failed").update(swot_status="pending", swot_updated_at=timezone.now())
+
+
+def swot_queue_status() -> dict:
+    """Job counts per swot_status and the age of the oldest pending job."""
+    counts = dict(
+        PendingTopic.objects.exclude(swot_status="")
+        .values("swot_status")
+        .annotate(n=Count("id"))
+        .values_list("swot_status", "n")
+    )
+    status = {key: counts.get(key, 0) for key, _ in PendingTopic.SWOT_STATUS_CHOICES if key}
+    total = sum(status.values())
+    oldest = (
+        PendingTopic.objects.filter(swot_status="pending")
+        .order_by("swot_updated_at")
+        .values_list("swot_updated_at", flat=True)
+        .first()
+    )
+    status["total"] = total
+    status["progress"] = round((status["done"] + status["failed"]) / total, 4) if total else 1.0
+    status["oldest_pending_seconds"] = int((timezone.now() - oldest).total_seconds()) if oldest else None
+    return status
@@ -0,0 +1,124 @@
+# narratives/utils/text_index.py
+"""
+Inverted token index over RawText search texts (RawTextToken postings), kept up to date by a RawText post_save
+signal (narratives.models.sources.update_token_index) on every save.
+candidate_rawtext_ids(matcher) narrows keyword matching to texts that can contain at least one of the
+matcher's keywords, so re-categorization and rule previews do not have to scan the whole corpus.
+
+Tokens are runs of [a-z0-9_] in the case-folded text (same folding as the substring pass), plus the
+runs of text.lower() when the text has one of the few non-ASCII characters that fold or lower-case
+to ASCII, so every keyword pass (FlashText, case-sensitive \\b, substring) finds its match's tokens.
+"""
+
+import hashlib
+import logging
+import re
+
+from django.db import transaction
+from django.db.models import Q
+
+from narratives.models import RawText, RawTextToken
+from narratives.utils.aho_corasick import fold_case
+from narratives.utils.categorize import build_search_text
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+# Non-ASCII characters whose lower() or case fold contains an ASCII letter (İ, ı, ſ, Kelvin sign).
+_ASCII_FOLDING_CHARS = frozenset("İıſK")
+# RawTextToken.token max_length; longer tokens are stored as windows of this size every _WINDOW_STEP chars,
+# so any substring up to _MAX_TOKEN_LEN - _WINDOW_STEP chars still falls inside one stored window.
+_MAX_TOKEN_LEN = 255
+_WINDOW_STEP = 128
+
+
+def _tokens(text: str) -> list:
+    return _TOKEN_RE.findall(fold_case(text))
+
+
+def tokenize_for_index(text: str) -> set:
+    """Distinct index tokens of text (long tokens as windows)."""
+    views = [fold_case(text)]
+    if _ASCII_FOLDING_CHARS.intersection(text):
+        views.append(text.lower())
+    tokens = set()
+    for view in views:
+        for token in _TOKEN_RE.findall(view):
+            if len(token) <= _MAX_TOKEN_LEN:
+                tokens.add(token)
+                continue
+            for i in range(0, len(token), _WINDOW_STEP):
+                tokens.add(token[i:i + _MAX_TOKEN_LEN])
+                if i + _MAX_TOKEN_LEN >= len(token):
+                    break
+    return tokens
+
+
+def index_rawtext(rawtext: RawText, force: bool = False) -> bool:
+    """(Re)build the postings of one RawText. Skipped when its search text is unchanged. Returns True if rebuilt."""
+    text, _ = build_search_text(rawtext)
+    fingerprint = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    if not force and rawtext.token_index_fingerprint == fingerprint:
+        return False
+    postings = [RawTextToken(rawtext_id=rawtext.id, token=token) for token in tokenize_for_index(text)]
+    with transaction.atomic():
+        RawTextToken.objects.filter(rawtext_id=rawtext.id).delete()
+        RawTextToken.objects.bulk_create(postings, batch_size=1000)
+        RawText.objects.filter(id=rawtext.id).update(token_index_fingerprint=fingerprint)
+    rawtext.token_index_fingerprint = fingerprint
+    return True
+
+
+def _keyword_lookups(matcher):
+    """
+    (exact, contains) lists of token tuples, one tuple per keyword; a keyword can only match texts
+    that have all of its tokens. None if some keyword cannot be looked up in the index.
+    """
+    exact = []
+    contains = []
+    for kw_lower in matcher.keyword_map:
+        exact.append(_TOKEN_RE.findall(kw_lower))
+    for _, kw, _, _ in matcher.case_sensitive_list:
+        exact.append(_tokens(kw))
+    for _, kw, _, _ in matcher.substring_list:
+        contains.append(_tokens(kw))
+    if any(not tokens or max(map(len, tokens)) > _MAX_TOKEN_LEN for tokens in exact):
+        return None
+    if any(not tokens or max(map(len, tokens)) > _MAX_TOKEN_LEN - _WINDOW_STEP for tokens in contains):
+        return None
+    return exact, contains
+
+
+def candidate_rawtext_ids(matcher):
+    """
+    Ids of RawTexts the matcher can match: indexed texts containing all tokens of at least one keyword,
+    plus every text not indexed yet. None if a keyword has no indexable token (caller must scan all texts).
+    """
+    lookups = _keyword_lookups(matcher)
+    if lookups is None:
+        return None
+    exact, contains = lookups
+
+    ids_by_token = {}
+    exact_tokens = {token for tokens in exact for token in tokens}
+    if exact_tokens:
+        for token, rawtext_id in RawTextToken.objects.filter(token__in=exact_tokens).values_list("token", "rawtext_id"):
+            ids_by_token.setdefault(token, set()).add(rawtext_id)
+    substrings = {token for tokens in contains for token in tokens}
+    ids_by_substring = {token: set() for token in substrings}
+    if substrings:
+        # One scan of the postings for all substring tokens (LIKE '%x%' cannot use the token index)
+        query = Q()
+        for token in substrings:
+            query |= Q(token__contains=token)
+        for stored, rawtext_id in RawTextToken.objects.filter(query).values_list("token", "rawtext_id").iterator():
+            for token in substrings:
+                if token in stored:
+                    ids_by_substring[token].add(rawtext_id)
+
+    candidates = set(RawText.objects.filter(token_index_fingerprint__isnull=True).values_list("id", flat=True))
+    for tokens in exact:
+        candidates |= set.intersection(*(ids_by_token.get(token, set()) for token in tokens))
+    for tokens in contains:
+        candidates |= set.intersection(*(ids_by_substring[token] for token in tokens))
+    return candidates
@@ -0,0 +1,237 @@
+# narratives/utils/topic_enhance.py
+"""
+Enhance one topic from external knowledge: fill an empty description, let the local model extract type /
+schools / related concepts from the dossier, and create (validated) and link those topics plus the
+Wikipedia discovery links. Used by TopicEnhanceWikipediaView and the enhance_topics command.
+"""
+
+import logging
+
+from django.db.models.functions import Lower
+
+from narratives.models import Topic
+from narratives.utils.declined_topics import count_repeat_declines, declined_names, record_declined
+from narratives.utils.knowledge_sources.aggregator import get_topic_knowledge
+from narratives.utils.local_ai import analyze_topic_with_ai
+from narratives.utils.nlp import first_token_pos
+from narratives.utils.wikipedia_lookup import lookup_wikipedia_page, lookup_wikipedia_pages
+
+logger = logging.getLogger(__name__)
+
+
+def enhance_topic(topic: Topic, refresh: bool = False) -> dict:
+    """
+    Returns {"status": "no_knowledge" | "ai_failed" | "enhanced", ...}: sources_used, dossier, summary and, once
+    enhanced, ai_extracted, created_new_topics, linked_schools, linked_related, discovered_from_wikipedia,
+    rejected_suggestions_count. refresh=True re-fetches the knowledge sources instead of the stored dossier.
+    """
+    # 1. Collect knowledge from multiple sources (stored per topic)
+    knowledge_list, dossier = get_topic_knowledge(topic, refresh=refresh)
+    if not knowledge_list:
+        return {"status": "no_knowledge"}
+
+    # 2. Update Topic Description if empty or different (prefer Binance Academy for crypto)
+    best_content = knowledge_list[0]['content']
+    if not topic.description or len(topic.description) < 50:
+        topic.description = best_content
+        topic.save()
+
+    result = {
+        "status": "enhanced",
+        "sources_used": [s['source'] for s in knowledge_list],
+        "dossier": dossier,
+        "summary": best_content,
+    }
+
+    # 3. Analyze with Local AI using the combined dossier
+    ai_results = analyze_topic_with_ai(topic.name, dossier)
+
+    if not ai_results:
+        result["status"] = "ai_failed"
+        return result
+
+    # 4. Apply findings (Create missing topics and link them)
+    created_topics = []
+    linked_schools = []
+    linked_related = []
+    rejected_count = 0
+    # Discovery links come from the Wikipedia source only
+    discovery_links = []
+    for knowledge in knowledge_list:
+        if knowledge.get('source') == 'Wikipedia' and 'related_links' in knowledge:
+            discovery_links = knowledge['related_links']
+            break
+
+    # Names the helper may check on Wikipedia, looked up in one batch (cached in WikipediaLookup).
+    # Names of topics that already exist (or links to their Wikipedia page) never reach those checks.
+    candidate_names = [n for n in ai_results.get("schools", []) + ai_results.get("related", []) if isinstance(n, str)]
+    candidate_names += [link["title"] for link in discovery_links]
+    candidate_names = [n.strip() for n in candidate_names]
+    existing_names = set(
+        Topic.objects.annotate(name_lower=Lower("name"))
+        .filter(name_lower__in={n.lower() for n in candidate_names})
+        .values_list("name_lower", flat=True)
+    )
+    linked_urls = [link["url"] for link in discovery_links if link.get("url")]
+    existing_urls = set(Topic.objects.filter(wikipedia_url__in=linked_urls).values_list("wikipedia_url", flat=True))
+    existing_names.update(link["title"].strip().lower() for link in discovery_links if link.get("url") in existing_urls)
+    candidate_names = [n for n in candidate_names if n and n.lower() not in existing_names]
+    # Names declined before are rejected right away (no spaCy, no Wikipedia)
+    declined = declined_names(candidate_names)
+    skipped_as_declined = []
+    wiki_pages = lookup_wikipedia_pages([n for n in candidate_names if n not in declined])
+    # First-token POS of all candidates in one spaCy batch (names outside it are tagged on demand)
+    try:
+        first_pos = first_token_pos(n for n in candidate_names if n not in declined)
+    except Exception as e:
+        logger.warning("POS validation failed: %s", e)
+        first_pos = {}
+
+    # Helper to get or create topic with validation
+    def get_or_create_topic(name, target_field):
+        nonlocal rejected_count
+        name = name.strip()
+        if not name: return None
+
+        # 0. Case-insensitive existence check to avoid duplicates
+        existing = Topic.objects.filter(name__iexact=name).first()
+        if existing:
+            return existing
+
+        # 0a. Declined before (any reason)
+        if name in declined:
+            skipped_as_declined.append(name)
+            rejected_count += 1
+            return None
+
+        # 0b. Forbidden name patterns (e.g. "Cointelegraph by ...")
+        from narratives.utils.topic_name_censor import is_forbidden_topic_name
+        if is_forbidden_topic_name(name):
+            record_declined(
+                name,
+                'other',
+                source_topic=topic,
+                target_field=target_field,
+                reason_detail='Forbidden topic name pattern (e.g. source byline).'
+            )
+            rejected_count += 1
+            return None
+
+        # 1. Basic length check
+        if len(name) < 2:
+            record_declined(
+                name,
+                'too_short',
+                source_topic=topic,
+                target_field=target_field,
+            )
+            rejected_count += 1
+            return None
+
+        # 2. POS Validation with spaCy (Anti-verb check)
+        try:
+            pos = first_pos[name] if name in first_pos else first_token_pos([name]).get(name)
+            if pos:
+                pos_, tag_ = pos
+                # Check if first token is a verb OR if it's a participle (like 'Written')
+                # spaCy tags: VERB (main verb), AUX (auxiliary), PART (particle)
+                if pos_ in ["VERB", "AUX"]:
+                    record_declined(
+                        name,
+                        'starts_with_verb',
+                        source_topic=topic,
+                        target_field=target_field,
+                        reason_detail=f"Detected POS: {pos_} ({tag_})"
+                    )
+                    rejected_count += 1
+                    return None
+        except Exception as e:
+            logger.warning("POS validation failed: %s", e)
+
+        # 3. Wikipedia Existence Check (Final sanity check for new topics)
+        try:
+            page = wiki_pages[name] if name in wiki_pages else lookup_wikipedia_page(name)
+            if page is None:
+                # Also check if it exists in our DB already
+                if not Topic.objects.filter(name__iexact=name).exists():
+                    record_declined(
+                        name,
+                        'wikipedia_missing',
+                        source_topic=topic,
+                        target_field=target_field,
+                        reason_detail="No exact match found on English Wikipedia"
+                    )
+                    rejected_count += 1
+                    return None
+        except Exception as e:
+            logger.warning("Wikipedia check failed: %s", e)
+
+        # 4. Create or get
+        name = name[0].upper() + name[1:] if len(name) > 0 else name
+        t, created = Topic.objects.get_or_create(name=name)
+        if created:
+            created_topics.append(name)
+        return t
+
+    # Process Schools of Thought
+    from narratives.utils.school_of_thought import ensure_school_topics_have_type
+    school_ids_added = []
+    for s_name in ai_results.get("schools", []):
+        s_topic = get_or_create_topic(s_name, "schools")
+        if s_topic and s_topic != topic:
+            topic.schools_of_thought.add(s_topic)
+            linked_schools.append(s_name)
+            school_ids_added.append(s_topic.id)
+    if school_ids_added:
+        ensure_school_topics_have_type(school_ids_added)
+
+    # Process Related Topics from AI results
+    for r_name in ai_results.get("related", []):
+        r_topic = get_or_create_topic(r_name, "related")
+        if r_topic and r_topic != topic:
+            topic.related_topics.add(r_topic)
+            linked_related.append(r_name)
+
+    # Process discovery links from Wikipedia (Summary/Overview)
+    discovered_topics_count = 0
+    for link in discovery_links:
+        link_title = link['title']
+        link_url = link['url']
+
+        # Check if exists or create
+        # We use a simplified version of get_or_create_topic logic here
+        # but we prioritize Wikipedia URL and canonical title.
+
+        # 1. Check by Wikipedia URL first
+        r_topic = Topic.objects.filter(wikipedia_url=link_url).first()
+
+        # 2. Check by canonical name
+        if not r_topic:
+            r_topic = Topic.objects.filter(name__iexact=link_title).first()
+
+        if not r_topic:
+            # Create new topic if it doesn't exist
+            # We still want to run basic validation (no verbs, etc.)
+            r_topic = get_or_create_topic(link_title, "wikipedia_discovery")
+            if r_topic:
+                r_topic.wikipedia_url = link_url
+                r_topic.save()
+                discovered_topics_count += 1
+
+        # Link as related if not already linked and not the same topic
+        if r_topic and r_topic != topic:
+            topic.related_topics.add(r_topic)
+            if link_title not in linked_related:
+                linked_related.append(link_title)
+
+    count_repeat_declines(skipped_as_declined)
+
+    result.update({
+        "ai_extracted": ai_results,
+        "created_new_topics": created_topics,
+        "linked_schools": linked_schools,
+        "linked_related": linked_related,
+        "discovered_from_wikipedia": discovered_topics_count,
+        "rejected_suggestions_count": rejected_count,
+    })
+    return result
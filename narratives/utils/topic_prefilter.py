@@ -0,0 +1,169 @@
+# narratives/utils/topic_prefilter.py
+"""
+Prefilter for the "existing topics" list of AI topic suggestion (RawTextAISuggestTopicsView).
+Instead of every Topic name and alternative_name, the model only gets the names plausibly relevant to
+the article: topics the keyword matcher hits in the text first, then names whose words appear in the
+text exactly or nearly (trigram similarity, e.g. plurals and spelling variants), best first, until the
+token budget (AI_SUGGEST_EXISTING_TOPICS_TOKEN_BUDGET) or name limit (AI_SUGGEST_EXISTING_TOPICS_LIMIT) is used.
+"""
+
+import logging
+import re
+import threading
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from narratives.models import Topic
+from narratives.utils.aho_corasick import find_substrings_ignorecase, find_whole_words, fold_case
+from narratives.utils.categorize import get_keyword_matcher
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Name words shorter than this ("of", "de", "us") say nothing about relevance and are ignored.
+_MIN_WORD_LEN = 3
+# Trigram similarity (shared / union of padded word trigrams, as pg_trgm) for a word to count as present.
+WORD_SIMILARITY_THRESHOLD = 0.5
+# Share of a name's words that must be present for the name to be sent.
+NAME_SCORE_THRESHOLD = 0.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt part (about 4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def _trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _name_words(name: str) -> tuple:
+    return tuple(dict.fromkeys(w for w in _WORD_RE.findall(fold_case(name)) if len(w) >= _MIN_WORD_LEN))
+
+
+class _NameIndex:
+    """Topic names (name and alternative_name) with their significant words; rebuilt when topics change."""
+
+    def __init__(self, rows, key):
+        self.key = key
+        self.names = []  # [(name, topic_id, words)]
+        self.words = {}  # word -> trigram set
+        for topic_id, name, alt in rows:
+            for value in (name, alt):
+                value = (value or "").strip()
+                if not value:
+                    continue
+                words = _name_words(value)
+                self.names.append((value, topic_id, words))
+                for word in words:
+                    if word not in self.words:
+                        self.words[word] = _trigrams(word)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _get_name_index() -> _NameIndex:
+    global _index
+    stats = Topic.objects.aggregate(n=Count("id"), changed=Max("updated_at"))
+    key = (stats["n"], stats["changed"])
+    with _index_lock:
+        if _index is None or _index.key != key:
+            _index = _NameIndex(Topic.objects.values_list("id", "name", "alternative_name").order_by("id"), key)
+        return _index
+
+
+def _keyword_topic_ids(text: str, matcher) -> set:
+    """Topic ids with at least one keyword hit in text (raw hits, before weak-keyword and POS rules)."""
+    topic_ids = set()
+    for kw_lower in matcher.processor.extract_keywords(text):
+        topic_ids.update(int(info[0]) for info in matcher.keyword_map.get(kw_lower, []))
+    if matcher.case_sensitive_list:
+        found = find_whole_words(matcher.case_sensitive_automaton, text)
+        topic_ids.update(int(tid) for tid, kw, _, _ in matcher.case_sensitive_list if kw in found)
+    if matcher.substring_list:
+        found = find_substrings_ignorecase(matcher.substring_automaton, text)
+        topic_ids.update(int(tid) for tid, kw, _, _ in matcher.substring_list if fold_case(kw) in found)
+    return topic_ids
+
+
+def _word_scores(text_words: set, index: _NameIndex) -> dict:
+    """Name word -> 1.0 if it is in the text, else its best trigram similarity to a text word (if above threshold)."""
+    by_trigram = {}
+    for word in text_words:
+        for trigram in _trigrams(word):
+            by_trigram.setdefault(trigram, []).append(word)
+    text_trigrams = {}
+    scores = {}
+    for word, trigrams in index.words.items():
+        if word in text_words:
+            scores[word] = 1.0
+            continue
+        shared = {}
+        for trigram in trigrams:
+            for text_word in by_trigram.get(trigram, ()):
+                shared[text_word] = shared.get(text_word, 0) + 1
+        best = 0.0
+        for text_word, n in shared.items():
+            other = text_trigrams.get(text_word)
+            if other is None:
+                other = text_trigrams[text_word] = len(_trigrams(text_word))
+            best = max(best, n / (len(trigrams) + other - n))
+        if best >= WORD_SIMILARITY_THRESHOLD:
+            scores[word] = best
+    return scores
+
+
+def relevant_topic_names(text: str, token_budget: int = None, limit: int = None, matcher=None):
+    """
+    Existing topic names to send with an AI suggestion request for text, most relevant first.
+    Returns (names, budget) where budget reports what was considered and what the names cost in tokens.
+    """
+    token_budget = token_budget if token_budget is not None else settings.AI_SUGGEST_EXISTING_TOPICS_TOKEN_BUDGET
+    limit = limit if limit is not None else settings.AI_SUGGEST_EXISTING_TOPICS_LIMIT
+    index = _get_name_index()
+
+    try:
+        keyword_ids = _keyword_topic_ids(text, matcher or get_keyword_matcher())
+    except Exception as e:
+        logger.warning("Keyword prefilter failed, using fuzzy matches only: %s", e)
+        keyword_ids = set()
+
+    word_scores = _word_scores(set(_WORD_RE.findall(fold_case(text))), index)
+    ranked = []  # (rank tuple, name)
+    for position, (name, topic_id, words) in enumerate(index.names):
+        if topic_id in keyword_ids:
+            ranked.append(((0, 0.0, position), name))
+            continue
+        if not words:
+            continue
+        score = sum(word_scores.get(word, 0.0) for word in words) / len(words)
+        if score >= NAME_SCORE_THRESHOLD:
+            ranked.append(((1, -score, position), name))
+    ranked.sort()
+
+    names = []
+    seen = set()
+    tokens = 0
+    for _, name in ranked:
+        if name in seen:
+            continue
+        cost = estimate_tokens(name + ", ")
+        if len(names) >= limit or tokens + cost > token_budget:
+            break
+        seen.add(name)
+        names.append(name)
+        tokens += cost
+
+    budget = {
+        "existing_topics_total": len({name for name, _, _ in index.names}),
+        "existing_topics_sent": len(names),
+        "keyword_matched_topics": len(keyword_ids),
+        "fuzzy_candidates": sum(1 for rank, _ in ranked if rank[0] == 1),
+        "existing_topics_tokens": tokens,
+        "existing_topics_token_budget": token_budget,
+    }
+    return names, budget
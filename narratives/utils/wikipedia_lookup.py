@@ -0,0 +1,185 @@
+# narratives/utils/wikipedia_lookup.py
+"""
+Does a Wikipedia page exist for a name, and what is its canonical title / URL / summary?
+Answers are cached in WikipediaLookup (negative results too, with a shorter TTL); names not cached are
+looked up with batched MediaWiki API queries (many titles per request, redirects followed) instead of
+one wikipediaapi round-trip per name. Used by AI topic suggestion and topic enhancement.
+In tests, pass MediaWikiBackend(transport=httpx.MockTransport(...)) or point WIKIPEDIA_API_URL at a local server.
+"""
+
+import logging
+import re
+from datetime import timedelta
+
+import httpx
+from django.conf import settings
+from django.utils import timezone
+
+from narratives.models import WikipediaLookup
+from narratives.utils.http_client import get_http_client, profile_headers
+
+logger = logging.getLogger(__name__)
+
+# The API returns intro extracts for at most 20 pages per request.
+TITLES_PER_REQUEST = 20
+_SUMMARY_MAX_CHARS = 2000
+
+
+class WikipediaLookupError(Exception):
+    """The MediaWiki API could not be queried."""
+
+
+def normalise_lookup_name(name: str) -> str:
+    return re.sub(r"\s+", " ", name or "").strip()
+
+
+class MediaWikiBackend:
+    """
+    Batched page lookups against the MediaWiki action API, on the shared pooled client.
+    transport is injectable (e.g. httpx.MockTransport); the backend then has its own client.
+    """
+
+    def __init__(self, api_url: str = None, timeout: float = 15.0, transport: httpx.BaseTransport = None):
+        self.api_url = api_url or getattr(settings, "WIKIPEDIA_API_URL", "https://{lang}.wikipedia.org/w/api.php")
+        self.timeout = timeout
+        self._own_client = httpx.Client(transport=transport) if transport else None
+        self._client = self._own_client or get_http_client()
+
+    def close(self):
+        if self._own_client:
+            self._own_client.close()
+
+    def _query(self, titles: list, lang: str) -> dict:
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "redirects": "1",
+            "prop": "extracts|info",
+            "inprop": "url",
+            "exintro": "1",
+            "explaintext": "1",
+            "exlimit": "max",
+            "titles": "|".join(titles),
+        }
+        merged = {"normalized": [], "redirects": [], "pages": {}}
+        extra = {}
+        while True:
+            try:
+                response = self._client.get(
+                    self.api_url.format(lang=lang),
+                    params={**params, **extra},
+                    headers=profile_headers("bot"),
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                raise WikipediaLookupError(f"Wikipedia API request failed: {e}") from e
+            if "error" in data:
+                raise WikipediaLookupError(f"Wikipedia API error: {data['error']}")
+            query = data.get("query") or {}
+            merged["normalized"] += query.get("normalized") or []
+            merged["redirects"] += query.get("redirects") or []
+            for page in query.get("pages") or []:
+                # With continuation the same page comes back again, with the props that were missing before.
+                merged["pages"].setdefault(page.get("title"), {}).update(page)
+            if "continue" not in data:
+                return merged
+            extra = data["continue"]
+
+    def fetch(self, names: list, lang: str = "en") -> dict:
+        """name -> {"title", "url", "summary"} or None if there is no such page."""
+        results = {}
+        for i in range(0, len(names), TITLES_PER_REQUEST):
+            chunk = names[i:i + TITLES_PER_REQUEST]
+            query = self._query(chunk, lang)
+            normalized = {n["from"]: n["to"] for n in query["normalized"]}
+            redirects = {r["from"]: r["to"] for r in query["redirects"]}
+            for name in chunk:
+                title = normalized.get(name, name)
+                title = redirects.get(title, title)
+                page = query["pages"].get(title)
+                if not page or page.get("missing") or page.get("invalid"):
+                    results[name] = None
+                    continue
+                results[name] = {
+                    "title": page.get("title") or title,
+                    "url": page.get("fullurl") or "",
+                    "summary": (page.get("extract") or "")[:_SUMMARY_MAX_CHARS],
+                }
+        return results
+
+
+def _ttl(exists: bool) -> timedelta:
+    if exists:
+        return timedelta(days=getattr(settings, "WIKIPEDIA_LOOKUP_TTL_DAYS", 30))
+    return timedelta(days=getattr(settings, "WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS", 7))
+
+
+def _page(entry: WikipediaLookup):
+    return {"title": entry.title, "url": entry.url, "summary": entry.summary} if entry.exists else None
+
+
+def lookup_wikipedia_pages(names, lang: str = "en", backend: MediaWikiBackend = None) -> dict:
+    """
+    name -> {"title", "url", "summary"} or None (no page), for each name. Fresh cached answers are used as is;
+    the rest are fetched in batches and cached. Names whose lookup failed are left out of the result.
+    """
+    keys = {}
+    for name in names:
+        key = normalise_lookup_name(name)
+        if key:
+            keys.setdefault(key, []).append(name)
+    if not keys:
+        return {}
+
+    now = timezone.now()
+    found = {}
+    for entry in WikipediaLookup.objects.filter(lang=lang, name__in=list(keys)):
+        if entry.fetched_at >= now - _ttl(entry.exists):
+            found[entry.name] = _page(entry)
+
+    missing = []
+    for key in keys:
+        if key in found:
+            continue
+        if "|" in key or len(key.encode("utf-8")) > 255:
+            found[key] = None  # not a valid title ("|" separates titles in the API; titles are at most 255 bytes)
+        else:
+            missing.append(key)
+    if missing:
+        owned_backend = backend is None
+        backend = backend or MediaWikiBackend()
+        try:
+            fetched = backend.fetch(missing, lang)
+        except WikipediaLookupError as e:
+            logger.warning("Wikipedia lookup of %s names failed: %s", len(missing), e)
+            fetched = {}
+        finally:
+            if owned_backend:
+                backend.close()
+        for key, page in fetched.items():
+            WikipediaLookup.objects.update_or_create(
+                lang=lang,
+                name=key,
+                defaults={
+                    "exists": page is not None,
+                    "title": (page or {}).get("title", "")[:500],
+                    "url": (page or {}).get("url", "")[:1000],
+                    "summary": (page or {}).get("summary", ""),
+                    "fetched_at": now,
+                },
+            )
+            found[key] = page
+
+    return {name: found[key] for key, originals in keys.items() if key in found for name in originals}
+
+
+def lookup_wikipedia_page(name: str, lang: str = "en", backend: MediaWikiBackend = None):
+    """Single-name lookup_wikipedia_pages. Raises WikipediaLookupError if the name could not be checked."""
+    result = lookup_wikipedia_pages([name], lang, backend)
+    if name not in result:
+        raise WikipediaLookupError(f"Could not look up {name!r} on Wikipedia")
+    return result[name]
+
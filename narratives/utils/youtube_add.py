@@ -2,12 +2,12 @@
 """Add a YouTube channel by URL. Used by YouTubeSourceAddView and add_crypto_youtube_channels command."""
 
 import re
-import requests
 from bs4 import BeautifulSoup
 from django.conf import settings
 from googleapiclient.discovery import build
 
 from narratives.models import Source, Topic
+from narratives.utils.http_client import http_get
 
 
 def add_youtube_channel_by_url(url: str, avatar_file=None):
@@ -48,10 +48,7 @@ def add_youtube_channel_by_url(url: str, avatar_file=None):
             external_id = search_response["items"][0]["id"]["channelId"]
 
     if not external_id:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         soup = BeautifulSoup(response.text, "html.parser")
         external_id_meta = soup.find("meta", itemprop="channelId")
         if external_id_meta:
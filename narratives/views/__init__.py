@@ -15,9 +15,11 @@ from .sources import (
     RawTextRemoveTopicView,
     RawTextCategorizeAllView,
     RawTextCategorizeByTopicView,
+    RawTextCategorizeChangedTopicsView,
     RawTextAISuggestTopicsView,
     RawTextsByTopicsView,
     PendingTopicActionView,
+    SwotJobStatusView,
     TopicListView,
     TopicTypeListView,
     TopicTypeDetailView,
@@ -26,6 +28,7 @@ from .sources import (
     TopicCreateView, 
     TopicDetailView,
     TopicEnhanceWikipediaView,
+    TopicSimulateRulesView,
     DeclinedTopicListView,
     TopicBulkDeleteView,
     TopicDistributionView,
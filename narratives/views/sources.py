@@ -6,7 +6,7 @@ from django.db.models import Count, F, Q
 from django.db.models.functions import Coalesce, Length, Least, TruncDate
 from django.utils import timezone
 from django.contrib.postgres.search import TrigramSimilarity
-from rest_framework import generics, status
+from rest_framework import generics, serializers, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
@@ -36,12 +36,31 @@ from narratives.models import (
     TopicAnalyticalCategory,
 )
 from narratives.models.categories import DeclinedTopic, Topic, TopicType
-from narratives.utils.categorize import run_find_topics_for_rawtext
-from narratives.utils.knowledge_sources.aggregator import collect_topic_knowledge, format_knowledge_dossier
-from narratives.utils.local_ai import analyze_topic_with_ai, analyze_swot_trigger
-import wikipediaapi
+from narratives.utils.categorize import (
+    run_find_topics_for_rawtext,
+    run_find_topics_for_texts,
+    run_incremental_recategorization,
+    simulate_topic_rules,
+)
+from narratives.utils.swot_queue import swot_queue_status
+from narratives.utils.declined_topics import count_repeat_declines, declined_names, record_declined
+from narratives.utils.wikipedia_lookup import lookup_wikipedia_pages
+from narratives.utils.topic_enhance import enhance_topic
+from narratives.utils.topic_prefilter import estimate_tokens, relevant_topic_names
+from narratives.utils.local_ai import analyze_swot_trigger
 from rest_framework.pagination import PageNumberPagination
 
+# Decline reasons that AI topic suggestion re-checks itself (POS, Wikipedia); only these skip a name
+SUGGEST_RECHECKED_DECLINES = ("starts_with_verb", "wikipedia_missing")
+
+
+def _bool_flag(data, key: str, default: bool = False) -> bool:
+    """Boolean body field: JSON true/false or form values like "false" / "0" (400 on anything else)."""
+    value = data.get(key) if data else None
+    if value in (None, ""):
+        return default
+    return serializers.BooleanField().to_internal_value(value)
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
@@ -237,13 +256,7 @@ class RawTextCategorizeAllView(APIView):
                 "message": "No RawTexts to process.",
             }, status=status.HTTP_200_OK)
 
-        created_total = 0
-        for rawtext in qs:
-            try:
-                _, created = run_find_topics_for_rawtext(rawtext, reset=True)
-                created_total += created
-            except Exception:
-                pass
+        _, _, created_total = run_find_topics_for_texts(qs, reset=True)
 
         return Response({
             "processed": total,
@@ -281,27 +294,24 @@ class RawTextCategorizeByTopicView(APIView):
 
         RawText.objects.all().update(recently_recategorized_at=None)
 
-        qs = RawText.objects.filter(id__in=rawtext_ids).order_by("id").select_related("source")
-        total = qs.count()
-        created_total = 0
-        articles = []
-        now = timezone.now()
-        for rawtext in qs:
-            try:
-                _, created = run_find_topics_for_rawtext(rawtext, reset=True)
-                created_total += created
-                rawtext.recently_recategorized_at = now
-                rawtext.save(update_fields=["recently_recategorized_at"])
-                articles.append({
-                    "id": rawtext.id,
-                    "title": rawtext.title or "",
-                    "source_name": rawtext.source.name if rawtext.source else "",
-                })
-            except Exception:
-                pass
+        rawtexts = list(RawText.objects.filter(id__in=rawtext_ids).order_by("id").select_related("source"))
+        total = len(rawtexts)
+        started = timezone.now()
+        processed, _, created_total = run_find_topics_for_texts(rawtexts, reset=True)
+        # Texts that failed matching keep their old last_categorized_at and are not listed as recategorized
+        rawtexts = [rt for rt in rawtexts if rt.last_categorized_at and rt.last_categorized_at >= started]
+        RawText.objects.filter(id__in=[rt.id for rt in rawtexts]).update(recently_recategorized_at=timezone.now())
+        articles = [
+            {
+                "id": rawtext.id,
+                "title": rawtext.title or "",
+                "source_name": rawtext.source.name if rawtext.source else "",
+            }
+            for rawtext in rawtexts
+        ]
 
         return Response({
-            "processed": total,
+            "processed": processed,
             "created": created_total,
             "total": total,
             "articles": articles,
@@ -309,6 +319,24 @@ class RawTextCategorizeByTopicView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class RawTextCategorizeChangedTopicsView(APIView):
+    """Re-categorize only topics whose keyword rules changed since the last run, only on texts they can affect."""
+
+    def post(self, request):
+        dry_run = _bool_flag(request.data, "dry_run")
+        result = run_incremental_recategorization(dry_run=dry_run)
+        if not result["changes"]:
+            message = "No pending topic rule changes."
+        elif dry_run:
+            message = f"Would re-match {result['topics']} topics on {result['candidates']} candidate RawTexts."
+        else:
+            message = (
+                f"Re-matched {result['topics']} topics on {result['processed']} RawTexts, "
+                f"created {result['created']} PendingTopics, marked {result['promoted']} RawTexts up to date."
+            )
+        return Response({**result, "message": message}, status=status.HTTP_200_OK)
+
+
 class RawTextRemoveTopicView(APIView):
     """Remove a topic from this article: delete all PendingTopic rows for this rawtext + topic."""
 
@@ -325,6 +353,13 @@ class RawTextRemoveTopicView(APIView):
         return Response({"deleted": deleted, "message": f"Removed {deleted} occurrence(s) of this topic from the article."}, status=status.HTTP_200_OK)
 
 
+class SwotJobStatusView(APIView):
+    """Progress of the SWOT job queue (threat-topic mentions waiting for / done by the SWOT worker)."""
+
+    def get(self, request):
+        return Response(swot_queue_status(), status=status.HTTP_200_OK)
+
+
 class PendingTopicActionView(APIView):
     def post(self, request, id):
         pending = get_object_or_404(PendingTopic, id=id)
@@ -525,12 +560,12 @@ class AnalyticalCategoryListView(generics.ListAPIView):
 
 
 class DeclinedTopicListView(generics.ListAPIView):
-    queryset = DeclinedTopic.objects.all().order_by('-created_at')
+    queryset = DeclinedTopic.objects.all().order_by('-last_declined_at')
     serializer_class = DeclinedTopicSerializer
     pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        queryset = DeclinedTopic.objects.all().order_by('-created_at')
+        queryset = DeclinedTopic.objects.all().order_by('-last_declined_at')
         search = self.request.query_params.get('search')
         if search:
             queryset = queryset.filter(name__icontains=search)
@@ -671,6 +706,26 @@ class TopicDetailView(generics.RetrieveUpdateAPIView):
 
         return Response(serializer.data)
 
+class TopicSimulateRulesView(APIView):
+    """Preview proposed keywords / weak_keywords for a topic: mentions that would be added or removed. Writes nothing."""
+
+    def post(self, request, id):
+        topic = get_object_or_404(Topic, id=id)
+        keywords = request.data.get("keywords")
+        weak_keywords = request.data.get("weak_keywords")
+        if keywords is not None and not isinstance(keywords, list):
+            return Response({"error": "keywords must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+        if weak_keywords is not None and not isinstance(weak_keywords, list):
+            return Response({"error": "weak_keywords must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            sample_size = min(max(int(request.data.get("sample_size", 20)), 0), 200)
+        except (TypeError, ValueError):
+            return Response({"error": "sample_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = simulate_topic_rules(topic, keywords=keywords, weak_keywords=weak_keywords, sample_size=sample_size)
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class TopicBulkDeleteView(APIView):
     def post(self, request):
         ids = request.data.get("ids", [])
@@ -721,20 +776,20 @@ class RawTextAISuggestTopicsView(APIView):
         existing_linked_topic_ids = PendingTopic.objects.filter(rawtext=rawtext).values_list('topic_id', flat=True)
         existing_topics_map = {t.name.lower(): t for t in Topic.objects.filter(id__in=existing_linked_topic_ids)}
         
-        # 2. All topics in DB (name + alternative_name) so we don't suggest duplicates and can match "Donald J Trump" -> "Donald Trump"
+        # 2. All topics in DB (name + alternative_name) so we can match "Donald J Trump" -> "Donald Trump"
         all_topics = list(Topic.objects.values("id", "name", "alternative_name"))
-        all_names_for_ai = set()  # exact strings to pass to AI (do not suggest)
         norm_to_topic = {}  # normalised string -> first topic (for matching)
         for t in all_topics:
             name = (t.get("name") or "").strip()
             alt = (t.get("alternative_name") or "").strip()
             if name:
-                all_names_for_ai.add(name)
                 norm_to_topic[_normalise_topic_name_for_match(name)] = t
             if alt:
-                all_names_for_ai.add(alt)
                 norm_to_topic[_normalise_topic_name_for_match(alt)] = t
-        existing_topic_names = list(all_names_for_ai)  # AI gets full DB list so it doesn't suggest "Donald Trump" again
+        # AI only gets the existing names relevant to this text (keyword hits + near word matches), within a token budget
+        ai_text = rawtext.content[:4000]
+        existing_topic_names, prompt_budget = relevant_topic_names(ai_text)
+        prompt_budget["text_tokens"] = estimate_tokens(ai_text)
         
         # 3. Hybrid Extraction: spaCy NER + Local AI
         
@@ -748,7 +803,7 @@ class RawTextAISuggestTopicsView(APIView):
             TopicType.objects.values("id", "name").order_by("name")
         )
         ai_results = suggest_new_topics_with_ai(
-            rawtext.content[:4000], existing_topic_names, topic_types_for_ai
+            ai_text, existing_topic_names, topic_types_for_ai
         )
         
         if not ai_results or "suggested_topics" not in ai_results:
@@ -809,20 +864,22 @@ class RawTextAISuggestTopicsView(APIView):
         valid_suggestions = []
         rejected_suggestions = []
         
-        from narratives.utils.ai_module import _get_nlp
-        nlp = _get_nlp()
-        user_agent = "ProphetOntologyBot/1.0 (https://github.com/paulus/prophet; contact@example.com)"
-        wiki = wikipediaapi.Wikipedia(user_agent=user_agent, language='en')
+        from narratives.utils.nlp import first_token_pos
+        checked = []  # (name, info, topic_obj, is_already_linked) that passed the checks above, in order
+        # AI names declined before by the checks below (verb, Wikipedia missing) skip them; NER names are not POS-checked
+        declined = declined_names(
+            (info["name"] for info in merged_suggestions.values() if not info["is_ner"]), reasons=SUGGEST_RECHECKED_DECLINES
+        )
+        skipped_as_declined = []
 
         for name_lower, info in merged_suggestions.items():
             name = info["name"]
             if len(name) < 2: continue
             if _is_forbidden_topic_name(name):
-                DeclinedTopic.objects.create(
-                    name=name,
-                    source_topic=None,
+                record_declined(
+                    name,
+                    "other",
                     target_field="ai_suggest",
-                    reason="other",
                     reason_detail="Forbidden topic name pattern (e.g. source byline like 'Cointelegraph by …').",
                 )
                 rejected_suggestions.append({"name": name, "reason": "Forbidden topic name pattern"})
@@ -847,23 +904,53 @@ class RawTextAISuggestTopicsView(APIView):
             if is_already_linked:
                 rejected_suggestions.append({"name": name, "reason": "Already linked to this text"})
                 continue
-            
-            # POS Check (Only for AI suggestions, NER is already high confidence proper nouns)
-            if not info["is_ner"] and not topic_obj:
-                doc = nlp(name)
-                if len(doc) > 0 and doc[0].pos_ in ["VERB", "AUX"]:
-                    rejected_suggestions.append({"name": name, "reason": "Starts with verb"})
-                    continue
-                
-            # Wikipedia Check (Only if not in DB)
+
+            if not topic_obj and not info["is_ner"] and name in declined:
+                skipped_as_declined.append(name)
+                rejected_suggestions.append({"name": name, "reason": f"Declined before ({declined[name]})"})
+                continue
+            checked.append((name, info, topic_obj, is_already_linked))
+        count_repeat_declines(skipped_as_declined, reasons=SUGGEST_RECHECKED_DECLINES)
+
+        # POS Check (Only for AI suggestions, NER is already high confidence proper nouns): all names in one batch
+        first_pos = first_token_pos(
+            name for name, info, topic_obj, _ in checked if not info["is_ner"] and not topic_obj
+        )
+        passed_pos = []
+        for name, info, topic_obj, is_already_linked in checked:
+            pos = first_pos.get(name) if not info["is_ner"] and not topic_obj else None
+            if pos and pos[0] in ["VERB", "AUX"]:
+                record_declined(
+                    name,
+                    "starts_with_verb",
+                    target_field="ai_suggest",
+                    reason_detail=f"Detected POS: {pos[0]} ({pos[1]})",
+                )
+                rejected_suggestions.append({"name": name, "reason": "Starts with verb"})
+                continue
+            passed_pos.append((name, info, topic_obj, is_already_linked))
+        checked = passed_pos
+
+        # Wikipedia Check (Only if not in DB): one cached, batched lookup for all remaining names
+        wiki_pages = lookup_wikipedia_pages([name for name, _, topic_obj, _ in checked if not topic_obj])
+        for name, info, topic_obj, is_already_linked in checked:
             summary = ""
             if not topic_obj:
-                page = wiki.page(name)
-                if not page.exists():
+                if name not in wiki_pages:
+                    rejected_suggestions.append({"name": name, "reason": "Wikipedia lookup failed"})
+                    continue
+                page = wiki_pages[name]
+                if page is None:
+                    record_declined(
+                        name,
+                        "wikipedia_missing",
+                        target_field="ai_suggest",
+                        reason_detail="No exact match found on English Wikipedia",
+                    )
                     rejected_suggestions.append({"name": name, "reason": "Wikipedia page missing"})
                     continue
-                name = page.title # Use canonical Wikipedia title
-                summary = page.summary[:200] + "..."
+                name = page["title"] # Use canonical Wikipedia title
+                summary = page["summary"][:200] + "..."
             else:
                 summary = (topic_obj.description or "")[:200] + "..."
                 # Use canonical topic name so UI shows "Donald Trump" not "Donald J Trump"
@@ -892,7 +979,8 @@ class RawTextAISuggestTopicsView(APIView):
             
         return Response({
             "suggestions": valid_suggestions,
-            "rejected": rejected_suggestions
+            "rejected": rejected_suggestions,
+            "prompt_budget": prompt_budget,
         }, status=status.HTTP_200_OK)
 
 class TopicDistributionView(APIView):
@@ -947,185 +1035,27 @@ class TopicDistributionView(APIView):
 class TopicEnhanceWikipediaView(APIView):
     def post(self, request, id):
         topic = get_object_or_404(Topic, id=id)
-        
-        # 1. Collect knowledge from multiple sources
-        knowledge_list = collect_topic_knowledge(topic.name, wikipedia_url=topic.wikipedia_url)
-        if not knowledge_list:
+
+        # Knowledge is stored per topic; "refresh": true re-fetches the sources
+        result = enhance_topic(topic, refresh=_bool_flag(request.data, "refresh"))
+        if result["status"] == "no_knowledge":
             return Response({"error": f"No information found for '{topic.name}' in any source."}, status=status.HTTP_404_NOT_FOUND)
-        
-        # 2. Update Topic Description if empty or different (prefer Binance Academy for crypto)
-        best_content = knowledge_list[0]['content']
-        if not topic.description or len(topic.description) < 50:
-            topic.description = best_content
-            topic.save()
-            
-        # 3. Analyze with Local AI using the combined dossier
-        dossier = format_knowledge_dossier(knowledge_list)
-        ai_results = analyze_topic_with_ai(topic.name, dossier)
-        
-        if not ai_results:
+        if result["status"] == "ai_failed":
             return Response({
                 "message": "Knowledge collected, but AI analysis failed (check Ollama).",
-                "dossier": dossier
+                "dossier": result["dossier"]
             }, status=status.HTTP_200_OK)
-            
-        # 4. Apply findings (Create missing topics and link them)
-        created_topics = []
-        linked_schools = []
-        linked_related = []
-        rejected_count = 0
-        
-        # Helper to get or create topic with validation
-        def get_or_create_topic(name, target_field):
-            nonlocal rejected_count
-            name = name.strip()
-            if not name: return None
-            
-            # 0. Case-insensitive existence check to avoid duplicates
-            existing = Topic.objects.filter(name__iexact=name).first()
-            if existing:
-                return existing
-
-            # 0b. Forbidden name patterns (e.g. "Cointelegraph by ...")
-            from narratives.utils.topic_name_censor import is_forbidden_topic_name
-            if is_forbidden_topic_name(name):
-                DeclinedTopic.objects.create(
-                    name=name,
-                    source_topic=topic,
-                    target_field=target_field,
-                    reason='other',
-                    reason_detail='Forbidden topic name pattern (e.g. source byline).'
-                )
-                rejected_count += 1
-                return None
-
-            # 1. Basic length check
-            if len(name) < 2:
-                DeclinedTopic.objects.create(
-                    name=name,
-                    source_topic=topic,
-                    target_field=target_field,
-                    reason='too_short'
-                )
-                rejected_count += 1
-                return None
 
-            # 2. POS Validation with spaCy (Anti-verb check)
-            try:
-                from narratives.utils.ai_module import _get_nlp
-                nlp = _get_nlp()
-                doc = nlp(name)
-                if len(doc) > 0:
-                    first_token = doc[0]
-                    # Check if first token is a verb OR if it's a participle (like 'Written')
-                    # spaCy tags: VERB (main verb), AUX (auxiliary), PART (particle)
-                    if first_token.pos_ in ["VERB", "AUX"]:
-                        DeclinedTopic.objects.create(
-                            name=name,
-                            source_topic=topic,
-                            target_field=target_field,
-                            reason='starts_with_verb',
-                            reason_detail=f"Detected POS: {first_token.pos_} ({first_token.tag_})"
-                        )
-                        rejected_count += 1
-                        return None
-            except Exception as e:
-                print(f"POS validation failed: {e}")
-
-            # 3. Wikipedia Existence Check (Final sanity check for new topics)
-            try:
-                user_agent = "ProphetOntologyBot/1.0 (https://github.com/paulus/prophet; contact@example.com)"
-                wiki = wikipediaapi.Wikipedia(user_agent=user_agent, language='en')
-                page = wiki.page(name)
-                if not page.exists():
-                    # Also check if it exists in our DB already
-                    if not Topic.objects.filter(name__iexact=name).exists():
-                        DeclinedTopic.objects.create(
-                            name=name,
-                            source_topic=topic,
-                            target_field=target_field,
-                            reason='wikipedia_missing',
-                            reason_detail="No exact match found on English Wikipedia"
-                        )
-                        rejected_count += 1
-                        return None
-            except Exception as e:
-                print(f"Wikipedia check failed: {e}")
-
-            # 4. Create or get
-            name = name[0].upper() + name[1:] if len(name) > 0 else name
-            t, created = Topic.objects.get_or_create(name=name)
-            if created:
-                created_topics.append(name)
-            return t
-
-        # Process Schools of Thought
-        from narratives.utils.school_of_thought import ensure_school_topics_have_type
-        school_ids_added = []
-        for s_name in ai_results.get("schools", []):
-            s_topic = get_or_create_topic(s_name, "schools")
-            if s_topic and s_topic != topic:
-                topic.schools_of_thought.add(s_topic)
-                linked_schools.append(s_name)
-                school_ids_added.append(s_topic.id)
-        if school_ids_added:
-            ensure_school_topics_have_type(school_ids_added)
-
-        # Process Related Topics from AI results
-        for r_name in ai_results.get("related", []):
-            r_topic = get_or_create_topic(r_name, "related")
-            if r_topic and r_topic != topic:
-                topic.related_topics.add(r_topic)
-                linked_related.append(r_name)
-        
-        # Process discovery links from Wikipedia (Summary/Overview)
-        discovery_links = []
-        for knowledge in knowledge_list:
-            if knowledge.get('source') == 'Wikipedia' and 'related_links' in knowledge:
-                discovery_links = knowledge['related_links']
-                break
-        
-        discovered_topics_count = 0
-        for link in discovery_links:
-            link_title = link['title']
-            link_url = link['url']
-            
-            # Check if exists or create
-            # We use a simplified version of get_or_create_topic logic here
-            # but we prioritize Wikipedia URL and canonical title.
-            
-            # 1. Check by Wikipedia URL first
-            r_topic = Topic.objects.filter(wikipedia_url=link_url).first()
-            
-            # 2. Check by canonical name
-            if not r_topic:
-                r_topic = Topic.objects.filter(name__iexact=link_title).first()
-            
-            if not r_topic:
-                # Create new topic if it doesn't exist
-                # We still want to run basic validation (no verbs, etc.)
-                r_topic = get_or_create_topic(link_title, "wikipedia_discovery")
-                if r_topic:
-                    r_topic.wikipedia_url = link_url
-                    r_topic.save()
-                    discovered_topics_count += 1
-            
-            # Link as related if not already linked and not the same topic
-            if r_topic and r_topic != topic:
-                topic.related_topics.add(r_topic)
-                if link_title not in linked_related:
-                    linked_related.append(link_title)
-                
         return Response({
             "message": "Topic enhanced successfully.",
-            "sources_used": [s['source'] for s in knowledge_list],
-            "ai_extracted": ai_results,
-            "created_new_topics": created_topics,
-            "linked_schools": linked_schools,
-            "linked_related": linked_related,
-            "discovered_from_wikipedia": discovered_topics_count,
-            "rejected_suggestions_count": rejected_count,
-            "summary": best_content
+            "sources_used": result["sources_used"],
+            "ai_extracted": result["ai_extracted"],
+            "created_new_topics": result["created_new_topics"],
+            "linked_schools": result["linked_schools"],
+            "linked_related": result["linked_related"],
+            "discovered_from_wikipedia": result["discovered_from_wikipedia"],
+            "rejected_suggestions_count": result["rejected_suggestions_count"],
+            "summary": result["summary"]
         }, status=status.HTTP_200_OK)
 
 class TopicMergeView(APIView):
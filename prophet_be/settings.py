@@ -118,6 +118,80 @@ USE_TZ = True
 # Gentle fetcher: background thread fetches 1 video/article per source, then waits 30s–5min (random).
 # Runs only when starting runserver/gunicorn. Set to False to disable.
 GENTLE_FETCHER_AUTO_START = env.bool("GENTLE_FETCHER_AUTO_START", default=True)
+# Ingest engine (integrations/core/fetch_engine.py): all sources of a round are fetched concurrently.
+# INGEST_MAX_CONCURRENCY = HTTP requests in flight over all hosts; one host gets one request at a time, spaced by
+# a random INGEST_HOST_MIN_DELAY–INGEST_HOST_MAX_DELAY seconds unless the integration asks for its own delay.
+INGEST_MAX_CONCURRENCY = env.int("INGEST_MAX_CONCURRENCY", default=8)
+INGEST_HOST_MIN_DELAY = env.float("INGEST_HOST_MIN_DELAY", default=2.0)
+INGEST_HOST_MAX_DELAY = env.float("INGEST_HOST_MAX_DELAY", default=6.0)
+# Translators skip feed entries whose URL is already a RawText (no page download). INGEST_REFRESH_KNOWN_AFTER_DAYS > 0
+# downloads known articles again once their last download is that many days old (picks up edits); 0 = never.
+INGEST_REFRESH_KNOWN_AFTER_DAYS = env.int("INGEST_REFRESH_KNOWN_AFTER_DAYS", default=0)
+# Articles stored from the feed summary (page download or extraction failed) are downloaded again on later polls,
+# at most INGEST_FULL_TEXT_MAX_ATTEMPTS times in all.
+INGEST_FULL_TEXT_MAX_ATTEMPTS = env.int("INGEST_FULL_TEXT_MAX_ATTEMPTS", default=3)
+# PAGE_CACHE_MAX_MB > 0 keeps downloaded article pages gzipped in PAGE_CACHE_DIR (least recently used evicted above
+# that size), so `manage.py replay_page_cache` can re-extract content after a parser fix without the network. Off by default.
+PAGE_CACHE_DIR = env("PAGE_CACHE_DIR", default=str(BASE_DIR / "page_cache"))
+PAGE_CACHE_MAX_MB = env.int("PAGE_CACHE_MAX_MB", default=0)
+# Shared outbound HTTP client (narratives/utils/http_client.py): keep-alive pool reused by all integrations and
+# knowledge sources; HTTP/2 when the h2 package is installed. HTTP_CLIENT_RETRIES = extra tries after connection
+# errors (and, for direct calls, timeouts / 502 / 503 / 504). HTTP_CLIENT_TIMEOUT is the default per-request timeout.
+HTTP_CLIENT_TIMEOUT = env.float("HTTP_CLIENT_TIMEOUT", default=15.0)
+HTTP_CLIENT_RETRIES = env.int("HTTP_CLIENT_RETRIES", default=2)
+HTTP_CLIENT_MAX_CONNECTIONS = env.int("HTTP_CLIENT_MAX_CONNECTIONS", default=20)
+HTTP_CLIENT_MAX_KEEPALIVE = env.int("HTTP_CLIENT_MAX_KEEPALIVE", default=10)
+HTTP_CLIENT_KEEPALIVE_SECONDS = env.float("HTTP_CLIENT_KEEPALIVE_SECONDS", default=30.0)
+HTTP_CLIENT_HTTP2 = env.bool("HTTP_CLIENT_HTTP2", default=True)
+
+# SWOT worker: background thread that fills swot_analysis for threat-topic mentions (queued by categorization).
+# Runs only when starting runserver/gunicorn, one thread in every server process. SWOT_WORKERS = concurrent model
+# calls per process; keep SWOT_WORKERS x processes at or below the model server's parallelism. With several gunicorn
+# workers, set SWOT_WORKER_AUTO_START=False and run a single `manage.py process_swot_jobs` instead.
+SWOT_WORKER_AUTO_START = env.bool("SWOT_WORKER_AUTO_START", default=True)
+SWOT_WORKERS = env.int("SWOT_WORKERS", default=2)
+
+# Local model server (Ollama), see narratives/utils/ollama_client.py. OLLAMA_MAX_CONCURRENCY = requests in flight
+# per process (match the server's OLLAMA_NUM_PARALLEL). OLLAMA_TIMEOUT is the per-call deadline in seconds;
+# OLLAMA_STREAM=True streams answers so OLLAMA_FIRST_TOKEN_TIMEOUT can fail fast when the model does not start.
+OLLAMA_BASE_URL = env("OLLAMA_BASE_URL", default="http://localhost:11434")
+OLLAMA_MODEL = env("OLLAMA_MODEL", default="gemma2:9b")
+OLLAMA_MAX_CONCURRENCY = env.int("OLLAMA_MAX_CONCURRENCY", default=2)
+OLLAMA_TIMEOUT = env.float("OLLAMA_TIMEOUT", default=120.0)
+OLLAMA_FIRST_TOKEN_TIMEOUT = env.float("OLLAMA_FIRST_TOKEN_TIMEOUT", default=60.0)
+OLLAMA_RETRIES = env.int("OLLAMA_RETRIES", default=2)
+OLLAMA_STREAM = env.bool("OLLAMA_STREAM", default=False)
+
+# AI topic suggestion: existing topic names sent to the model are prefiltered to those relevant to the text
+# (narratives/utils/topic_prefilter.py), at most AI_SUGGEST_EXISTING_TOPICS_LIMIT names / ..._TOKEN_BUDGET tokens.
+AI_SUGGEST_EXISTING_TOPICS_LIMIT = env.int("AI_SUGGEST_EXISTING_TOPICS_LIMIT", default=300)
+AI_SUGGEST_EXISTING_TOPICS_TOKEN_BUDGET = env.int("AI_SUGGEST_EXISTING_TOPICS_TOKEN_BUDGET", default=2000)
+
+# Wikipedia page lookups (WikipediaLookup cache, narratives/utils/wikipedia_lookup.py). Found pages are re-checked
+# after WIKIPEDIA_LOOKUP_TTL_DAYS, missing ones after WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS. {lang} is filled in.
+WIKIPEDIA_API_URL = env("WIKIPEDIA_API_URL", default="https://{lang}.wikipedia.org/w/api.php")
+WIKIPEDIA_LOOKUP_TTL_DAYS = env.int("WIKIPEDIA_LOOKUP_TTL_DAYS", default=30)
+WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS = env.int("WIKIPEDIA_LOOKUP_NEGATIVE_TTL_DAYS", default=7)
+
+# Topic enhancement: knowledge collected from external sources (TopicKnowledge) is reused for this many days.
+TOPIC_KNOWLEDGE_TTL_DAYS = env.int("TOPIC_KNOWLEDGE_TTL_DAYS", default=14)
+
+# spaCy (narratives/utils/nlp.py): SPACY_PRELOAD=True loads the POS-only and NER-only pipelines in the
+# background when runserver/gunicorn starts, so the first request does not wait for the model load.
+SPACY_MODEL = env("SPACY_MODEL", default="en_core_web_sm")
+SPACY_PRELOAD = env.bool("SPACY_PRELOAD", default=False)
+# Processes for NER over long texts (chunks of ai_module.NER_CHUNK_CHARS); 1 = in-process.
+SPACY_NER_PROCESSES = env.int("SPACY_NER_PROCESSES", default=1)
+
+# Local model answer cache (LLMResponseCache): identical prompts are answered from the DB.
+# Entries older than LLM_CACHE_TTL_DAYS expire; above LLM_CACHE_MAX_ENTRIES the least recently used are evicted.
+LLM_CACHE_ENABLED = env.bool("LLM_CACHE_ENABLED", default=True)
+LLM_CACHE_TTL_DAYS = env.int("LLM_CACHE_TTL_DAYS", default=30)
+LLM_CACHE_MAX_ENTRIES = env.int("LLM_CACHE_MAX_ENTRIES", default=50000)
+
+# Compiled keyword matcher (categorization): optional directory where the matcher for the current
+# categorization_version is pickled, so other gunicorn workers load it instead of rebuilding. Empty = in-memory only.
+KEYWORD_MATCHER_CACHE_DIR = env("KEYWORD_MATCHER_CACHE_DIR", default="")
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/